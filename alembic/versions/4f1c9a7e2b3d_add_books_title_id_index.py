@@ -0,0 +1,27 @@
+"""add_books_title_id_index
+
+Revision ID: 4f1c9a7e2b3d
+Revises: 2d70d4b28003
+Create Date: 2026-10-19 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1c9a7e2b3d'
+down_revision: Union[str, None] = '2d70d4b28003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs keyset pagination of GET /books/ ordered by (title, id)
+    op.create_index('ix_books_title_id', 'books', ['title', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_title_id', table_name='books')
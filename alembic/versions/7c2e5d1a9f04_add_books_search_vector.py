@@ -0,0 +1,45 @@
+"""add_books_search_vector
+
+Revision ID: 7c2e5d1a9f04
+Revises: 4f1c9a7e2b3d
+Create Date: 2026-10-19 10:03:17.552981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5d1a9f04'
+down_revision: Union[str, None] = '4f1c9a7e2b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Generated column: Postgres recomputes it whenever title/author/summary
+    # change, so AI summaries become searchable as soon as they are written.
+    op.execute(
+        """
+        ALTER TABLE books ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(author, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(summary, '')), 'C')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_books_search_vector',
+        'books',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_search_vector', table_name='books')
+    op.drop_column('books', 'search_vector')
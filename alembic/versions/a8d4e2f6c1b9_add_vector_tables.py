@@ -0,0 +1,62 @@
+"""add_vector_tables
+
+Revision ID: a8d4e2f6c1b9
+Revises: f7c3d9a2e8b1
+Create Date: 2026-10-19 21:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4e2f6c1b9'
+down_revision: Union[str, None] = 'f7c3d9a2e8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # float32/int32 arrays stored as bytea; filled by `python -m app.reindex`
+    op.create_table(
+        'vector_spaces',
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('features', sa.Integer(), nullable=False),
+        sa.Column('idf', sa.LargeBinary(), nullable=False),
+        sa.Column('vocabulary', sa.Text(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True
+        ),
+        sa.PrimaryKeyConstraint('version'),
+    )
+    op.create_table(
+        'book_vectors',
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('indices', sa.LargeBinary(), nullable=False),
+        sa.Column('weights', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+        sa.ForeignKeyConstraint(['version'], ['vector_spaces.version'], ),
+        sa.PrimaryKeyConstraint('book_id'),
+    )
+    op.create_table(
+        'user_vectors',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('fingerprint', sa.String(), nullable=False),
+        sa.Column('indices', sa.LargeBinary(), nullable=False),
+        sa.Column('weights', sa.LargeBinary(), nullable=False),
+        sa.Column(
+            'updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_vectors')
+    op.drop_table('book_vectors')
+    op.drop_table('vector_spaces')
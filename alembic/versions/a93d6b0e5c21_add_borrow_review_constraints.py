@@ -0,0 +1,63 @@
+"""add_borrow_review_constraints
+
+Revision ID: a93d6b0e5c21
+Revises: 7c2e5d1a9f04
+Create Date: 2026-10-19 11:26:02.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93d6b0e5c21'
+down_revision: Union[str, None] = '7c2e5d1a9f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Clean up duplicates that the old check-then-insert race could create,
+    # otherwise the unique indexes below cannot be built.
+    op.execute(
+        """
+        UPDATE borrows SET return_date = now()
+        WHERE return_date IS NULL
+          AND id NOT IN (
+              SELECT min(id) FROM borrows
+              WHERE return_date IS NULL
+              GROUP BY user_id, book_id
+          )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM reviews
+        WHERE id NOT IN (SELECT min(id) FROM reviews GROUP BY book_id, user_id)
+        """
+    )
+
+    op.create_index(
+        'ix_borrows_user_book_return',
+        'borrows',
+        ['user_id', 'book_id', 'return_date'],
+        unique=False,
+    )
+    op.create_index(
+        'uq_borrows_active_user_book',
+        'borrows',
+        ['user_id', 'book_id'],
+        unique=True,
+        postgresql_where=sa.text('return_date IS NULL'),
+    )
+    op.create_unique_constraint(
+        'uq_reviews_book_user', 'reviews', ['book_id', 'user_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_reviews_book_user', 'reviews', type_='unique')
+    op.drop_index('uq_borrows_active_user_book', table_name='borrows')
+    op.drop_index('ix_borrows_user_book_return', table_name='borrows')
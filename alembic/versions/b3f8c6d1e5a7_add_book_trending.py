@@ -0,0 +1,38 @@
+"""add_book_trending
+
+Revision ID: b3f8c6d1e5a7
+Revises: a8d4e2f6c1b9
+Create Date: 2026-10-19 22:03:11.846519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f8c6d1e5a7'
+down_revision: Union[str, None] = 'a8d4e2f6c1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Decayed interaction scores, flushed by every API worker
+    op.create_table(
+        'book_trending',
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('log_score', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+        sa.PrimaryKeyConstraint('book_id'),
+    )
+    op.create_index(
+        op.f('ix_book_trending_log_score'), 'book_trending', ['log_score'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_book_trending_log_score'), table_name='book_trending')
+    op.drop_table('book_trending')
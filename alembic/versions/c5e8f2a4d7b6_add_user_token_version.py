@@ -0,0 +1,30 @@
+"""add_user_token_version
+
+Revision ID: c5e8f2a4d7b6
+Revises: a93d6b0e5c21
+Create Date: 2026-10-19 12:41:55.310672
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8f2a4d7b6'
+down_revision: Union[str, None] = 'a93d6b0e5c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Carried in JWTs as the "ver" claim; bumping it revokes issued tokens
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,115 @@
+"""add_ai_processing_status
+
+Revision ID: c6e2a9d4f8b3
+Revises: b3f8c6d1e5a7
+Create Date: 2026-10-19 23:18:52.207341
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e2a9d4f8b3'
+down_revision: Union[str, None] = 'b3f8c6d1e5a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table, prefix in (('books', 'summary'), ('reviews', 'sentiment')):
+        op.add_column(
+            table,
+            sa.Column(
+                f'{prefix}_status', sa.String(), server_default='pending', nullable=False
+            ),
+        )
+        op.add_column(
+            table,
+            sa.Column(
+                f'{prefix}_attempts', sa.Integer(), server_default='0', nullable=False
+            ),
+        )
+        op.add_column(table, sa.Column(f'{prefix}_error', sa.Text(), nullable=True))
+
+    # Existing rows: error strings written by the old LLM client become
+    # failures (retried by `python -m app.backfill`), real output becomes done
+    op.execute(
+        """
+        UPDATE books SET summary_status = 'failed', summary_attempts = 1,
+               summary_error = summary, summary = NULL
+        WHERE summary LIKE 'Error:%'
+        """
+    )
+    op.execute("UPDATE books SET summary = NULL WHERE summary = 'Pending...'")
+    op.execute(
+        """
+        UPDATE books SET summary_status = 'done', summary_attempts = 1
+        WHERE summary IS NOT NULL AND summary_status = 'pending'
+        """
+    )
+    op.execute(
+        """
+        UPDATE reviews SET sentiment_status = 'failed', sentiment_attempts = 1,
+               sentiment_error = sentiment, sentiment = 'Pending'
+        WHERE sentiment LIKE 'Error:%'
+        """
+    )
+    op.execute(
+        """
+        UPDATE reviews SET sentiment_status = 'done', sentiment_attempts = 1
+        WHERE sentiment IN ('Positive', 'Negative', 'Neutral')
+        """
+    )
+
+    op.create_index(
+        'ix_books_summary_done',
+        'books',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("summary_status = 'done'"),
+    )
+    op.create_index(
+        'ix_books_summary_todo',
+        'books',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("summary_status != 'done'"),
+    )
+    op.create_index(
+        'ix_reviews_sentiment_todo',
+        'reviews',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("sentiment_status != 'done'"),
+    )
+    # Search only ever matches summarized books; index just those
+    op.drop_index('ix_books_search_vector', table_name='books')
+    op.create_index(
+        'ix_books_search_vector',
+        'books',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_where=sa.text("summary_status = 'done'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_search_vector', table_name='books')
+    op.create_index(
+        'ix_books_search_vector',
+        'books',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.drop_index('ix_reviews_sentiment_todo', table_name='reviews')
+    op.drop_index('ix_books_summary_todo', table_name='books')
+    op.drop_index('ix_books_summary_done', table_name='books')
+    for table, prefix in (('books', 'summary'), ('reviews', 'sentiment')):
+        op.drop_column(table, f'{prefix}_error')
+        op.drop_column(table, f'{prefix}_attempts')
+        op.drop_column(table, f'{prefix}_status')
@@ -0,0 +1,32 @@
+"""add_cache_versions
+
+Revision ID: d2b7e9c1f3a8
+Revises: c5e8f2a4d7b6
+Create Date: 2026-10-19 13:58:21.774090
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e9c1f3a8'
+down_revision: Union[str, None] = 'c5e8f2a4d7b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Version counters behind the ETags of GET /books/ and GET /reviews/{book_id}
+    op.create_table(
+        'cache_versions',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('scope'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cache_versions')
@@ -0,0 +1,34 @@
+"""add_books_summarized_at
+
+Revision ID: d9f4b2a6c8e1
+Revises: c6e2a9d4f8b3
+Create Date: 2026-10-20 10:42:17.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f4b2a6c8e1'
+down_revision: Union[str, None] = 'c6e2a9d4f8b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'books', sa.Column('summarized_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    # Existing summaries count as new until the next `python -m app.reindex`
+    op.execute(
+        "UPDATE books SET summarized_at = CURRENT_TIMESTAMP WHERE summary_status = 'done'"
+    )
+    op.create_index('ix_books_summarized_at', 'books', ['summarized_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_summarized_at', table_name='books')
+    op.drop_column('books', 'summarized_at')
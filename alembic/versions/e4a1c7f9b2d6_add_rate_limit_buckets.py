@@ -0,0 +1,33 @@
+"""add_rate_limit_buckets
+
+Revision ID: e4a1c7f9b2d6
+Revises: d2b7e9c1f3a8
+Create Date: 2026-10-19 19:12:40.318552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1c7f9b2d6'
+down_revision: Union[str, None] = 'd2b7e9c1f3a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Shared token buckets for the database rate-limit backend
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_buckets')
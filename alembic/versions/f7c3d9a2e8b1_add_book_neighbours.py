@@ -0,0 +1,52 @@
+"""add_book_neighbours
+
+Revision ID: f7c3d9a2e8b1
+Revises: e4a1c7f9b2d6
+Create Date: 2026-10-19 20:04:17.552913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3d9a2e8b1'
+down_revision: Union[str, None] = 'e4a1c7f9b2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Co-borrow similarity; fill with `python -m app.rebuild_neighbours`
+    op.create_table(
+        'book_neighbours',
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('neighbour_id', sa.Integer(), nullable=False),
+        sa.Column('co_readers', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+        sa.ForeignKeyConstraint(['neighbour_id'], ['books.id'], ),
+        sa.PrimaryKeyConstraint('book_id', 'neighbour_id'),
+    )
+    op.create_index(
+        'ix_book_neighbours_book_score', 'book_neighbours', ['book_id', 'score'], unique=False
+    )
+    op.create_index(
+        'ix_book_neighbours_neighbour_id', 'book_neighbours', ['neighbour_id'], unique=False
+    )
+    op.create_table(
+        'book_reader_counts',
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('readers', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+        sa.PrimaryKeyConstraint('book_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('book_reader_counts')
+    op.drop_index('ix_book_neighbours_neighbour_id', table_name='book_neighbours')
+    op.drop_index('ix_book_neighbours_book_score', table_name='book_neighbours')
+    op.drop_table('book_neighbours')
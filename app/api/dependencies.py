@@ -1,13 +1,142 @@
-from app.core.interfaces import LLMProvider, StorageProvider
+from typing import TYPE_CHECKING
+
+from fastapi import Request
+
+from app.api.middleware import wrote_recently
+from app.core.config import settings
+from app.core.interfaces import (
+    EventBroker,
+    LLMProvider,
+    RateLimitBackend,
+    SearchProvider,
+    StorageProvider,
+)
+from app.core.lazy import Lazy
+from app.db.session import engine, read_session_scope
+from app.infrastructure.services.event_broker import (
+    InMemoryEventBroker,
+    PostgresEventBroker,
+)
+from app.infrastructure.services.llm_scheduler import (
+    BULK,
+    INTERACTIVE,
+    PriorityScheduler,
+    ScheduledLLM,
+)
 from app.infrastructure.services.local_storage_service import LocalDiskStorage
 from app.infrastructure.services.ollama_service import OllamaService
+from app.infrastructure.services.rate_limit_service import (
+    DatabaseRateLimiter,
+    InMemoryRateLimiter,
+)
+from app.infrastructure.services.search_service import (
+    PostgresFullTextSearch,
+    SQLiteFullTextSearch,
+)
+from app.infrastructure.services.trending_service import TrendingTracker
+
+if TYPE_CHECKING:
+    from app.infrastructure.services.ml_service import RecommendationEngine
+    from app.infrastructure.services.recommendation_index import IndexStore
+
+
+# The ML stack (scikit-learn, scipy, numpy) takes longer to import than the rest
+# of the app; it is loaded on first use or by the warm-up in app.main's lifespan.
+def _build_recommendation_engine() -> "RecommendationEngine":
+    from app.infrastructure.services.ml_service import RecommendationEngine
+
+    return RecommendationEngine()
+
+
+def _build_index_store() -> "IndexStore":
+    from app.infrastructure.services.recommendation_index import IndexStore
+
+    return IndexStore(
+        settings.RECOMMENDATION_INDEX_DIR, settings.RECOMMENDATION_INDEX_CHECK_SECONDS
+    )
+
+
+recommendation_engine = Lazy(_build_recommendation_engine)
+catalog_index = Lazy(_build_index_store)
+
+# Bucket state must outlive a request, so the limiter is a process-wide singleton
+if settings.RATE_LIMIT_BACKEND == "database":
+    rate_limiter: RateLimitBackend = DatabaseRateLimiter()
+else:
+    rate_limiter = InMemoryRateLimiter(max_keys=settings.RATE_LIMIT_MEMORY_MAX_KEYS)
+
+# Subscribers live in this process, so the broker is a singleton too
+if settings.EVENT_BROKER_BACKEND == "postgres":
+    event_broker: EventBroker = PostgresEventBroker(
+        engine, queue_size=settings.EVENT_QUEUE_SIZE
+    )
+else:
+    event_broker = InMemoryEventBroker(queue_size=settings.EVENT_QUEUE_SIZE)
+
+# One queue per worker in front of Ollama, shared by every request and task
+llm_scheduler = PriorityScheduler(
+    slots=settings.LLM_CONCURRENCY,
+    weights={
+        INTERACTIVE: settings.LLM_INTERACTIVE_WEIGHT,
+        BULK: settings.LLM_BULK_WEIGHT,
+    },
+    aging_seconds=settings.LLM_AGING_SECONDS,
+    reserved_slots=settings.LLM_INTERACTIVE_RESERVED_SLOTS,
+)
+
+# Counters accumulate between flushes (see app.main), one tracker per worker
+trending = TrendingTracker(
+    half_life=settings.TRENDING_HALF_LIFE_HOURS * 3600,
+    shelf_size=settings.TRENDING_SHELF_SIZE,
+)
+
+
+def get_read_db(request: Request):
+    """
+    Injects a session for read-only endpoints: a healthy replica when any is
+    configured, the primary right after this client wrote (read your writes).
+    """
+    with read_session_scope(primary=wrote_recently(request)) as db:
+        yield db
 
 
 def get_llm_service() -> LLMProvider:
-    """Injects the current LLM provider (Ollama)."""
-    return OllamaService()
+    """Injects the current LLM provider (Ollama), behind the priority scheduler."""
+    return ScheduledLLM(OllamaService(), llm_scheduler)
 
 
 def get_storage_service() -> StorageProvider:
     """Injects the current Storage provider (Local Disk)."""
     return LocalDiskStorage()
+
+
+def get_search_service() -> SearchProvider:
+    """Injects the full-text search backend matching the database (Postgres or SQLite)."""
+    if engine.dialect.name == "postgresql":
+        return PostgresFullTextSearch()
+    return SQLiteFullTextSearch()
+
+
+def get_recommendation_engine() -> "RecommendationEngine":
+    """Injects the shared recommendation engine (imports the ML stack on first use)."""
+    return recommendation_engine.get()
+
+
+def get_catalog_index() -> "IndexStore":
+    """Injects the memory-mapped recommendation index store."""
+    return catalog_index.get()
+
+
+def get_rate_limiter() -> RateLimitBackend:
+    """Injects the token-bucket backend selected by RATE_LIMIT_BACKEND."""
+    return rate_limiter
+
+
+def get_event_broker() -> EventBroker:
+    """Injects the pub/sub broker behind the push-event stream."""
+    return event_broker
+
+
+def get_trending() -> TrendingTracker:
+    """Injects this worker's trending counters."""
+    return trending
@@ -0,0 +1,23 @@
+import json
+from typing import Optional
+
+from app.core.interfaces import EventBroker
+
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+async def notify_user(events: Optional[EventBroker], user_id: Optional[int], event: dict):
+    """Pushes an event to a user's open streams. Never fails the calling task."""
+    if events is None or user_id is None:
+        return
+    try:
+        await events.publish(user_channel(user_id), event)
+    except Exception as e:
+        print(f"Event publish failed: {e}")
+
+
+def format_sse(event: dict) -> bytes:
+    """One Server-Sent Events frame; the event type becomes the SSE `event:` field."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n".encode()
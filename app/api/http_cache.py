@@ -0,0 +1,123 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.db.versioning import bump_versions, get_versions
+
+CACHE_RESULTS = Counter(
+    "http_cache_results_total",
+    "Conditional/cached GET outcomes (not_modified, hit, miss).",
+    labelnames=("result",),
+)
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: bytes
+    scopes: Tuple[str, ...]
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """In-process cache of rendered JSON bodies, keyed by request URL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._cache.get(key)
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self._cache.set(key, entry)
+
+    def invalidate(self, *scopes: str) -> None:
+        wanted = set(scopes)
+        self._cache.discard_where(lambda entry: not wanted.isdisjoint(entry.scopes))
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+def mark_changed(db: Session, *scopes: str) -> None:
+    """
+    Records that data behind `scopes` changed: bumps their versions in the
+    current transaction and drops local cached bodies once it commits.
+    """
+    bump_versions(db, *scopes)
+    event.listen(
+        db, "after_commit", lambda session: response_cache.invalidate(*scopes), once=True
+    )
+
+
+def _cache_key(request: Request) -> str:
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    return f"{request.url.path}?{query}"
+
+
+def _make_etag(versions: Dict[str, int], key: str) -> str:
+    material = ";".join(f"{scope}={versions[scope]}" for scope in sorted(versions))
+    digest = hashlib.sha1(f"{material}|{key}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        tag.removeprefix("W/") == etag for tag in candidates
+    )
+
+
+def cached_json_response(
+    request: Request,
+    db: Session,
+    scopes: Sequence[str],
+    render: Callable[[], Tuple[bytes, Dict[str, str]]],
+) -> Response:
+    """
+    Serves a read endpoint behind a strong ETag derived from the version of
+    each scope. A matching If-None-Match costs one version lookup and returns
+    304; a cached body for the current ETag is returned without running
+    `render`, which otherwise builds `(json_body, extra_headers)`.
+    """
+    key = _cache_key(request)
+    etag = _make_etag(get_versions(db, scopes), key)
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        CACHE_RESULTS.labels("not_modified").inc()
+        return Response(status_code=304, headers=cache_headers)
+
+    if settings.RESPONSE_CACHE_ENABLED:
+        entry = response_cache.get(key)
+        if entry is not None and entry.etag == etag:
+            CACHE_RESULTS.labels("hit").inc()
+            return Response(
+                content=entry.body,
+                media_type="application/json",
+                headers={**entry.headers, **cache_headers},
+            )
+
+    CACHE_RESULTS.labels("miss").inc()
+    body, headers = render()
+    if settings.RESPONSE_CACHE_ENABLED:
+        response_cache.put(
+            key, CachedResponse(etag=etag, body=body, scopes=tuple(scopes), headers=headers)
+        )
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**headers, **cache_headers},
+    )
@@ -0,0 +1,181 @@
+import hashlib
+import time
+
+from fastapi import Request
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
+from app.core.tasks import current_task_group, tracker
+from app.db.profiler import ProfiledQueryStats
+from app.db.query_stats import QueryStats, current_query_stats
+
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency per route (count doubles as the request counter).",
+    labelnames=("method", "route", "status"),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL per request.",
+    labelnames=("method", "route"),
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, in-flight requests and
+    SQL count/time. Routes are labelled by their template (/books/{id}),
+    never the raw path, to keep label cardinality bounded. Also closes the
+    request's background task group (see app/core/tasks.py).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        # Reuse the profiler's stats object when it wraps this middleware
+        stats = current_query_stats.get() or QueryStats()
+        token = current_query_stats.set(stats)
+        tasks = []
+        tasks_token = current_task_group.set(tasks)
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            current_query_stats.reset(token)
+            # Background tasks run inside the response; any not started by now
+            # were skipped and would otherwise count as queued forever
+            current_task_group.reset(tasks_token)
+            tracker.abandon(tasks)
+
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            REQUEST_SECONDS.labels(method, path, str(status)).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(method, path).observe(stats.count)
+            REQUEST_DB_SECONDS.labels(method, path).observe(stats.seconds)
+
+
+class SQLProfilerMiddleware:
+    """
+    Opt-in (SQL_PROFILER_ENABLED) per-request SQL profiler. Adds X-DB-Queries,
+    X-DB-Time-ms and X-DB-Repeated headers, logs the slowest statements with
+    their parameter shape and warns about repeated identical statements.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = ProfiledQueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                repeated = stats.repeated(settings.SQL_PROFILER_REPEAT_THRESHOLD)
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                    (b"x-db-repeated", str(len(repeated)).encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            stats.report(
+                f"{scope['method']} {scope['path']}",
+                slow_count=settings.SQL_PROFILER_SLOW_COUNT,
+                repeat_threshold=settings.SQL_PROFILER_REPEAT_THRESHOLD,
+            )
+
+
+READ_PRIMARY_COOKIE = "lumina_read_primary"
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Bearer tokens that wrote recently in this worker (the cookie covers the others)
+recent_writers = TTLCache(maxsize=10000, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def _writer_key(authorization: str) -> str:
+    return hashlib.sha1(authorization.encode()).hexdigest()
+
+
+def wrote_recently(request: Request) -> bool:
+    """True within DB_READ_YOUR_WRITES_SECONDS of this client's last write."""
+    until = request.cookies.get(READ_PRIMARY_COOKIE)
+    try:
+        if until and float(until) > time.time():
+            return True
+    except ValueError:
+        pass
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return False
+    return recent_writers.get(_writer_key(authorization)) is not None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks clients after a successful write so their next reads go to the
+    primary instead of a possibly lagging replica: by bearer token in this
+    worker, and with a short-lived cookie that any worker can check.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        window = settings.DB_READ_YOUR_WRITES_SECONDS
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                authorization = Headers(scope=scope).get("authorization")
+                if authorization:
+                    recent_writers.set(_writer_key(authorization), True)
+                cookie = (
+                    f"{READ_PRIMARY_COOKIE}={time.time() + window:.3f}; "
+                    f"Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,38 @@
+from typing import List, Sequence, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# Matches Pydantic's JSON output for datetimes ("...Z" for UTC)
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def columns_for(model, schema: Type[BaseModel], exclude: Sequence[str] = ()) -> List:
+    """
+    ORM columns named after the fields of a response schema, so projected
+    rows serialize to exactly the `response_model` contract.
+    """
+    return [
+        getattr(model, name) for name in schema.model_fields if name not in exclude
+    ]
+
+
+def dump_rows(rows: Sequence) -> bytes:
+    """Serializes projected SQLAlchemy rows (from `columns_for`) in one orjson pass."""
+    if not rows:
+        return b"[]"
+    keys = rows[0]._fields
+    return orjson.dumps([dict(zip(keys, row)) for row in rows], option=_ORJSON_OPTIONS)
+
+
+def dump_json(data) -> bytes:
+    return orjson.dumps(data, option=_ORJSON_OPTIONS)
+
+
+def json_rows_response(rows: Sequence) -> Response:
+    """
+    Fast path for list endpoints: skips per-row Pydantic validation. The
+    route's `response_model` still documents the contract in OpenAPI.
+    """
+    return Response(content=dump_rows(rows), media_type="application/json")
@@ -4,10 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core import security
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.security import Principal, principal_cache
+from app.db.session import get_db, session_scope
 from app.domain import schemas
 from app.models.sql_models import User
 
@@ -16,13 +18,21 @@ router = APIRouter()
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-@router.post("/signup", response_model=schemas.UserResponse)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many concurrent sign-ins, please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
 
-    hashed_password = security.get_password_hash(user.password)
+# The handlers are async so bcrypt can await its own bounded executor; every
+# database call goes through these helpers on the threadpool, never the loop.
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _add_user(db: Session, user: schemas.UserCreate, hashed_password: str) -> User:
     new_user = User(
         email=user.email, hashed_password=hashed_password, full_name=user.full_name
     )
@@ -32,46 +42,130 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     return new_user
 
 
+def _store_hash(db: Session, user: User, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
+
+
+@router.post("/signup", response_model=schemas.UserResponse)
+async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(_find_user, db, user.email)
+    if db_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    # bcrypt runs on its own bounded executor, not Starlette's threadpool
+    try:
+        hashed_password = await security.password_hasher.hash(user.password)
+    except security.PasswordHasherBusy:
+        raise _hasher_busy()
+    return await run_in_threadpool(_add_user, db, user, hashed_password)
+
+
 @router.post("/login", response_model=schemas.Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not security.verify_password(
-        form_data.password, user.hashed_password
-    ):
+    user = await run_in_threadpool(_find_user, db, form_data.username)
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await security.password_hasher.verify_and_update(
+                form_data.password, user.hashed_password
+            )
+        except security.PasswordHasherBusy:
+            raise _hasher_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+    # The token carries everything needed to authorize a request without a lookup
+    # (read before the commit below expires the loaded attributes)
+    claims = {
+        "sub": str(user.id),
+        "email": user.email,
+        "active": user.is_active,
+        "ver": user.token_version,
+    }
+
+    # Transparent rehash when BCRYPT_ROUNDS changed since the hash was stored
+    if new_hash:
+        await run_in_threadpool(_store_hash, db, user, new_hash)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=claims, expires_delta=access_token_expires
     )
 
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+def get_current_principal(token: str = Depends(reusable_oauth2)) -> Principal:
     """
-    Dependency to validate JWT and return the current authenticated user.
+    Dependency to validate the JWT and return the caller's identity.
+    Verified tokens are cached, so the database is only hit on a cache miss.
     """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Could not validate credentials")
 
-    user = db.query(User).filter(User.email == email).first()
+    with session_scope() as db:
+        user = (
+            db.query(User.id, User.email, User.is_active, User.token_version)
+            .filter(User.id == user_id)
+            .first()
+        )
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active or user.token_version != payload.get("ver"):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        is_active=user.is_active,
+        token_version=user.token_version,
+    )
+    principal_cache.put(token, principal, expires_at=payload.get("exp"))
+    return principal
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+) -> User:
+    """
+    Dependency returning the full User row, for endpoints that need more
+    than the caller's id. Prefer `get_current_principal` otherwise.
+    """
+    user = db.get(User, principal.id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
     return user
+
+
+@router.delete("/me", response_model=schemas.UserResponse)
+def deactivate_current_user(
+    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+):
+    """Deactivates the caller's account and revokes every token issued to it."""
+    current_user.is_active = False
+    current_user.token_version += 1
+    db.commit()
+    db.refresh(current_user)
+
+    principal_cache.invalidate_user(current_user.id)
+    return current_user
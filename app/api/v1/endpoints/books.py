@@ -1,7 +1,18 @@
+import logging
 import uuid
+from datetime import datetime
 from pathlib import Path
+from typing import List, Optional
 
-from app.api.dependencies import get_llm_service, get_storage_service
+from app.api.dependencies import (
+    get_event_broker,
+    get_llm_service,
+    get_rate_limiter,
+    get_read_db,
+    get_search_service,
+    get_storage_service,
+    get_trending,
+)
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -9,43 +20,124 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
+    Request,
     UploadFile,
 )
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.api.v1.endpoints.auth import get_current_user
+from app.api.events import notify_user
+from app.api.http_cache import cached_json_response, mark_changed
+from app.api.rate_limit import rate_limit, rate_limit_check
+from app.api.responses import columns_for, dump_rows, json_rows_response
+from app.api.v1.endpoints.auth import get_current_principal
 
-from app.core.interfaces import LLMProvider, StorageProvider
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.interfaces import (
+    EventBroker,
+    LLMProvider,
+    RateLimitBackend,
+    SearchProvider,
+    StorageProvider,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import Principal
+from app.core.tasks import enqueue
+from app.db.session import get_db, session_scope
 from app.domain import schemas
-from app.models.sql_models import Book, User
+from app.infrastructure.services.ingestion_service import (
+    CatalogIngestor,
+    IngestItem,
+    run_rate_limited,
+    title_from_filename,
+)
+from app.infrastructure.services.llm_scheduler import BULK, llm_priority
+from app.infrastructure.services.neighbour_service import similar_books
+from app.infrastructure.services.trending_service import TrendingTracker
+from app.models.sql_models import AI_DONE, AI_FAILED, AI_RUNNING, Book
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-async def process_ai_summary(book_id: int, file_path: str, db_gen, llm: LLMProvider):
-    # 1. Read the uploaded file
+async def process_ai_summary(
+    book_id: int,
+    file_path: str,
+    llm: LLMProvider,
+    events: Optional[EventBroker] = None,
+    user_id: Optional[int] = None,
+):
+    summary, status, error = None, AI_FAILED, None
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
+        # 1. Mark the book as in progress (one more attempt)
+        with session_scope() as db:
+            db.execute(
+                update(Book)
+                .where(Book.id == book_id)
+                .values(
+                    summary_status=AI_RUNNING,
+                    summary_attempts=Book.summary_attempts + 1,
+                )
+            )
+            db.commit()
 
-        # 2. Call the injected LLM Provider (It doesn't know if it's Ollama or OpenAI!)
-        summary = await llm.generate_summary(content)
+        # 2. Read the uploaded file and call the injected LLM Provider
+        # (It doesn't know if it's Ollama or OpenAI!)
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+            summary, status = await llm.generate_summary(content), AI_DONE
+        except Exception as e:
+            logger.warning("Summary for book %s failed: %s", book_id, e)
+            error = str(e)
 
-        # 3. Update Database
-        db = next(db_gen())
-        book = db.query(Book).filter(Book.id == book_id).first()
-        if book:
-            book.summary = summary
+        # 3. Update Database (the search index follows the row automatically:
+        # a generated tsvector column on Postgres, FTS5 triggers on SQLite).
+        # A failure never touches `summary`; `python -m app.backfill` retries it.
+        values = {"summary_status": status, "summary_error": error}
+        if status == AI_DONE:
+            values["summary"] = summary
+            values["summarized_at"] = datetime.utcnow()
+        with session_scope() as db:
+            db.execute(update(Book).where(Book.id == book_id).values(**values))
+            mark_changed(db, "books")
             db.commit()
-    except Exception as e:
-        print(f"Error in background AI task: {e}")
+    except Exception:
+        logger.exception("Background summary task for book %s failed", book_id)
+        status = AI_FAILED
+
+    # 4. Push the result to the uploader's event stream (no polling needed)
+    await notify_user(
+        events,
+        user_id,
+        {
+            "type": "book.summary",
+            "book_id": book_id,
+            "status": status,
+            "summary": summary if status == AI_DONE else None,
+        },
+    )
 
 
 # --- ENDPOINTS ---
 
 
-@router.post("/", response_model=schemas.BookResponse)
+@router.post(
+    "/",
+    response_model=schemas.BookResponse,
+    dependencies=[
+        Depends(
+            rate_limit(
+                "books.upload",
+                settings.RATE_LIMIT_BOOK_UPLOAD_USER,
+                settings.RATE_LIMIT_BOOK_UPLOAD_GLOBAL,
+            )
+        )
+    ],
+)
 async def upload_book(
     background_tasks: BackgroundTasks,
     title: str = Form(...),
@@ -53,9 +145,10 @@ async def upload_book(
     isbn: str = Form(None),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     storage: StorageProvider = Depends(get_storage_service),
     llm: LLMProvider = Depends(get_llm_service),
+    events: EventBroker = Depends(get_event_broker),
 ):
     if file.content_type not in ["application/pdf", "text/plain"]:
         raise HTTPException(status_code=400, detail="Only PDF or TXT allowed")
@@ -75,16 +168,220 @@ async def upload_book(
         file_path=str(file_path),
     )
     db.add(new_book)
+    mark_changed(db, "books")
     db.commit()
     db.refresh(new_book)
 
-    background_tasks.add_task(
-        process_ai_summary, new_book.id, str(file_path), get_db, llm
+    enqueue(
+        background_tasks,
+        process_ai_summary,
+        new_book.id,
+        str(file_path),
+        llm,
+        events,
+        current_user.id,
     )
 
     return new_book
 
 
+async def summarize_books(
+    books: List[tuple],
+    llm: LLMProvider,
+    events: Optional[EventBroker] = None,
+    user_id: Optional[int] = None,
+):
+    """Background task: rate-limited summaries for a bulk import."""
+    # Bulk priority: users' own reviews and uploads are served first
+    with llm_priority(BULK):
+        await run_rate_limited(
+            (
+                lambda book_id=book_id, path=path: process_ai_summary(
+                    book_id, path, llm, events, user_id
+                )
+                for book_id, path in books
+            ),
+            rate_per_second=settings.INGEST_SUMMARY_RATE,
+            concurrency=settings.INGEST_SUMMARY_CONCURRENCY,
+        )
+
+
+def _finish_bulk_upload(db: Session, book_ids: List[int]) -> List[Book]:
+    """Sync tail of a bulk upload; runs on the threadpool, off the event loop."""
+    mark_changed(db, "books")
+    db.commit()
+    return db.query(Book).filter(Book.id.in_(book_ids)).order_by(Book.id).all()
+
+
+_bulk_upload_check = rate_limit_check(
+    "books.bulk", settings.RATE_LIMIT_BOOK_BULK_USER, settings.RATE_LIMIT_BOOK_BULK_GLOBAL
+)
+
+
+def bulk_upload_limit(
+    files: List[UploadFile] = File(...),
+    current_user: Principal = Depends(get_current_principal),
+    limiter: RateLimitBackend = Depends(get_rate_limiter),
+) -> None:
+    """Charges one token per file, so bulk uploads cannot bypass the upload limits."""
+    _bulk_upload_check(current_user, limiter, len(files))
+
+
+@router.post(
+    "/bulk",
+    response_model=schemas.BulkIngestResponse,
+    dependencies=[Depends(bulk_upload_limit)],
+)
+async def upload_books_bulk(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    author: str = Form("Unknown"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    storage: StorageProvider = Depends(get_storage_service),
+    llm: LLMProvider = Depends(get_llm_service),
+    events: EventBroker = Depends(get_event_broker),
+):
+    """
+    Imports many files in one request. Titles come from the file names;
+    summaries are generated afterwards at INGEST_SUMMARY_RATE per second.
+    """
+    rejected = [
+        f.filename for f in files if f.content_type not in ["application/pdf", "text/plain"]
+    ]
+    if rejected:
+        raise HTTPException(
+            status_code=400, detail=f"Only PDF or TXT allowed: {', '.join(rejected)}"
+        )
+
+    items = [
+        IngestItem(
+            filename=f.filename,
+            title=title_from_filename(f.filename),
+            author=author,
+            load=f.read,
+        )
+        for f in files
+    ]
+    ingestor = CatalogIngestor(
+        storage,
+        batch_size=settings.INGEST_BATCH_SIZE,
+        concurrency=settings.INGEST_CONCURRENCY,
+    )
+    report = await ingestor.ingest(db, items)
+    books = await run_in_threadpool(
+        _finish_bulk_upload, db, [book_id for book_id, _ in report.books]
+    )
+
+    enqueue(
+        background_tasks, summarize_books, report.books, llm, events, current_user.id
+    )
+    return {
+        "count": report.count,
+        "seconds": report.seconds,
+        "books_per_second": report.books_per_second,
+        "books": books,
+    }
+
+
 @router.get("/", response_model=list[schemas.BookResponse])
-def list_books(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return db.query(Book).offset(skip).limit(limit).all()
+def list_books(
+    request: Request,
+    skip: int = 0,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: schemas.BookSort = "id",
+    fields: schemas.BookFields = "full",
+    db: Session = Depends(get_read_db),
+):
+    """
+    Lists the catalog. Pass the `X-Next-Cursor` response header back as
+    `cursor` to fetch the next page; `skip` is only honoured without a cursor.
+    Responses carry an ETag, so conditional requests get a cheap 304.
+    """
+    if cursor:
+        try:
+            last = decode_cursor(cursor, sort, (int,) if sort == "id" else (str, int))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def render():
+        # 1. Projection: never load the summary Text column for compact listings
+        exclude = () if fields == "full" else ("summary",)
+        columns = columns_for(Book, schemas.BookResponse, exclude=exclude)
+
+        order_by = (Book.id,) if sort == "id" else (Book.title, Book.id)
+        query = db.query(*columns).order_by(*order_by)
+
+        # 2. Keyset pagination: seek past the last row instead of OFFSET
+        if cursor:
+            if sort == "id":
+                query = query.filter(Book.id > last[0])
+            else:
+                query = query.filter(tuple_(Book.title, Book.id) > tuple_(*last))
+        elif skip:
+            query = query.offset(skip)
+
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(limit + 1).all()
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            tail = rows[-1]
+            key = (tail.id,) if sort == "id" else (tail.title, tail.id)
+            headers["X-Next-Cursor"] = encode_cursor(sort, key)
+
+        # 3. Rows -> JSON in one orjson pass (no per-row Pydantic validation)
+        return dump_rows(rows), headers
+
+    return cached_json_response(request, db, ["books"], render)
+
+
+@router.get("/search", response_model=list[schemas.BookSearchResult])
+def search_books(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    search: SearchProvider = Depends(get_search_service),
+):
+    """Full-text search over title, author and AI summary, best match first."""
+    return search.search(db, q, limit=limit, offset=offset)
+
+
+@router.get("/trending", response_model=list[schemas.TrendingBookResponse])
+def get_trending_books(
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+    trending: TrendingTracker = Depends(get_trending),
+):
+    """
+    Trending now: borrows and reviews with exponential time decay
+    (TRENDING_HALF_LIFE_HOURS), ranked from the in-memory shelf that every
+    worker reloads each TRENDING_FLUSH_SECONDS.
+    """
+    top = trending.top(limit)
+    rows = (
+        db.query(*columns_for(Book, schemas.RecommendationResponse))
+        .filter(Book.id.in_([book_id for book_id, _ in top]))
+        .all()
+    )
+    rows_by_id = {row.id: row for row in rows}
+    return [
+        {**rows_by_id[book_id]._asdict(), "score": score}
+        for book_id, score in top
+        if book_id in rows_by_id
+    ]
+
+
+@router.get("/{book_id}/similar", response_model=list[schemas.SimilarBookResponse])
+def get_similar_books(
+    book_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """Readers also borrowed: precomputed co-borrow neighbours, best match first."""
+    rows = similar_books(db, book_id, limit)
+    if not rows and db.get(Book, book_id) is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return json_rows_response(rows)
@@ -1,39 +1,196 @@
+import asyncio
+import logging
 from datetime import datetime
-from typing import List
-
-from app.api.dependencies import get_llm_service
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from typing import List, Optional, Tuple
+
+from app.api.dependencies import (
+    get_catalog_index,
+    get_event_broker,
+    get_llm_service,
+    get_read_db,
+    get_recommendation_engine,
+    get_trending,
+)
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import exists, literal, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
-
-from app.api.v1.endpoints.auth import get_current_user
-
-from app.core.interfaces import LLMProvider
-from app.db.session import get_db
+from starlette.concurrency import run_in_threadpool
+
+from app.api.events import format_sse, notify_user, user_channel
+from app.api.http_cache import cached_json_response, mark_changed
+from app.api.rate_limit import rate_limit
+from app.api.responses import columns_for, dump_rows, json_rows_response
+from app.api.v1.endpoints.auth import get_current_principal
+
+from app.core.config import settings
+from app.core.interfaces import EventBroker, LLMProvider
+from app.core.metrics import Histogram
+from app.core.security import Principal
+from app.core.tasks import enqueue
+from app.db.dialects import insert_for
+from app.db.session import get_db, session_scope
 from app.domain import schemas
-from app.infrastructure.services.ml_service import RecommendationEngine
-from app.models.sql_models import Book, Borrow, Review, User, UserPreference
+from app.infrastructure.services.neighbour_service import (
+    neighbour_scores,
+    record_borrows,
+)
+from app.infrastructure.services.trending_service import TrendingTracker
+from app.models.sql_models import (
+    AI_DONE,
+    AI_FAILED,
+    AI_RUNNING,
+    Book,
+    Borrow,
+    Review,
+    UserPreference,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Initialize the ML Engine as a singleton for the router
-ml_engine = RecommendationEngine()
+# Content candidates kept for blending, and neighbours read per borrowed book
+BLEND_CANDIDATES = 50
+NEIGHBOURS_PER_BOOK = 20
+
+RECOMMENDATION_SECONDS = Histogram(
+    "recommendation_scoring_seconds", "Time spent scoring candidates in the ML engine."
+)
+
+
+def _sentiment_event(
+    review_id: int, book_id: int, status: str, sentiment: Optional[str]
+) -> dict:
+    return {
+        "type": "review.sentiment",
+        "review_id": review_id,
+        "book_id": book_id,
+        "status": status,
+        "sentiment": sentiment if status == AI_DONE else None,
+    }
+
+
+def _start_sentiment(db: Session, review_ids: List[int]) -> None:
+    """Marks reviews as in progress, counting one more attempt each."""
+    db.execute(
+        update(Review)
+        .where(Review.id.in_(review_ids))
+        .values(
+            sentiment_status=AI_RUNNING,
+            sentiment_attempts=Review.sentiment_attempts + 1,
+        )
+    )
+    db.commit()
 
 
 async def process_review_sentiment(
-    review_id: int, review_text: str, db_gen, llm: LLMProvider
+    review_id: int,
+    review_text: str,
+    llm: LLMProvider,
+    events: Optional[EventBroker] = None,
 ):
     """Background task to analyze review sentiment using the injected LLM service."""
     try:
-        sentiment = await llm.analyze_sentiment(review_text)
-
-        db = next(db_gen())
-        review = db.query(Review).filter(Review.id == review_id).first()
-        if review:
-            review.sentiment = sentiment
+        with session_scope() as db:
+            _start_sentiment(db, [review_id])
+
+        sentiment, status, error = None, AI_FAILED, None
+        try:
+            sentiment, status = await llm.analyze_sentiment(review_text), AI_DONE
+        except Exception as e:
+            logger.warning("Sentiment for review %s failed: %s", review_id, e)
+            error = str(e)
+
+        with session_scope() as db:
+            review = db.query(Review).filter(Review.id == review_id).first()
+            if review:
+                if status == AI_DONE:
+                    review.sentiment = sentiment
+                review.sentiment_status = status
+                review.sentiment_error = error
+                mark_changed(db, f"reviews:{review.book_id}")
+                db.commit()
+                # Push the result to the reviewer's event stream
+                await notify_user(
+                    events,
+                    review.user_id,
+                    _sentiment_event(review_id, review.book_id, status, sentiment),
+                )
+    except Exception:
+        logger.exception("Background sentiment task for review %s failed", review_id)
+
+
+async def process_review_sentiment_batch(
+    reviews: List[Tuple[int, int, str]],
+    llm: LLMProvider,
+    events: Optional[EventBroker] = None,
+    user_id: Optional[int] = None,
+):
+    """Background task: one batched LLM call for (review_id, book_id, text) items."""
+    try:
+        with session_scope() as db:
+            _start_sentiment(db, [review_id for review_id, _, _ in reviews])
+
+        try:
+            sentiments = await llm.analyze_sentiment_batch(
+                [text for _, _, text in reviews]
+            )
+            status, error = AI_DONE, None
+            rows = [
+                {
+                    "id": review_id,
+                    "sentiment": sentiment,
+                    "sentiment_status": AI_DONE,
+                    "sentiment_error": None,
+                }
+                for (review_id, _, _), sentiment in zip(reviews, sentiments)
+            ]
+        except Exception as e:
+            logger.warning("Sentiment for %d reviews failed: %s", len(reviews), e)
+            sentiments, status, error = [None] * len(reviews), AI_FAILED, str(e)
+            rows = [
+                {
+                    "id": review_id,
+                    "sentiment_status": AI_FAILED,
+                    "sentiment_error": error,
+                }
+                for review_id, _, _ in reviews
+            ]
+
+        with session_scope() as db:
+            db.execute(update(Review), rows)
+            mark_changed(db, *{f"reviews:{book_id}" for _, book_id, _ in reviews})
             db.commit()
-    except Exception as e:
-        print(f"Sentiment Analysis Failed: {e}")
+
+        for (review_id, book_id, _), sentiment in zip(reviews, sentiments):
+            await notify_user(
+                events, user_id, _sentiment_event(review_id, book_id, status, sentiment)
+            )
+    except Exception:
+        logger.exception(
+            "Background sentiment task for %d reviews failed", len(reviews)
+        )
+
+
+def store_profile(ml_engine, user_id: int, version: str, fingerprint: str, profile):
+    """Background task: keeps the user's profile vector for the next request."""
+    try:
+        with session_scope() as db:
+            ml_engine.save_profile(db, user_id, version, fingerprint, profile)
+    except Exception:
+        logger.exception("Storing the profile vector of user %s failed", user_id)
+
+
+def update_neighbours(user_id: int, *borrows: Tuple[int, int]):
+    """Background task folding new (borrow_id, book_id) borrows into the neighbours."""
+    try:
+        with session_scope() as db:
+            record_borrows(db, user_id, borrows, settings.NEIGHBOURS_MAX_HISTORY)
+    except Exception:
+        logger.exception("Neighbour update for user %s failed", user_id)
 
 
 # --- BORROWING ENDPOINTS ---
@@ -42,40 +199,280 @@ async def process_review_sentiment(
 @router.post("/borrow/", response_model=schemas.BorrowResponse)
 def borrow_book(
     borrow_data: schemas.BorrowCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
+    trending: TrendingTracker = Depends(get_trending),
 ):
-    book = db.query(Book).filter(Book.id == borrow_data.book_id).first()
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
-    active_borrow = (
-        db.query(Borrow)
-        .filter(
-            Borrow.book_id == borrow_data.book_id,
-            Borrow.user_id == current_user.id,
-            Borrow.return_date == None,
+    # Single round trip: the book must exist, and the partial unique index
+    # uq_borrows_active_user_book rejects a second active borrow.
+    stmt = (
+        insert_for(db)(Borrow)
+        .from_select(
+            ["user_id", "book_id"],
+            select(literal(current_user.id), literal(borrow_data.book_id)).where(
+                exists().where(Book.id == borrow_data.book_id)
+            ),
         )
-        .first()
+        .on_conflict_do_nothing()
+        .returning(*Borrow.__table__.c)
     )
-
-    if active_borrow:
+    try:
+        new_borrow = db.execute(stmt).mappings().first()
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        new_borrow = None
+
+    if new_borrow is None:
+        # Slow path only on failure: find out which rule was violated
+        if db.query(Book.id).filter(Book.id == borrow_data.book_id).first() is None:
+            raise HTTPException(status_code=404, detail="Book not found")
         raise HTTPException(
             status_code=400, detail="You have already borrowed this book."
         )
 
-    new_borrow = Borrow(user_id=current_user.id, book_id=borrow_data.book_id)
-    db.add(new_borrow)
-    db.commit()
-    db.refresh(new_borrow)
+    trending.record(borrow_data.book_id, settings.TRENDING_BORROW_WEIGHT, "borrow")
+    enqueue(
+        background_tasks,
+        update_neighbours,
+        current_user.id,
+        (new_borrow["id"], borrow_data.book_id),
+    )
     return new_borrow
 
 
+# --- BATCH ENDPOINTS (kiosks, offline sync) ---
+# Declared before /return/{borrow_id} so "batch" is not read as an id.
+# Each batch validates with one query per rule, writes with one multi-row
+# statement and commits once; items fail individually, never the whole batch.
+
+
+@router.post("/borrow/batch", response_model=list[schemas.BorrowBatchResult])
+def borrow_books_batch(
+    batch: schemas.BorrowBatchRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    trending: TrendingTracker = Depends(get_trending),
+):
+    book_ids = {item.book_id for item in batch.items}
+
+    # 1. Set-based validation: existing books, books already held by the user
+    existing = set(db.scalars(select(Book.id).where(Book.id.in_(book_ids))))
+    held = set(
+        db.scalars(
+            select(Borrow.book_id).where(
+                Borrow.user_id == current_user.id,
+                Borrow.book_id.in_(book_ids),
+                Borrow.return_date.is_(None),
+            )
+        )
+    )
+
+    results, to_insert, seen = {}, [], set()
+    for index, item in enumerate(batch.items):
+        if item.book_id not in existing:
+            results[index] = (404, "Book not found")
+        elif item.book_id in held or item.book_id in seen:
+            results[index] = (400, "You have already borrowed this book.")
+        else:
+            seen.add(item.book_id)
+            to_insert.append(index)
+
+    # 2. One multi-row INSERT; a concurrent borrow loses on the unique index
+    inserted = {}
+    if to_insert:
+        rows = db.execute(
+            insert_for(db)(Borrow)
+            .values(
+                [
+                    {"user_id": current_user.id, "book_id": batch.items[i].book_id}
+                    for i in to_insert
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(*Borrow.__table__.c)
+        ).mappings()
+        inserted = {row["book_id"]: row for row in rows}
+        db.commit()
+
+    response = []
+    for index, item in enumerate(batch.items):
+        if index in results:
+            status, detail = results[index]
+            response.append({"index": index, "status": status, "detail": detail})
+        elif item.book_id in inserted:
+            response.append(
+                {"index": index, "status": 200, "borrow": inserted[item.book_id]}
+            )
+        else:
+            response.append(
+                {
+                    "index": index,
+                    "status": 400,
+                    "detail": "You have already borrowed this book.",
+                }
+            )
+
+    for book_id in inserted:
+        trending.record(book_id, settings.TRENDING_BORROW_WEIGHT, "borrow")
+    if inserted:
+        enqueue(
+            background_tasks,
+            update_neighbours,
+            current_user.id,
+            *((row["id"], book_id) for book_id, row in inserted.items()),
+        )
+    return response
+
+
+@router.post("/return/batch", response_model=list[schemas.BorrowBatchResult])
+def return_books_batch(
+    batch: schemas.ReturnBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    # One UPDATE ... RETURNING for the open borrows; replays of already
+    # returned items succeed unchanged, so sync clients can retry safely
+    returned = {
+        row["id"]: row
+        for row in db.execute(
+            Borrow.__table__.update()
+            .where(
+                Borrow.id.in_(batch.borrow_ids),
+                Borrow.user_id == current_user.id,
+                Borrow.return_date.is_(None),
+            )
+            .values(return_date=datetime.utcnow())
+            .returning(*Borrow.__table__.c)
+        ).mappings()
+    }
+    db.commit()
+
+    missing = set(batch.borrow_ids) - set(returned)
+    if missing:
+        already_returned = db.execute(
+            select(*Borrow.__table__.c).where(
+                Borrow.id.in_(missing), Borrow.user_id == current_user.id
+            )
+        ).mappings()
+        returned.update({row["id"]: row for row in already_returned})
+
+    return [
+        (
+            {"index": index, "status": 200, "borrow": returned[borrow_id]}
+            if borrow_id in returned
+            else {"index": index, "status": 404, "detail": "Borrow record not found"}
+        )
+        for index, borrow_id in enumerate(batch.borrow_ids)
+    ]
+
+
+@router.post("/reviews/batch", response_model=list[schemas.ReviewBatchResult])
+def create_reviews_batch(
+    batch: schemas.ReviewBatchRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    llm: LLMProvider = Depends(get_llm_service),
+    events: EventBroker = Depends(get_event_broker),
+    trending: TrendingTracker = Depends(get_trending),
+):
+    book_ids = {item.book_id for item in batch.items}
+
+    # 1. Set-based validation: borrowed books, books already reviewed
+    borrowed = set(
+        db.scalars(
+            select(Borrow.book_id)
+            .where(Borrow.user_id == current_user.id, Borrow.book_id.in_(book_ids))
+            .distinct()
+        )
+    )
+    reviewed = set(
+        db.scalars(
+            select(Review.book_id).where(
+                Review.user_id == current_user.id, Review.book_id.in_(book_ids)
+            )
+        )
+    )
+
+    results, to_insert, seen = {}, [], set()
+    for index, item in enumerate(batch.items):
+        if item.rating < 1 or item.rating > 5:
+            results[index] = (400, "Rating must be between 1 and 5")
+        elif item.book_id not in borrowed:
+            results[index] = (403, "You must borrow a book before reviewing it.")
+        elif item.book_id in reviewed or item.book_id in seen:
+            results[index] = (400, "You have already reviewed this book.")
+        else:
+            seen.add(item.book_id)
+            to_insert.append(index)
+
+    # 2. One multi-row INSERT; uq_reviews_book_user settles concurrent duplicates
+    inserted = {}
+    if to_insert:
+        rows = db.execute(
+            insert_for(db)(Review)
+            .values(
+                [
+                    {
+                        "user_id": current_user.id,
+                        "book_id": batch.items[i].book_id,
+                        "rating": batch.items[i].rating,
+                        "comment": batch.items[i].comment,
+                        "sentiment": "Pending",
+                    }
+                    for i in to_insert
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(*Review.__table__.c)
+        ).mappings()
+        inserted = {row["book_id"]: row for row in rows}
+        if inserted:
+            mark_changed(db, *(f"reviews:{book_id}" for book_id in inserted))
+        db.commit()
+
+    response = []
+    for index, item in enumerate(batch.items):
+        if index in results:
+            status, detail = results[index]
+            response.append({"index": index, "status": status, "detail": detail})
+        elif item.book_id in inserted:
+            response.append(
+                {"index": index, "status": 200, "review": inserted[item.book_id]}
+            )
+        else:
+            response.append(
+                {
+                    "index": index,
+                    "status": 400,
+                    "detail": "You have already reviewed this book.",
+                }
+            )
+
+    for book_id in inserted:
+        trending.record(book_id, settings.TRENDING_REVIEW_WEIGHT, "review")
+
+    # 3. The whole batch goes to sentiment analysis as one batch
+    if inserted:
+        enqueue(
+            background_tasks,
+            process_review_sentiment_batch,
+            [(row["id"], row["book_id"], row["comment"]) for row in inserted.values()],
+            llm,
+            events,
+            current_user.id,
+        )
+    return response
+
+
 @router.post("/return/{borrow_id}", response_model=schemas.BorrowResponse)
 def return_book(
     borrow_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     borrow_record = (
         db.query(Borrow)
@@ -99,53 +496,60 @@ def create_review(
     review_data: schemas.ReviewCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     llm: LLMProvider = Depends(get_llm_service),
+    events: EventBroker = Depends(get_event_broker),
+    trending: TrendingTracker = Depends(get_trending),
 ):
     if review_data.rating < 1 or review_data.rating > 5:
         raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
 
-    # CRITICAL RULE: User must have borrowed the book to review it
-    has_borrowed = (
-        db.query(Borrow)
-        .filter(
-            Borrow.book_id == review_data.book_id, Borrow.user_id == current_user.id
-        )
-        .first()
+    # CRITICAL RULE: User must have borrowed the book to review it.
+    # Enforced in the same INSERT; uq_reviews_book_user allows one review per book.
+    has_borrowed = exists().where(
+        Borrow.book_id == review_data.book_id, Borrow.user_id == current_user.id
     )
-
-    if not has_borrowed:
-        raise HTTPException(
-            status_code=403, detail="You must borrow a book before reviewing it."
-        )
-
-    # Check if already reviewed (Optional rule: 1 review per book)
-    existing_review = (
-        db.query(Review)
-        .filter(
-            Review.book_id == review_data.book_id, Review.user_id == current_user.id
+    stmt = (
+        insert_for(db)(Review)
+        .from_select(
+            ["user_id", "book_id", "rating", "comment", "sentiment"],
+            select(
+                literal(current_user.id),
+                literal(review_data.book_id),
+                literal(review_data.rating),
+                literal(review_data.comment),
+                literal("Pending"),
+            ).where(has_borrowed),
         )
-        .first()
+        .on_conflict_do_nothing()
+        .returning(*Review.__table__.c)
     )
-
-    if existing_review:
+    try:
+        new_review = db.execute(stmt).mappings().first()
+        if new_review is not None:
+            mark_changed(db, f"reviews:{review_data.book_id}")
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        new_review = None
+
+    if new_review is None:
+        if not db.query(has_borrowed).scalar():
+            raise HTTPException(
+                status_code=403, detail="You must borrow a book before reviewing it."
+            )
         raise HTTPException(
             status_code=400, detail="You have already reviewed this book."
         )
 
-    new_review = Review(
-        user_id=current_user.id,
-        book_id=review_data.book_id,
-        rating=review_data.rating,
-        comment=review_data.comment,
-        sentiment="Pending",
-    )
-    db.add(new_review)
-    db.commit()
-    db.refresh(new_review)
-
-    background_tasks.add_task(
-        process_review_sentiment, new_review.id, new_review.comment, get_db, llm
+    trending.record(review_data.book_id, settings.TRENDING_REVIEW_WEIGHT, "review")
+    enqueue(
+        background_tasks,
+        process_review_sentiment,
+        new_review["id"],
+        new_review["comment"],
+        llm,
+        events,
     )
     return new_review
 
@@ -154,43 +558,199 @@ def create_review(
 
 
 @router.get("/reviews/{book_id}", response_model=List[schemas.ReviewResponse])
-def get_book_reviews(book_id: int, db: Session = Depends(get_db)):
-    return db.query(Review).filter(Review.book_id == book_id).all()
+def get_book_reviews(
+    book_id: int, request: Request, db: Session = Depends(get_read_db)
+):
+    def render():
+        reviews = (
+            db.query(*columns_for(Review, schemas.ReviewResponse))
+            .filter(Review.book_id == book_id)
+            .all()
+        )
+        return dump_rows(reviews), {}
 
+    return cached_json_response(request, db, [f"reviews:{book_id}"], render)
 
-@router.get("/recommendations/", response_model=list[schemas.RecommendationResponse])
-def get_ml_recommendations(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+
+def _finished_events(
+    user_id: int, book_ids: List[int], review_ids: List[int]
+) -> List[dict]:
+    """Results that were ready before the stream opened, as events."""
+    with session_scope() as db:
+        books = (
+            db.query(Book.id, Book.summary)
+            .filter(Book.id.in_(book_ids), Book.summary_status == AI_DONE)
+            .all()
+            if book_ids
+            else []
+        )
+        reviews = (
+            db.query(Review.id, Review.book_id, Review.sentiment)
+            .filter(
+                Review.id.in_(review_ids),
+                Review.user_id == user_id,
+                Review.sentiment_status == AI_DONE,
+            )
+            .all()
+            if review_ids
+            else []
+        )
+    return [
+        {
+            "type": "book.summary",
+            "book_id": book_id,
+            "status": "done",
+            "summary": summary,
+        }
+        for book_id, summary in books
+    ] + [
+        _sentiment_event(review_id, book_id, AI_DONE, sentiment)
+        for review_id, book_id, sentiment in reviews
+    ]
+
+
+@router.get("/events")
+async def stream_events(
+    book_id: List[int] = Query([]),
+    review_id: List[int] = Query([]),
+    current_user: Principal = Depends(get_current_principal),
+    events: EventBroker = Depends(get_event_broker),
 ):
-    # 1. Get IDs of books the user has already borrowed
-    borrowed_books = (
-        db.query(Borrow.book_id).filter(Borrow.user_id == current_user.id).all()
+    """
+    Server-Sent Events stream of the caller's AI results (book summaries,
+    review sentiment) as they finish. Pass the `book_id`/`review_id` values
+    still pending to also receive the ones that completed before connecting.
+    """
+
+    async def stream():
+        # 1. Subscribe first so nothing finishing during the snapshot is missed
+        async with events.subscribe(user_channel(current_user.id)) as queue:
+            # 2. Replay what is already done (no DB session held while streaming)
+            if book_id or review_id:
+                finished = await run_in_threadpool(
+                    _finished_events, current_user.id, book_id, review_id
+                )
+                for event in finished:
+                    yield format_sse(event)
+
+            # 3. Live events, with a comment line as heartbeat while idle
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    borrowed_book_ids = [b[0] for b in borrowed_books]
 
-    # 2. Gather the text to build the "User ML Profile"
-    user_profile_text = []
 
-    # A. Add summaries of books they've read
-    if borrowed_book_ids:
-        liked_books = db.query(Book).filter(Book.id.in_(borrowed_book_ids)).all()
-        for book in liked_books:
-            if book.summary and book.summary != "Pending...":
-                user_profile_text.append(book.summary)
+@router.get(
+    "/recommendations/",
+    response_model=list[schemas.RecommendationResponse],
+    dependencies=[
+        Depends(
+            rate_limit(
+                "recommendations",
+                settings.RATE_LIMIT_RECOMMENDATIONS_USER,
+                settings.RATE_LIMIT_RECOMMENDATIONS_GLOBAL,
+            )
+        )
+    ],
+)
+def get_ml_recommendations(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    ml_engine=Depends(get_recommendation_engine),
+    catalog_index=Depends(get_catalog_index),
+    trending: TrendingTracker = Depends(get_trending),
+):
+    # 1. Get IDs of books the user has already borrowed, most recent first
+    borrowed_books = (
+        db.query(Borrow.book_id)
+        .filter(Borrow.user_id == current_user.id)
+        .order_by(Borrow.borrow_date.desc(), Borrow.id.desc())
+        .all()
+    )
+    borrowed_book_ids = list(dict.fromkeys(b[0] for b in borrowed_books))
 
-    # B. Add Explicit User Preferences (e.g., "Sci-Fi", "Machine Learning")
+    # 2. Explicit User Preferences (e.g., "Sci-Fi", "Machine Learning")
     explicit_prefs = (
         db.query(UserPreference.topic_tag)
         .filter(UserPreference.user_id == current_user.id)
         .all()
     )
-    for pref in explicit_prefs:
-        user_profile_text.append(pref[0])
+    tags = [pref[0] for pref in explicit_prefs if pref[0]]
+
+    # 3. Collaborative signal: neighbours of their most recently borrowed books
+    collaborative = neighbour_scores(
+        db,
+        borrowed_book_ids[: settings.NEIGHBOURS_MAX_HISTORY],
+        exclude_ids=borrowed_book_ids,
+        per_book=NEIGHBOURS_PER_BOOK,
+    )
+
+    # 4. Build the "User ML Profile". With a published index the stored
+    # profile vector is reused while its inputs are unchanged, which skips
+    # loading and vectorizing the summaries of every book they read.
+    # (falls back to per-request fitting while no index is published)
+    index = catalog_index.current()
+    profile, fingerprint = None, None
+    if index is not None:
+        summarized_ids = (
+            [
+                book_id
+                for (book_id,) in db.query(Book.id).filter(
+                    Book.id.in_(borrowed_book_ids), Book.summary_status == AI_DONE
+                )
+            ]
+            if borrowed_book_ids
+            else []
+        )
+        fingerprint = ml_engine.profile_fingerprint(index.version, summarized_ids, tags)
+        profile = ml_engine.load_profile(db, current_user.id, index, fingerprint)
+
+    user_profile_text = []
+    if profile is None:
+        # A. Add summaries of books they've read
+        if borrowed_book_ids:
+            liked_books = db.query(Book.summary).filter(
+                Book.id.in_(borrowed_book_ids), Book.summary_status == AI_DONE
+            )
+            for (summary,) in liked_books:
+                if summary:
+                    user_profile_text.append(summary)
+
+        # B. Add the explicit preferences
+        user_profile_text.extend(tags)
+
+    # 5. Handle the "Cold Start" (no usable text profile)
+    if profile is None and not user_profile_text:
+        if collaborative:
+            top_ids = [
+                result["book_id"]
+                for result in ml_engine.blend_scores([], collaborative, weight=1.0)
+            ]
+            return _books_in_order(db, top_ids)
+
+        # Brand new user: no history, no prefs. Show what is trending now,
+        # or the best rated books before any interaction has been counted.
+        trending_ids = [
+            book_id
+            for book_id, _ in trending.top(5, exclude_ids=set(borrowed_book_ids))
+        ]
+        if trending_ids:
+            return _books_in_order(db, trending_ids)
 
-    # 3. Handle the "Cold Start" (User is brand new, no history, no prefs)
-    if not user_profile_text:
         fallback_recommendations = (
-            db.query(Book)
+            db.query(*columns_for(Book, schemas.RecommendationResponse))
             .outerjoin(Review, Book.id == Review.book_id)
             .filter(Book.id.notin_(borrowed_book_ids) if borrowed_book_ids else True)
             .group_by(Book.id)
@@ -198,32 +758,72 @@ def get_ml_recommendations(
             .limit(5)
             .all()
         )
-        return fallback_recommendations
-
-    # 4. Prepare the unread books for the ML Model
-    if borrowed_book_ids:
-        other_books_query = (
-            db.query(Book).filter(Book.id.notin_(borrowed_book_ids)).all()
+        return json_rows_response(fallback_recommendations)
+
+    # 6. Prepare the unread books for the ML Model (only the columns it reads).
+    # With a published index only books summarized since it was built need to
+    # be loaded, whatever their id (imports, backfill) (ix_books_summarized_at).
+    # Only successfully summarized books are candidates (ix_books_summary_done).
+    other_books_query = db.query(Book.id, Book.title, Book.summary).filter(
+        Book.summary_status == AI_DONE
+    )
+    if index is not None and index.indexed_at is not None:
+        other_books_query = other_books_query.filter(
+            Book.summarized_at >= index.indexed_at
         )
-    else:
-        other_books_query = db.query(Book).all()
+    if borrowed_book_ids:
+        other_books_query = other_books_query.filter(Book.id.notin_(borrowed_book_ids))
 
     all_other_books = [
         {"id": b.id, "title": b.title, "summary": b.summary}
         for b in other_books_query
-        if b.summary and b.summary != "Pending..."
+        if b.summary
     ]
 
-    # 5. Run the Content-Based ML Algorithm
-    scored_results = ml_engine.get_content_based_recommendations(
-        user_liked_summaries=user_profile_text, all_other_books=all_other_books
-    )
+    # 7. Run the Content-Based ML Algorithm
+    with RECOMMENDATION_SECONDS.time():
+        if index is not None:
+            if profile is None:
+                profile = ml_engine.build_profile(index, user_profile_text)
+                enqueue(
+                    background_tasks,
+                    store_profile,
+                    ml_engine,
+                    current_user.id,
+                    index.version,
+                    fingerprint,
+                    profile,
+                )
+            scored_results = ml_engine.get_indexed_recommendations(
+                index,
+                user_liked_summaries=user_profile_text,
+                exclude_ids=borrowed_book_ids,
+                new_books=all_other_books,
+                limit=BLEND_CANDIDATES,
+                profile=profile,
+            )
+        else:
+            scored_results = ml_engine.get_content_based_recommendations(
+                user_liked_summaries=user_profile_text, all_other_books=all_other_books
+            )
+
+        # 8. Blend in "readers also borrowed"
+        scored_results = ml_engine.blend_scores(
+            scored_results, collaborative, weight=settings.RECOMMENDATION_CF_WEIGHT
+        )
+
+    # 9. Fetch the winning books from the DB using the ML winning IDs
+    return _books_in_order(db, [result["book_id"] for result in scored_results[:5]])
 
-    # 6. Fetch the actual Book objects from the DB using the ML winning IDs
-    recommended_books = []
-    for result in scored_results[:5]:
-        book = db.query(Book).filter(Book.id == result["book_id"]).first()
-        if book:
-            recommended_books.append(book)
 
-    return recommended_books
+def _books_in_order(db: Session, book_ids: List[int]):
+    """One IN query for the winning books, returned in ranking order."""
+    rows = (
+        db.query(*columns_for(Book, schemas.RecommendationResponse))
+        .filter(Book.id.in_(book_ids))
+        .all()
+    )
+    rows_by_id = {row.id: row for row in rows}
+    return json_rows_response(
+        [rows_by_id[book_id] for book_id in book_ids if book_id in rows_by_id]
+    )
@@ -0,0 +1,223 @@
+"""
+Reprocess failed or missing AI results (book summaries, review sentiment).
+
+    python -m app.backfill                              # both kinds
+    python -m app.backfill --only summaries --rate 0.5  # gentler
+
+Walks the rows whose status is not "done" in id order, one batch at a time.
+LLM calls are throttled (--rate starts per second, --concurrency in flight)
+so a recovering Ollama is not flooded. The last finished id of each kind is
+saved to --checkpoint after every batch, so an interrupted run resumes where
+it stopped. A batch in which nothing succeeds stops the run (the LLM is
+probably still down) without moving the checkpoint.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from sqlalchemy import func, select
+
+from app.api.v1.endpoints.books import process_ai_summary
+from app.api.v1.endpoints.interactions import process_review_sentiment_batch
+from app.core.config import settings
+from app.core.interfaces import LLMProvider
+from app.db.session import session_scope
+from app.infrastructure.services.ingestion_service import run_rate_limited
+from app.infrastructure.services.ollama_service import OllamaService
+from app.models.sql_models import (
+    AI_DONE,
+    AI_FAILED,
+    AI_PENDING,
+    AI_RUNNING,
+    Book,
+    Review,
+)
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("summaries", "sentiment")
+
+
+def load_checkpoint(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_checkpoint(path: Path, checkpoint: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_suffix(".tmp")
+    staging.write_text(json.dumps(checkpoint))
+    os.replace(staging, path)
+
+
+def _todo(model, status, attempts, args: argparse.Namespace, after_id: int):
+    statuses = [AI_PENDING, AI_FAILED] + ([AI_RUNNING] if args.include_running else [])
+    query = select(model.id).where(status.in_(statuses), model.id > after_id)
+    if args.max_attempts:
+        query = query.where(attempts < args.max_attempts)
+    return query.order_by(model.id).limit(args.batch_size)
+
+
+def summary_batch(args: argparse.Namespace, after_id: int) -> List[Tuple]:
+    with session_scope() as db:
+        ids = _todo(Book, Book.summary_status, Book.summary_attempts, args, after_id)
+        return db.execute(
+            select(Book.id, Book.file_path).where(Book.id.in_(ids)).order_by(Book.id)
+        ).all()
+
+
+def sentiment_batch(args: argparse.Namespace, after_id: int) -> List[Tuple]:
+    with session_scope() as db:
+        ids = _todo(
+            Review, Review.sentiment_status, Review.sentiment_attempts, args, after_id
+        )
+        return db.execute(
+            select(Review.id, Review.book_id, Review.comment)
+            .where(Review.id.in_(ids))
+            .order_by(Review.id)
+        ).all()
+
+
+def summary_jobs(rows: List[Tuple], llm: LLMProvider, args: argparse.Namespace):
+    return [
+        lambda book_id=book_id, path=path: process_ai_summary(book_id, path, llm)
+        for book_id, path in rows
+    ]
+
+
+def sentiment_jobs(rows: List[Tuple], llm: LLMProvider, args: argparse.Namespace):
+    items = [
+        (review_id, book_id, comment or "") for review_id, book_id, comment in rows
+    ]
+    return [
+        lambda chunk=items[start : start + args.review_chunk]: (
+            process_review_sentiment_batch(chunk, llm)
+        )
+        for start in range(0, len(items), args.review_chunk)
+    ]
+
+
+def count_done(model, status, ids: List[int]) -> int:
+    with session_scope() as db:
+        return db.scalar(
+            select(func.count())
+            .select_from(model)
+            .where(model.id.in_(ids), status == AI_DONE)
+        )
+
+
+async def backfill(
+    kind: str,
+    fetch: Callable,
+    make_jobs: Callable,
+    model,
+    status,
+    llm: LLMProvider,
+    args: argparse.Namespace,
+    checkpoint: dict,
+) -> bool:
+    """Runs one kind to the end. False if it stopped because nothing succeeded."""
+    after_id = checkpoint.get(kind, 0)
+    done = failed = 0
+    while True:
+        rows = fetch(args, after_id)
+        if not rows:
+            break
+        ids = [row[0] for row in rows]
+
+        # 1. Throttled LLM calls; the tasks record done/failed on each row
+        await run_rate_limited(
+            make_jobs(rows, llm, args),
+            rate_per_second=args.rate,
+            concurrency=args.concurrency,
+        )
+
+        # 2. Nothing succeeded: stop here and retry this batch next run
+        succeeded = count_done(model, status, ids)
+        done, failed = done + succeeded, failed + len(ids) - succeeded
+        if succeeded == 0:
+            logger.warning(
+                "%s: whole batch failed after id %s; stopping.", kind, after_id
+            )
+            return False
+
+        # 3. Checkpoint after every batch
+        after_id = ids[-1]
+        checkpoint[kind] = after_id
+        save_checkpoint(args.checkpoint, checkpoint)
+        logger.info(
+            "%s: up to id %s (%d done, %d failed)", kind, after_id, done, failed
+        )
+
+    # A finished pass starts from the beginning next time
+    checkpoint.pop(kind, None)
+    save_checkpoint(args.checkpoint, checkpoint)
+    logger.info("%s: finished (%d done, %d failed)", kind, done, failed)
+    return True
+
+
+async def run(args: argparse.Namespace) -> int:
+    checkpoint = {} if args.restart else load_checkpoint(args.checkpoint)
+    llm = OllamaService()
+    plans = {
+        "summaries": (summary_batch, summary_jobs, Book, Book.summary_status),
+        "sentiment": (sentiment_batch, sentiment_jobs, Review, Review.sentiment_status),
+    }
+    for kind in args.only or KINDS:
+        if not await backfill(kind, *plans[kind], llm, args, checkpoint):
+            return 2
+    return 0
+
+
+def main(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    code = asyncio.run(run(args))
+    logger.info("Backfill took %.2fs", time.perf_counter() - start)
+    return code
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(
+        description="Reprocess failed or missing AI results."
+    )
+    parser.add_argument("--only", choices=KINDS, action="append")
+    parser.add_argument(
+        "--batch-size", type=int, default=100, help="Rows per checkpoint"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=settings.INGEST_SUMMARY_RATE,
+        help="LLM calls started per second",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.INGEST_SUMMARY_CONCURRENCY
+    )
+    parser.add_argument(
+        "--review-chunk", type=int, default=20, help="Reviews classified per LLM call"
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=5,
+        help="Skip items that already failed this often (0 = no limit)",
+    )
+    parser.add_argument(
+        "--include-running",
+        action="store_true",
+        help="Also retry rows left 'running' by a worker that died",
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, default=Path("data/backfill_checkpoint.json")
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint")
+    sys.exit(main(parser.parse_args()))
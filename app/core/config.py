@@ -16,14 +16,118 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str
 
+    # --- CONNECTION POOL ---
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    # Connections checked out longer than this are reported as long-held/leaked
+    DB_POOL_LONG_HOLD_SECONDS: float = 10.0
+
+    # --- READ REPLICAS (optional) ---
+    # Comma-separated URLs; read-only endpoints are spread over them round-robin.
+    # Empty keeps every query on DATABASE_URL.
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_EJECT_SECONDS: float = 30.0  # A failing replica is skipped this long
+    # After a successful write, the same client reads from the primary for this
+    # long so it sees its own change despite replication lag
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
     # --- SECURITY ---
     # No default value! Forces the app to safely load it from .env
     SECRET_KEY: str = "dev_fallback_secret_key_for_testing_only"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Verified tokens are cached per worker; a deactivation reaches other
+    # workers after at most this many seconds
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing. Changing the cost rehashes passwords on next login.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4  # Dedicated bcrypt threads
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Waiting requests before answering 503
+
+    # --- HEALTH PROBES ---
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0  # Background refresh period
+    HEALTH_CHECK_TTL_SECONDS: float = 15.0  # Older results count as failed
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    # Ollama being down degrades AI features but does not stop the API by default
+    HEALTH_LLM_CRITICAL: bool = False
+
+    # --- SQL PROFILER (opt-in, adds X-DB-* response headers) ---
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_PROFILER_SLOW_COUNT: int = 3  # Slowest statements logged per request
+    SQL_PROFILER_REPEAT_THRESHOLD: int = 3  # Identical statements flagged as N+1
+
+    # --- HTTP CACHING ---
+    # ETags are always sent; this toggles the in-process cache of rendered bodies
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+
+    # --- RATE LIMITING ---
+    # Token buckets written as "<count>/<second|minute|hour|day>"; the count is
+    # also the burst size. An empty value disables that bucket.
+    RATE_LIMIT_ENABLED: bool = True
+    # "memory" (per worker) or "database" (shared by all workers and nodes)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100000
+    RATE_LIMIT_BOOK_UPLOAD_USER: str = "10/minute"
+    RATE_LIMIT_BOOK_UPLOAD_GLOBAL: str = "120/minute"
+    # POST /books/bulk is charged one token per file; a request may hold at most
+    # as many files as the per-user bucket
+    RATE_LIMIT_BOOK_BULK_USER: str = "200/hour"
+    RATE_LIMIT_BOOK_BULK_GLOBAL: str = "2000/hour"
+    RATE_LIMIT_RECOMMENDATIONS_USER: str = "30/minute"
+    RATE_LIMIT_RECOMMENDATIONS_GLOBAL: str = "600/minute"
+
+    # --- PUSH EVENTS (GET /interactions/events) ---
+    # "memory" (single worker) or "postgres" (LISTEN/NOTIFY across workers)
+    EVENT_BROKER_BACKEND: str = "memory"
+    EVENT_QUEUE_SIZE: int = 100  # Undelivered events kept per connection
+    EVENT_HEARTBEAT_SECONDS: float = 15.0  # Keeps idle proxies from closing streams
 
     # --- AI SERVICE ---
     OLLAMA_BASE_URL: str
+    # Token budgets (see app/core/tokens.py). One num_ctx for every call:
+    # Ollama reloads the model whenever it changes between requests.
+    LLM_NUM_CTX: int = 2048
+    LLM_SUMMARY_INPUT_TOKENS: int = 1536  # Book text sent for a summary
+    LLM_SUMMARY_MAX_TOKENS: int = 256  # num_predict for summaries
+    LLM_REVIEW_INPUT_TOKENS: int = 256  # Longer reviews are trimmed to this
+    # Priority scheduling (app/infrastructure/services/llm_scheduler.py)
+    LLM_CONCURRENCY: int = 4  # Calls in flight per worker (match OLLAMA_NUM_PARALLEL)
+    LLM_INTERACTIVE_RESERVED_SLOTS: int = 1  # Never given to bulk work
+    LLM_INTERACTIVE_WEIGHT: float = 8.0  # Share of slots while both classes wait
+    LLM_BULK_WEIGHT: float = 1.0
+    LLM_AGING_SECONDS: float = 120.0  # Waited this long: served next, any class
+
+    # --- RECOMMENDATION INDEX ---
+    # Published by `python -m app.reindex`; workers memory-map the CURRENT version
+    RECOMMENDATION_INDEX_DIR: str = "data/recommendation_index"
+    RECOMMENDATION_INDEX_CHECK_SECONDS: float = 10.0  # How often to look for a new version
+    RECOMMENDATION_INDEX_KEEP_VERSIONS: int = 3
+
+    # --- CO-BORROW NEIGHBOURS ---
+    NEIGHBOURS_TOP_M: int = 50  # Neighbours kept per book by the full rebuild
+    NEIGHBOURS_MAX_HISTORY: int = 200  # Past borrows paired with each new borrow
+    # Share of the "readers also borrowed" signal in blended recommendations
+    RECOMMENDATION_CF_WEIGHT: float = 0.3
+
+    # --- TRENDING ---
+    TRENDING_HALF_LIFE_HOURS: float = 24.0  # An interaction counts half after this
+    TRENDING_FLUSH_SECONDS: float = 30.0  # Worker counters -> book_trending, then reload
+    TRENDING_SHELF_SIZE: int = 100  # Top books kept in memory per worker
+    TRENDING_BORROW_WEIGHT: float = 1.0
+    TRENDING_REVIEW_WEIGHT: float = 0.5
+
+    # --- BULK INGESTION ---
+    INGEST_BATCH_SIZE: int = 500  # Rows per multi-row INSERT
+    INGEST_CONCURRENCY: int = 16  # Files read/written to storage at once
+    INGEST_SUMMARY_RATE: float = 2.0  # Summaries started per second
+    INGEST_SUMMARY_CONCURRENCY: int = 4
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+
+@dataclass
+class CheckResult:
+    ok: bool
+    detail: str
+    checked_at: float  # time.monotonic()
+    latency_ms: float
+
+
+@dataclass
+class _Check:
+    probe: Callable[[], Awaitable[bool]]
+    critical: bool
+
+
+class HealthMonitor:
+    """
+    Runs dependency checks in the background and keeps the latest results,
+    so readiness probes answer from memory instead of doing I/O.
+    """
+
+    def __init__(self, interval: float, ttl: float, timeout: float):
+        self.interval = interval
+        self.ttl = ttl
+        self.timeout = timeout
+        self._checks: Dict[str, _Check] = {}
+        self._results: Dict[str, CheckResult] = {}
+        self._flags: Dict[str, bool] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(
+        self, name: str, probe: Callable[[], Awaitable[bool]], critical: bool = True
+    ) -> None:
+        """Adds a check. Non-critical checks are reported but never fail readiness."""
+        self._checks[name] = _Check(probe=probe, critical=critical)
+
+    def set_flag(self, name: str, ready: bool) -> None:
+        """In-process readiness conditions (e.g. a warm-up that has not finished)."""
+        self._flags[name] = ready
+
+    async def _run_check(self, name: str, check: _Check) -> None:
+        start = time.perf_counter()
+        try:
+            ok = bool(await asyncio.wait_for(check.probe(), timeout=self.timeout))
+            detail = "ok" if ok else "check failed"
+        except asyncio.TimeoutError:
+            ok, detail = False, f"timed out after {self.timeout}s"
+        except Exception as e:
+            ok, detail = False, repr(e)
+        self._results[name] = CheckResult(
+            ok=ok,
+            detail=detail,
+            checked_at=time.monotonic(),
+            latency_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    async def refresh(self) -> None:
+        await asyncio.gather(
+            *(self._run_check(name, check) for name, check in self._checks.items())
+        )
+
+    async def _loop(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """Readiness verdict plus per-check details. Pure in-memory read."""
+        now = time.monotonic()
+        checks = {}
+        ready = all(self._flags.values())
+        for name, check in self._checks.items():
+            result = self._results.get(name)
+            if result is None:
+                checks[name] = {"ok": False, "detail": "not checked yet"}
+                fresh_ok = False
+            else:
+                age = now - result.checked_at
+                fresh_ok = result.ok and age <= self.ttl
+                checks[name] = {
+                    "ok": fresh_ok,
+                    "detail": result.detail if age <= self.ttl else "stale",
+                    "age_seconds": round(age, 2),
+                    "latency_ms": round(result.latency_ms, 2),
+                }
+            checks[name]["critical"] = check.critical
+            if check.critical and not fresh_ok:
+                ready = False
+        return {
+            "ready": ready,
+            "checks": checks,
+            "flags": dict(self._flags),
+        }
@@ -1,8 +1,21 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import AsyncContextManager, List, Mapping
+
+from sqlalchemy.orm import Session
+
+from app.core.rate_limit import Limit, RateLimitDecision
+
+
+class LLMError(Exception):
+    """An LLM call failed (unreachable, timed out, bad response)."""
 
 
 class LLMProvider(ABC):
-    """Contract for any AI/LLM service."""
+    """
+    Contract for any AI/LLM service. Failures raise `LLMError`; results
+    are always real model output, never an error message.
+    """
 
     @abstractmethod
     async def generate_summary(self, text: str) -> str:
@@ -12,6 +25,20 @@ class LLMProvider(ABC):
     async def analyze_sentiment(self, review_text: str) -> str:
         pass
 
+    async def analyze_sentiment_batch(self, review_texts: List[str]) -> List[str]:
+        """
+        Sentiment of several reviews, in order. Providers that can classify
+        many texts in one call should override this default (one call each).
+        """
+        return list(
+            await asyncio.gather(*(self.analyze_sentiment(t) for t in review_texts))
+        )
+
+    @abstractmethod
+    async def health_check(self) -> bool:
+        """Cheap reachability probe used by the readiness endpoint."""
+        pass
+
 
 class StorageProvider(ABC):
     """Contract for any file storage service (Local disk, AWS S3, etc.)."""
@@ -19,3 +46,51 @@ class StorageProvider(ABC):
     @abstractmethod
     async def save_file(self, filename: str, content: bytes) -> str:
         pass
+
+    @abstractmethod
+    async def health_check(self) -> bool:
+        """Cheap reachability probe used by the readiness endpoint."""
+        pass
+
+
+class SearchProvider(ABC):
+    """Contract for full-text search over the book catalog (Postgres, SQLite, ...)."""
+
+    @abstractmethod
+    def search(self, db: Session, query: str, limit: int, offset: int) -> List[dict]:
+        """Returns matching books as dicts with a `rank` key, best match first."""
+        pass
+
+
+class RateLimitBackend(ABC):
+    """Contract for token-bucket storage (in-process memory, shared database, ...)."""
+
+    @abstractmethod
+    def acquire(
+        self, buckets: Mapping[str, Limit], cost: float = 1.0
+    ) -> RateLimitDecision:
+        """Takes `cost` tokens from every bucket, or from none if any is short."""
+        pass
+
+
+class EventBroker(ABC):
+    """Contract for pub/sub of user-facing events (in-process, Postgres LISTEN/NOTIFY, ...)."""
+
+    @abstractmethod
+    async def publish(self, channel: str, event: dict) -> None:
+        """Delivers `event` to every current subscriber of `channel`, on any worker."""
+        pass
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncContextManager["asyncio.Queue[dict]"]:
+        """Yields a queue receiving the channel's events until the context exits."""
+        pass
+
+    async def start(self) -> None:
+        """Opens background connections, if the backend needs any."""
+
+    async def stop(self) -> None:
+        """Closes what `start` opened."""
+
+    async def health_check(self) -> bool:
+        return True
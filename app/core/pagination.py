@@ -0,0 +1,33 @@
+import base64
+import json
+from typing import Any, Sequence, Tuple
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Packs the sort key of the last row into an opaque, URL-safe cursor."""
+    raw = json.dumps({"s": sort, "v": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    """
+    Unpacks a cursor produced by `encode_cursor`; `types` is the expected
+    type of each sort key value. Cursors come from clients, so raises
+    ValueError if one is malformed or was issued for another sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = tuple(payload["v"])
+    except Exception as e:
+        raise ValueError("Malformed cursor") from e
+
+    if payload.get("s") != sort:
+        raise ValueError("Cursor does not match the requested sort order")
+    # bool is an int subclass, but never a valid key
+    if len(values) != len(types) or not all(
+        isinstance(value, kind) and not isinstance(value, bool)
+        for value, kind in zip(values, types)
+    ):
+        raise ValueError("Malformed cursor")
+    return values
@@ -0,0 +1,67 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+_PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A token bucket: holds up to `capacity` tokens, refilled at `rate` per second."""
+
+    capacity: float
+    rate: float
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0  # Seconds until the request would be allowed
+    limited_by: Optional[str] = None  # Bucket key that rejected the request
+
+
+def parse_limit(spec: str) -> Optional[Limit]:
+    """
+    '30/minute' -> bucket of 30 tokens refilled at 0.5/s (bursts up to 30).
+    An empty spec disables the bucket. Raises ValueError on malformed specs.
+    """
+    if not spec or not spec.strip():
+        return None
+    match = _SPEC.match(spec)
+    if match is None:
+        raise ValueError(f"Invalid rate limit {spec!r}, expected e.g. '30/minute'")
+    count, period = int(match.group(1)), match.group(2)
+    return Limit(capacity=float(count), rate=count / _PERIODS[period])
+
+
+def consume(
+    buckets: Mapping[str, Limit],
+    state: Mapping[str, Tuple[float, float]],
+    now: float,
+    cost: float = 1.0,
+) -> Tuple[RateLimitDecision, Dict[str, float]]:
+    """
+    Token-bucket step shared by every backend. `state` maps bucket key to
+    (tokens, updated_at); missing keys start full. Tokens are taken from all
+    buckets or from none, and the refilled levels are returned for storing.
+    """
+    levels: Dict[str, float] = {}
+    for key, limit in buckets.items():
+        tokens, updated_at = state.get(key, (limit.capacity, now))
+        elapsed = max(0.0, now - updated_at)
+        levels[key] = min(limit.capacity, tokens + elapsed * limit.rate)
+
+    # The slowest bucket to refill decides Retry-After
+    retry_after, limited_by = 0.0, None
+    for key, limit in buckets.items():
+        missing = cost - levels[key]
+        if missing > 0:
+            wait = math.inf if limit.rate <= 0 else missing / limit.rate
+            if wait > retry_after:
+                retry_after, limited_by = wait, key
+
+    if limited_by is not None:
+        return RateLimitDecision(False, retry_after, limited_by), levels
+    return RateLimitDecision(True), {key: level - cost for key, level in levels.items()}
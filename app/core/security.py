@@ -1,13 +1,39 @@
 # app/core/security.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min == max == default: any hash with a different cost is flagged for rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+HASH_SECONDS = Histogram(
+    "password_hash_seconds", "Time spent inside bcrypt.", labelnames=("op",)
+)
+HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds",
+    "Time a hashing job waited for a free bcrypt worker.",
+    labelnames=("op",),
+)
+HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Hashing jobs refused because the queue was full."
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,6 +46,76 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the bcrypt queue is full; callers should answer 503."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own bounded thread pool, so slow hashes never occupy
+    Starlette's shared threadpool. At most `workers` hashes run at once and
+    `max_queue` more may wait; anything beyond that is rejected immediately.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self._capacity = workers + max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.workers)
+
+    async def _run(self, op: str, fn, *args):
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                HASH_REJECTED.inc()
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+
+        enqueued = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            HASH_WAIT_SECONDS.labels(op).observe(started - enqueued)
+            try:
+                return fn(*args)
+            finally:
+                HASH_SECONDS.labels(op).observe(time.perf_counter() - started)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, job)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", pwd_context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored cost is outdated."""
+        return await self._run(
+            "verify", pwd_context.verify_and_update, password, hashed_password
+        )
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS, max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+Gauge(
+    "password_hash_queue_depth",
+    "Hashing jobs waiting for a bcrypt worker.",
+    callback=lambda: password_hasher.queue_depth,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Generates a JWT token for the user."""
     to_encode = data.copy()
@@ -37,3 +133,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, resolved from a JWT without loading the full User row."""
+
+    id: int
+    email: str
+    is_active: bool
+    token_version: int
+
+
+class PrincipalCache:
+    """Bounded TTL cache of verified access tokens -> Principal."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, token: str) -> Optional[Principal]:
+        return self._cache.get(token)
+
+    def put(self, token: str, principal: Principal, expires_at: Optional[float]) -> None:
+        # Never cache a token beyond its own expiry (`exp` is epoch seconds, UTC)
+        ttl = None
+        if expires_at is not None:
+            ttl = expires_at - time.time()
+        self._cache.set(token, principal, ttl=ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drops every cached token of a user (e.g. after deactivation)."""
+        self._cache.discard_where(lambda principal: principal.id == user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,119 @@
+import asyncio
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+from fastapi import BackgroundTasks
+from starlette.concurrency import run_in_threadpool
+
+from app.core.metrics import Gauge, Histogram
+
+TASK_WAIT_SECONDS = Histogram(
+    "background_task_wait_seconds",
+    "Time between enqueueing a background task and its start.",
+    labelnames=("task",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+TASK_SECONDS = Histogram(
+    "background_task_seconds",
+    "Background task run time.",
+    labelnames=("task",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+
+
+# Ids of the tasks enqueued by the current request. Set by MetricsMiddleware,
+# which abandons them once the response (background tasks included) is done:
+# Starlette skips the remaining tasks when one raises, and runs none when the
+# endpoint fails or the client disconnects before the body is sent.
+current_task_group: ContextVar[Optional[List[int]]] = ContextVar(
+    "current_task_group", default=None
+)
+
+
+class _TaskTracker:
+    """Keeps the enqueue time of every background task that has not started yet."""
+
+    def __init__(self):
+        self._ids = itertools.count()
+        self._pending = {}
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def enqueued(self) -> int:
+        task_id = next(self._ids)
+        with self._lock:
+            self._pending[task_id] = time.monotonic()
+        group = current_task_group.get()
+        if group is not None:
+            group.append(task_id)
+        return task_id
+
+    def started(self, task_id: int) -> float:
+        with self._lock:
+            enqueued_at = self._pending.pop(task_id, time.monotonic())
+            self._running += 1
+        return time.monotonic() - enqueued_at
+
+    def abandon(self, task_ids: List[int]) -> None:
+        """Forgets tasks that have not started; called once they never will."""
+        with self._lock:
+            for task_id in task_ids:
+                self._pending.pop(task_id, None)
+
+    def finished(self) -> None:
+        with self._lock:
+            self._running -= 1
+
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def running(self) -> int:
+        return self._running
+
+    def oldest_age(self) -> float:
+        with self._lock:
+            if not self._pending:
+                return 0.0
+            return time.monotonic() - min(self._pending.values())
+
+
+tracker = _TaskTracker()
+
+Gauge(
+    "background_tasks_queued",
+    "Background tasks waiting to start.",
+    callback=tracker.depth,
+)
+Gauge(
+    "background_tasks_running",
+    "Background tasks currently running.",
+    callback=tracker.running,
+)
+Gauge(
+    "background_task_oldest_queued_seconds",
+    "Age of the oldest background task that has not started yet.",
+    callback=tracker.oldest_age,
+)
+
+
+def enqueue(background_tasks: BackgroundTasks, func: Callable, *args, **kwargs) -> None:
+    """`BackgroundTasks.add_task` with queue depth, wait and run-time metrics."""
+    name = func.__name__
+    task_id = tracker.enqueued()
+
+    async def run():
+        TASK_WAIT_SECONDS.labels(name).observe(tracker.started(task_id))
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(func):
+                await func(*args, **kwargs)
+            else:
+                await run_in_threadpool(func, *args, **kwargs)
+        finally:
+            tracker.finished()
+            TASK_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+    background_tasks.add_task(run)
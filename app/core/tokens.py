@@ -0,0 +1,75 @@
+import re
+from collections import Counter
+from typing import List
+
+# llama3's tokenizer averages about four characters of English per token
+CHARS_PER_TOKEN = 4
+# Only this many budgets' worth of text is scanned, so huge uploads stay cheap
+SCAN_FACTOR = 8
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"[a-z]{4,}")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_STOPWORDS = frozenset(
+    "about also been could from have into just more much only other over said "
+    "some such than that their them then there these they this were what when "
+    "which will with would your".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast stand-in for the model's tokenizer: one token per punctuation mark
+    and per started four characters of a word. Errs slightly high, which is
+    the safe side for a context budget.
+    """
+    return sum(-(-len(piece) // CHARS_PER_TOKEN) for piece in _PIECE.findall(text))
+
+
+def _cut_words(text: str, max_tokens: int) -> str:
+    kept, used = [], 0
+    for word in text.split():
+        used += estimate_tokens(word)
+        if used > max_tokens:
+            break
+        kept.append(word)
+    # A single "word" longer than the budget (a URL, a pasted blob)
+    return " ".join(kept) or text[: max_tokens * CHARS_PER_TOKEN]
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """
+    `text` cut down to at most `max_tokens` (estimated) on sentence
+    boundaries. The opening sentence is kept first; the rest of the budget
+    goes to the sentences with the most frequent content words per token,
+    i.e. the ones closest to what the text is about. Kept sentences stay in
+    their original order.
+    """
+    text = " ".join(text[: max_tokens * CHARS_PER_TOKEN * SCAN_FACTOR].split())
+    if len(text) <= max_tokens or estimate_tokens(text) <= max_tokens:
+        return text
+
+    # 1. Sentences, their cost and their content words
+    sentences = _SENTENCE_END.split(text)
+    costs = [estimate_tokens(sentence) for sentence in sentences]
+    words = [
+        set(_WORD.findall(sentence.lower())) - _STOPWORDS for sentence in sentences
+    ]
+    frequency = Counter(word for sentence_words in words for word in sentence_words)
+
+    # 2. Lead sentence first, then the densest ones while they fit
+    def density(i: int) -> float:
+        return sum(frequency[word] for word in words[i]) / costs[i]
+
+    order = [0] + sorted(range(1, len(sentences)), key=density, reverse=True)
+    kept: List[int] = []
+    used = 0
+    for i in order:
+        if used + costs[i] <= max_tokens:
+            kept.append(i)
+            used += costs[i]
+
+    # 3. Not even one sentence fits: fall back to whole words
+    if not kept:
+        return _cut_words(sentences[0], max_tokens)
+    return " ".join(sentences[i] for i in sorted(kept))
@@ -0,0 +1,40 @@
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Decay:
+    """
+    Exponential time decay with the given half-life. Scores are kept as
+    logarithms relative to the Unix epoch:
+
+        log_score = log(sum(weight_i * exp(rate * t_i)))
+
+    Every score decays by the same factor, so ranking by `log_score` never
+    needs a rescan, and the value never overflows however old the counter is.
+    """
+
+    half_life: float  # Seconds
+
+    @property
+    def rate(self) -> float:
+        return math.log(2) / self.half_life
+
+    def log_weight(self, weight: float, at: float) -> float:
+        """An event of `weight` happening at epoch second `at`."""
+        return math.log(weight) + self.rate * at
+
+    def score(self, log_score: float, now: float) -> float:
+        """The decayed score as of `now` (1.0 = one unit-weight event just now)."""
+        return math.exp(log_score - self.rate * now)
+
+    def floor(self, min_score: float, now: float) -> float:
+        """`log_score` below which a score has decayed under `min_score`."""
+        return math.log(min_score) + self.rate * now
+
+
+def log_add(a: float, b: float) -> float:
+    """log(exp(a) + exp(b)) without overflow."""
+    if a < b:
+        a, b = b, a
+    return a + math.log1p(math.exp(b - a))
@@ -0,0 +1,13 @@
+# app/db/dialects.py
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def insert_for(db: Session):
+    """
+    Returns the dialect-specific `insert()` for the session's database,
+    which (unlike the generic one) supports ON CONFLICT clauses.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
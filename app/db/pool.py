@@ -0,0 +1,149 @@
+# app/db/pool.py
+import logging
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool.")
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT."
+)
+POOL_OVERFLOW_CHECKOUTS = Counter(
+    "db_pool_overflow_checkouts_total",
+    "Checkouts served while the pool was running on overflow connections.",
+)
+POOL_LONG_HELD = Counter(
+    "db_pool_long_held_total",
+    "Connections returned after being held longer than DB_POOL_LONG_HOLD_SECONDS.",
+)
+POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total", "Connections invalidated (e.g. failed pre-ping)."
+)
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection."
+)
+POOL_HOLD_SECONDS = Histogram(
+    "db_pool_hold_seconds",
+    "Time a connection stayed checked out.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long callers wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc()
+            logger.warning(
+                "Connection pool exhausted: %s", pool_status(self)
+            )
+            raise
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+
+class _CheckoutTracker:
+    """Remembers when each pooled connection was checked out."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_out = {}
+
+    def checkout(self, record) -> None:
+        with self._lock:
+            self._checked_out[id(record)] = time.monotonic()
+
+    def checkin(self, record) -> float:
+        with self._lock:
+            started = self._checked_out.pop(id(record), None)
+        return 0.0 if started is None else time.monotonic() - started
+
+    def long_held(self, threshold: float) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for started in self._checked_out.values() if now - started > threshold)
+
+
+_tracker = _CheckoutTracker()
+
+# Scrape-time gauges reading the live pool state
+_pool_ref = {"pool": None}
+
+
+def _pool_value(name: str):
+    def read() -> float:
+        pool = _pool_ref["pool"]
+        if pool is None or not hasattr(pool, name):
+            return 0.0
+        return float(getattr(pool, name)())
+
+    return read
+
+
+Gauge("db_pool_size", "Configured pool size.", callback=_pool_value("size"))
+Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out.",
+    callback=_pool_value("checkedout"),
+)
+Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open (negative while below pool size).",
+    callback=_pool_value("overflow"),
+)
+Gauge(
+    "db_pool_checked_in",
+    "Idle connections sitting in the pool.",
+    callback=_pool_value("checkedin"),
+)
+Gauge(
+    "db_pool_long_held_connections",
+    "Connections checked out longer than DB_POOL_LONG_HOLD_SECONDS right now (likely leaks).",
+    callback=lambda: _tracker.long_held(settings.DB_POOL_LONG_HOLD_SECONDS),
+)
+
+
+def pool_status(pool) -> dict:
+    """Point-in-time snapshot of a pool, safe to log or return from an endpoint."""
+    status = {"long_held": _tracker.long_held(settings.DB_POOL_LONG_HOLD_SECONDS)}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    return status
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attaches pool event listeners that feed the metrics registry."""
+    pool = engine.pool
+    _pool_ref["pool"] = pool
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.inc()
+        _tracker.checkout(connection_record)
+        if hasattr(pool, "overflow") and pool.overflow() > 0:
+            POOL_OVERFLOW_CHECKOUTS.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        held = _tracker.checkin(connection_record)
+        POOL_HOLD_SECONDS.observe(held)
+        if held > settings.DB_POOL_LONG_HOLD_SECONDS:
+            POOL_LONG_HELD.inc()
+            logger.warning("Connection returned after being held for %.1fs", held)
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        POOL_INVALIDATIONS.inc()
@@ -0,0 +1,102 @@
+# app/db/profiler.py
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.query_stats import QueryStats
+
+logger = logging.getLogger(__name__)
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Describes bound parameters by type only, so values never reach the logs."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class ProfiledQueryStats(QueryStats):
+    """QueryStats that also keeps every statement for slow/repeat analysis."""
+
+    __slots__ = ("statements",)
+
+    def __init__(self):
+        super().__init__()
+        self.statements: List[Tuple[str, Any, float]] = []
+
+    def record(self, statement: str, parameters, seconds: float) -> None:
+        super().record(statement, parameters, seconds)
+        self.statements.append((statement, parameters, seconds))
+
+    def slowest(self, n: int) -> List[Tuple[str, Any, float]]:
+        return sorted(self.statements, key=lambda s: s[2], reverse=True)[:n]
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Identical SQL strings executed at least `threshold` times (likely N+1)."""
+        counts = Counter(statement for statement, _, _ in self.statements)
+        return [(sql, n) for sql, n in counts.most_common() if n >= threshold]
+
+    def report(self, label: str, slow_count: int, repeat_threshold: int) -> None:
+        # WARNING so the report shows at the default log level; the profiler
+        # itself is opt-in (SQL_PROFILER_ENABLED)
+        for statement, parameters, seconds in self.slowest(slow_count):
+            logger.warning(
+                "%s slow SQL %.1fms params=%s: %s",
+                label,
+                seconds * 1000,
+                parameter_shape(parameters),
+                " ".join(statement.split()),
+            )
+        for statement, n in self.repeated(repeat_threshold):
+            logger.warning(
+                "%s repeated SQL x%d (possible N+1): %s",
+                label,
+                n,
+                " ".join(statement.split()),
+            )
+
+
+@contextmanager
+def assert_query_budget(
+    engine: Engine, max_queries: int, max_repeats: Optional[int] = None
+):
+    """
+    Test helper: fails if the block runs more than `max_queries` statements on
+    `engine` (or repeats one statement more than `max_repeats` times).
+    Counts across threads, so it works around TestClient calls, and includes
+    background tasks the request runs before returning.
+
+        with assert_query_budget(engine, max_queries=4):
+            client.get("/api/v1/interactions/recommendations/", headers=auth)
+    """
+    stats = ProfiledQueryStats()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        stats.record(statement, parameters, 0.0)
+
+    event.listen(engine, "after_cursor_execute", _record)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "after_cursor_execute", _record)
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries executed, budget is {max_queries}")
+    if max_repeats is not None:
+        for statement, n in stats.repeated(max_repeats + 1):
+            problems.append(f"statement repeated {n}x: {' '.join(statement.split())}")
+    if problems:
+        listing = "\n".join(
+            f"  {i + 1}. {' '.join(sql.split())}"
+            for i, (sql, _, _) in enumerate(stats.statements)
+        )
+        raise AssertionError("; ".join(problems) + "\n" + listing)
@@ -0,0 +1,50 @@
+# app/db/query_stats.py
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import Counter, Histogram
+
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed.")
+DB_QUERY_SECONDS = Histogram("db_query_seconds", "Duration of individual SQL statements.")
+
+
+class QueryStats:
+    """Running totals of the SQL executed on behalf of one request."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def record(self, statement: str, parameters, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+
+
+# Set by the request middleware; sync endpoints run in a threadpool with a
+# copy of the context, so they see (and mutate) the same QueryStats object.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Times every statement on `engine` and attributes it to the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERIES.inc()
+        DB_QUERY_SECONDS.observe(elapsed)
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, parameters, elapsed)
@@ -0,0 +1,89 @@
+# app/db/replicas.py
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+REPLICA_READS = Counter(
+    "db_read_sessions_total",
+    "Read-only sessions by target (a replica, or primary).",
+    labelnames=("target",),
+)
+REPLICA_EJECTIONS = Counter(
+    "db_replica_ejections_total", "Replicas taken out of rotation after a failure."
+)
+
+
+def replica_label(engine: Engine) -> str:
+    """host:port/database, never the credentials."""
+    url = engine.url
+    return f"{url.host or 'local'}:{url.port or ''}/{url.database or ''}"
+
+
+class ReplicaSet:
+    """
+    Round-robin over the healthy read replicas. A replica that fails a
+    connection or a probe is skipped for `eject_seconds`; the health probe
+    puts it back as soon as it answers again.
+    """
+
+    def __init__(self, engines: List[Engine], eject_seconds: float):
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self._ejected_until: Dict[int, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def healthy(self) -> List[Engine]:
+        now = time.monotonic()
+        return [
+            engine
+            for i, engine in enumerate(self.engines)
+            if self._ejected_until.get(i, 0.0) <= now
+        ]
+
+    def candidates(self) -> List[Engine]:
+        """Healthy replicas, rotated so each call starts at the next one."""
+        healthy = self.healthy()
+        if not healthy:
+            return []
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def eject(self, engine: Engine, reason: Exception) -> None:
+        i = self.engines.index(engine)
+        with self._lock:
+            already = self._ejected_until.get(i, 0.0) > time.monotonic()
+            self._ejected_until[i] = time.monotonic() + self.eject_seconds
+        if not already:
+            REPLICA_EJECTIONS.inc()
+            logger.warning(
+                "Replica %s ejected for %.0fs: %s",
+                replica_label(engine),
+                self.eject_seconds,
+                reason,
+            )
+
+    def probe(self) -> bool:
+        """Pings every replica; ejects failures, readmits recoveries. False if none is up."""
+        for i, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception as e:
+                self.eject(engine, e)
+            else:
+                with self._lock:
+                    self._ejected_until.pop(i, None)
+        return not self.engines or bool(self.healthy())
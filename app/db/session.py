@@ -1,11 +1,35 @@
 # app/db/session.py
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import Gauge
+from app.db.pool import InstrumentedQueuePool, instrument_engine
+from app.db.query_stats import instrument_queries
+from app.db.replicas import REPLICA_READS, ReplicaSet, replica_label
+
+
+def _engine_options(url: str) -> dict:
+    # SQLite (local benchmarks/tests) keeps the library defaults
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 # 1. Create the engine (The connection to Postgres)
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+instrument_engine(engine)
+instrument_queries(engine)
 
 # 2. Create the SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -18,3 +42,69 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 4. Scoped sessions for background tasks and scripts.
+# Unlike `next(get_db())`, this always returns the connection to the pool.
+@contextmanager
+def session_scope():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# 5. Optional read replicas (DATABASE_REPLICA_URLS). Pool metrics describe the
+# primary only; statements on replicas still count towards per-request stats.
+def _create_replica(url: str):
+    replica = create_engine(url, **_engine_options(url))
+    instrument_queries(replica)
+    return replica
+
+
+replicas = ReplicaSet(
+    [
+        _create_replica(url.strip())
+        for url in settings.DATABASE_REPLICA_URLS.split(",")
+        if url.strip()
+    ],
+    eject_seconds=settings.DB_REPLICA_EJECT_SECONDS,
+)
+Gauge(
+    "db_replicas_healthy",
+    "Read replicas currently in rotation.",
+    callback=lambda: len(replicas.healthy()),
+)
+
+
+@contextmanager
+def read_session_scope(primary: bool = False):
+    """
+    Session for read-only work on the next healthy replica (round-robin).
+    Replicas that refuse a connection are ejected and the next one is tried;
+    with none left, or `primary=True`, it reads from the primary instead.
+    """
+    if not primary:
+        for replica in replicas.candidates():
+            try:
+                connection = replica.connect()
+            except exc.DBAPIError as e:
+                replicas.eject(replica, e)
+                continue
+            REPLICA_READS.labels(replica_label(replica)).inc()
+            db = SessionLocal(bind=connection)
+            try:
+                yield db
+            except exc.OperationalError as e:
+                # Lost the replica mid-request: fail this one, spare the next
+                replicas.eject(replica, e)
+                raise
+            finally:
+                db.close()
+                connection.close()
+            return
+
+    REPLICA_READS.labels("primary").inc()
+    with session_scope() as db:
+        yield db
@@ -0,0 +1,38 @@
+# app/db/versioning.py
+from typing import Dict, Iterable
+
+from sqlalchemy.orm import Session
+
+from app.db.dialects import insert_for
+from app.models.sql_models import CacheVersion
+
+
+def bump_versions(db: Session, *scopes: str) -> None:
+    """
+    Increments the version of each scope in the current transaction.
+    The caller commits, so the bump is atomic with the write it describes.
+    """
+    if not scopes:
+        return
+    insert = insert_for(db)
+    stmt = insert(CacheVersion).values(
+        [{"scope": scope, "version": 1} for scope in sorted(set(scopes))]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CacheVersion.scope],
+        set_={"version": CacheVersion.version + 1},
+    )
+    db.execute(stmt)
+
+
+def get_versions(db: Session, scopes: Iterable[str]) -> Dict[str, int]:
+    """Current version of each scope (0 if it was never bumped). One indexed query."""
+    scopes = list(scopes)
+    rows = (
+        db.query(CacheVersion.scope, CacheVersion.version)
+        .filter(CacheVersion.scope.in_(scopes))
+        .all()
+    )
+    versions = {scope: 0 for scope in scopes}
+    versions.update({scope: version for scope, version in rows})
+    return versions
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 # 1. Shared properties
@@ -45,11 +45,29 @@ class BookResponse(BookBase):
     id: int
     file_path: str
     summary: Optional[str] = None
+    summary_status: Optional[str] = None  # pending, running, done or failed
 
     class Config:
         from_attributes = True
 
 
+class BookSearchResult(BookResponse):
+    rank: float
+
+
+class BulkIngestResponse(BaseModel):
+    count: int
+    seconds: float
+    books_per_second: float
+    books: list[BookResponse]
+
+
+# Catalog listing options (GET /books/)
+BookSort = Literal["id", "title"]
+# "compact" leaves the (large) summary column out of the query and the payload
+BookFields = Literal["full", "compact"]
+
+
 # Borrow Schemas
 class BorrowCreate(BaseModel):
     book_id: int
@@ -73,6 +91,22 @@ class ReviewCreate(BaseModel):
     comment: str
 
 
+# Batch endpoints (kiosks, offline sync): one result per item, in request order
+BATCH_MAX_ITEMS = 100
+
+
+class BorrowBatchRequest(BaseModel):
+    items: list[BorrowCreate] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class ReturnBatchRequest(BaseModel):
+    borrow_ids: list[int] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class ReviewBatchRequest(BaseModel):
+    items: list[ReviewCreate] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
 class ReviewResponse(BaseModel):
     id: int
     user_id: int
@@ -80,12 +114,27 @@ class ReviewResponse(BaseModel):
     rating: int
     comment: str
     sentiment: Optional[str] = "Pending"
+    sentiment_status: Optional[str] = None  # pending, running, done or failed
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class BatchItemResult(BaseModel):
+    index: int  # Position of the item in the request
+    status: int  # HTTP status the single-item endpoint would have returned
+    detail: Optional[str] = None  # Error message when status is not 200
+
+
+class BorrowBatchResult(BatchItemResult):
+    borrow: Optional[BorrowResponse] = None
+
+
+class ReviewBatchResult(BatchItemResult):
+    review: Optional[ReviewResponse] = None
+
+
 class RecommendationResponse(BaseModel):
     id: int
     title: str
@@ -93,3 +142,12 @@ class RecommendationResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class SimilarBookResponse(RecommendationResponse):
+    score: float  # Cosine similarity of the two books' reader sets
+    co_readers: int  # Users who borrowed both books
+
+
+class TrendingBookResponse(RecommendationResponse):
+    score: float  # Decayed interactions (1.0 = one borrow just now)
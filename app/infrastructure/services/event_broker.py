@@ -0,0 +1,157 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.interfaces import EventBroker
+from app.core.metrics import Counter, Gauge
+
+NOTIFY_CHANNEL = "lumina_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7900
+SMALL_FIELDS = ("type", "book_id", "review_id", "status")
+
+EVENTS_PUBLISHED = Counter(
+    "events_published_total", "Events published to clients.", labelnames=("type",)
+)
+EVENTS_DROPPED = Counter(
+    "events_dropped_total", "Events dropped because a subscriber queue was full."
+)
+EVENT_SUBSCRIBERS = Gauge("event_subscribers", "Open event subscriptions in this worker.")
+
+
+class InMemoryEventBroker(EventBroker):
+    """
+    Fan-out to subscribers of this process. Enough for a single worker; use
+    the Postgres broker when the publisher and the SSE connection may be
+    served by different workers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def _fan_out(self, channel: str, event: dict) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            if queue.full():
+                # A stalled client loses its oldest event, never blocks publishers
+                queue.get_nowait()
+                EVENTS_DROPPED.inc()
+            queue.put_nowait(event)
+
+    async def publish(self, channel: str, event: dict) -> None:
+        EVENTS_PUBLISHED.labels(event.get("type", "unknown")).inc()
+        self._fan_out(channel, event)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator["asyncio.Queue[dict]"]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(channel, set()).add(queue)
+        EVENT_SUBSCRIBERS.inc()
+        try:
+            yield queue
+        finally:
+            EVENT_SUBSCRIBERS.dec()
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+
+class PostgresEventBroker(InMemoryEventBroker):
+    """
+    Cross-worker delivery through Postgres LISTEN/NOTIFY. `publish` sends a
+    NOTIFY; every worker (including this one) holds one LISTEN connection
+    and fans the event out to its local subscribers.
+    """
+
+    def __init__(
+        self, engine: Engine, queue_size: int = 100, reconnect_delay: float = 2.0
+    ):
+        super().__init__(queue_size=queue_size)
+        self.engine = engine
+        self.reconnect_delay = reconnect_delay
+        self._listener: Optional[asyncio.Task] = None
+        self._connected = False
+
+    def _notify(self, payload: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": payload},
+            )
+
+    async def publish(self, channel: str, event: dict) -> None:
+        payload = json.dumps({"channel": channel, "event": event}, default=str)
+        if len(payload.encode()) > MAX_NOTIFY_BYTES:
+            # Large fields (e.g. a summary) are dropped; clients fetch the item
+            event = {k: v for k, v in event.items() if k in SMALL_FIELDS}
+            payload = json.dumps({"channel": channel, "event": event})
+        EVENTS_PUBLISHED.labels(event.get("type", "unknown")).inc()
+        await run_in_threadpool(self._notify, payload)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            self._fan_out(message["channel"], message["event"])
+        except (ValueError, KeyError) as e:
+            print(f"Ignoring malformed event notification: {e}")
+
+    def _connect(self):
+        # A dedicated connection, detached from the pool: it stays in LISTEN
+        pooled = self.engine.raw_connection()
+        pooled.detach()
+        connection = pooled.driver_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return connection
+
+    async def _listen(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            connection = None
+            try:
+                connection = await run_in_threadpool(self._connect)
+                self._connected = True
+                readable = asyncio.Event()
+                loop.add_reader(connection.fileno(), readable.set)
+                try:
+                    while True:
+                        await readable.wait()
+                        readable.clear()
+                        connection.poll()
+                        while connection.notifies:
+                            self._dispatch(connection.notifies.pop(0).payload)
+                finally:
+                    loop.remove_reader(connection.fileno())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Event listener disconnected, retrying: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                self._connected = False
+                if connection is not None:
+                    connection.close()
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def health_check(self) -> bool:
+        return self._connected
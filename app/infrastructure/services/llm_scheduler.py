@@ -0,0 +1,162 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.interfaces import LLMProvider
+from app.core.metrics import Gauge, Histogram
+
+INTERACTIVE = "interactive"  # A user is waiting (new review, single upload)
+BULK = "bulk"  # Imports, backfills
+
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "llm_queue_wait_seconds",
+    "Time LLM calls waited for a slot, per priority class.",
+    labelnames=("priority",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+LLM_QUEUED = Gauge(
+    "llm_queued_calls", "LLM calls waiting for a slot.", labelnames=("priority",)
+)
+LLM_IN_FLIGHT = Gauge(
+    "llm_in_flight_calls", "LLM calls holding a slot.", labelnames=("priority",)
+)
+
+# Set around bulk work (`with llm_priority(BULK): ...`); tasks started inside
+# inherit it, so the call sites and the providers need no extra argument.
+current_llm_priority: ContextVar[str] = ContextVar(
+    "current_llm_priority", default=INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    token = current_llm_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_llm_priority.reset(token)
+
+
+class PriorityScheduler:
+    """
+    Hands out `slots` concurrent LLM calls between priority classes:
+
+    - Weighted fair sharing: when several classes wait, each gets slots in
+      proportion to its weight (stride scheduling on a per-class virtual time).
+    - Reserved slots: `reserved_slots` are only ever given to interactive
+      calls, so a user never waits behind a full house of bulk work.
+    - Aging: a call that has waited `aging_seconds` goes next whatever its
+      class, so bulk work is slowed down but never starved.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        weights: Dict[str, float],
+        aging_seconds: float,
+        reserved_slots: int = 0,
+    ):
+        self.slots = slots
+        self.weights = weights
+        self.aging_seconds = aging_seconds
+        self.reserved_slots = min(reserved_slots, slots - 1)
+        self._queues: Dict[str, Deque[Tuple[float, asyncio.Future]]] = {
+            priority: deque() for priority in weights
+        }
+        self._running = {priority: 0 for priority in weights}
+        self._vtime = {priority: 0.0 for priority in weights}
+
+    def _has_room(self, priority: str) -> bool:
+        busy = sum(self._running.values())
+        if priority != INTERACTIVE:
+            return busy < self.slots - self.reserved_slots
+        return busy < self.slots
+
+    def _next(self) -> Optional[str]:
+        ready = [p for p, queue in self._queues.items() if queue and self._has_room(p)]
+        if not ready:
+            return None
+        # Aging first (oldest waiter wins), then the class furthest behind its share
+        now = time.monotonic()
+        aged = [p for p in ready if now - self._queues[p][0][0] >= self.aging_seconds]
+        if aged:
+            return min(aged, key=lambda p: self._queues[p][0][0])
+        return min(ready, key=lambda p: self._vtime[p])
+
+    def _dispatch(self) -> None:
+        while (priority := self._next()) is not None:
+            enqueued, waiter = self._queues[priority].popleft()
+            LLM_QUEUED.labels(priority).dec()
+            self._vtime[priority] += 1.0 / self.weights[priority]
+            self._running[priority] += 1
+            LLM_IN_FLIGHT.labels(priority).inc()
+            LLM_QUEUE_WAIT_SECONDS.labels(priority).observe(time.monotonic() - enqueued)
+            waiter.set_result(None)
+
+    def _release(self, priority: str) -> None:
+        self._running[priority] -= 1
+        LLM_IN_FLIGHT.labels(priority).dec()
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        if priority not in self._queues:
+            raise ValueError(f"Unknown LLM priority: {priority}")
+
+        # A class coming back from idle gets no credit for the time it was idle
+        if not self._queues[priority] and not self._running[priority]:
+            active = [
+                self._vtime[p]
+                for p in self._queues
+                if self._queues[p] or self._running[p]
+            ]
+            if active:
+                self._vtime[priority] = max(self._vtime[priority], min(active))
+
+        entry = (time.monotonic(), asyncio.get_running_loop().create_future())
+        self._queues[priority].append(entry)
+        LLM_QUEUED.labels(priority).inc()
+        self._dispatch()
+        try:
+            await entry[1]
+        except asyncio.CancelledError:
+            if entry[1].cancelled():  # Still queued
+                self._queues[priority].remove(entry)
+                LLM_QUEUED.labels(priority).dec()
+            else:  # Granted just as the caller was cancelled
+                self._release(priority)
+            raise
+
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+
+class ScheduledLLM(LLMProvider):
+    """
+    Wraps a provider so every call first takes a scheduler slot for the
+    caller's priority (`current_llm_priority`). Health checks skip the queue.
+    """
+
+    def __init__(self, provider: LLMProvider, scheduler: PriorityScheduler):
+        self.provider = provider
+        self.scheduler = scheduler
+
+    async def generate_summary(self, text: str) -> str:
+        async with self.scheduler.slot(current_llm_priority.get()):
+            return await self.provider.generate_summary(text)
+
+    async def analyze_sentiment(self, review_text: str) -> str:
+        async with self.scheduler.slot(current_llm_priority.get()):
+            return await self.provider.analyze_sentiment(review_text)
+
+    async def analyze_sentiment_batch(self, review_texts: List[str]) -> List[str]:
+        async with self.scheduler.slot(current_llm_priority.get()):
+            return await self.provider.analyze_sentiment_batch(review_texts)
+
+    async def health_check(self) -> bool:
+        return await self.provider.health_check()
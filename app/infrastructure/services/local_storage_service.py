@@ -19,3 +19,6 @@ class LocalDiskStorage(StorageProvider):
             await f.write(content)
 
         return file_path
+
+    async def health_check(self) -> bool:
+        return os.path.isdir(self.upload_dir) and os.access(self.upload_dir, os.W_OK)
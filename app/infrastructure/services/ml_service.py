@@ -1,7 +1,12 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional
 
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sqlalchemy.orm import Session
+
+from app.infrastructure.services import vector_store
+from app.infrastructure.services.recommendation_index import CatalogIndex
 
 
 class RecommendationEngine:
@@ -10,9 +15,6 @@ class RecommendationEngine:
     and Cosine Similarity.
     """
 
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words="english")
-
     def get_content_based_recommendations(
         self,
         user_liked_summaries: List[str],
@@ -39,8 +41,11 @@ class RecommendationEngine:
         if len(documents) <= 1:
             return []
 
-        # 1. Vectorization: Convert text documents into numerical feature vectors
-        tfidf_matrix = self.vectorizer.fit_transform(documents)
+        # 1. Vectorization: Convert text documents into numerical feature vectors.
+        # A fresh vectorizer per call: the engine is shared by concurrent
+        # requests, and fitting one shared instance races between them.
+        vectorizer = TfidfVectorizer(stop_words="english")
+        tfidf_matrix = vectorizer.fit_transform(documents)
 
         # 2. Similarity Calculation: Measure the angle between vectors
         # (Score 1.0 means identical content, 0.0 means completely different)
@@ -55,3 +60,109 @@ class RecommendationEngine:
         scored_books.sort(key=lambda x: x["ml_score"], reverse=True)
 
         return scored_books
+
+    def build_profile(
+        self, index: CatalogIndex, user_liked_summaries: List[str]
+    ) -> sparse.csr_matrix:
+        """Projects the user's text into the index's vocabulary and IDF weights."""
+        return index.transform([" ".join(user_liked_summaries)])
+
+    @staticmethod
+    def profile_fingerprint(
+        version: str, book_ids: Iterable[int], tags: Iterable[str]
+    ) -> str:
+        return vector_store.profile_fingerprint(version, book_ids, tags)
+
+    @staticmethod
+    def load_profile(
+        db: Session, user_id: int, index: CatalogIndex, fingerprint: str
+    ) -> Optional[sparse.csr_matrix]:
+        """The user's stored profile vector if it matches `fingerprint`."""
+        return vector_store.load_user_vector(
+            db, user_id, index.version, fingerprint, index.matrix.shape[1]
+        )
+
+    @staticmethod
+    def save_profile(
+        db: Session,
+        user_id: int,
+        version: str,
+        fingerprint: str,
+        profile: sparse.csr_matrix,
+    ) -> None:
+        vector_store.save_user_vector(db, user_id, version, fingerprint, profile)
+
+    def get_indexed_recommendations(
+        self,
+        index: CatalogIndex,
+        user_liked_summaries: List[str],
+        exclude_ids: Iterable[int],
+        new_books: Optional[List[dict]] = None,  # summarized after the index was built
+        limit: int = 5,
+        profile: Optional[sparse.csr_matrix] = None,  # stored profile vector
+    ) -> List[dict]:
+        """
+        Scores the user profile against a prebuilt catalog index instead of
+        refitting TF-IDF over every book on each request.
+        """
+        if profile is None:
+            if not user_liked_summaries:
+                return []
+            # 1. Project the profile into the index's vocabulary and IDF weights
+            profile = self.build_profile(index, user_liked_summaries)
+
+        exclude_ids = set(exclude_ids)
+
+        # 2. Books summarized since the index was built are scored on the fly.
+        # Their fresh text wins over an older indexed vector of the same book.
+        fresh = [
+            book
+            for book in new_books or []
+            if book["id"] not in exclude_ids
+            and book["summary"]
+            and book["summary"] != "Pending..."
+        ]
+
+        # 3. Rank the indexed catalog (one sparse mat-vec over the shared matrix)
+        scored = index.score(
+            profile, exclude_ids | {book["id"] for book in fresh}, limit
+        )
+
+        if fresh:
+            vectors = index.transform([book["summary"] for book in fresh])
+            fresh_scores = (vectors @ profile.T).toarray().ravel()
+            scored.extend(
+                (book["id"], float(score)) for book, score in zip(fresh, fresh_scores)
+            )
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return [
+            {"book_id": book_id, "ml_score": score} for book_id, score in scored[:limit]
+        ]
+
+    @staticmethod
+    def blend_scores(
+        content: List[dict],
+        collaborative: Dict[int, float],
+        weight: float,
+        limit: int = 5,
+    ) -> List[dict]:
+        """
+        Mixes content similarity with the co-borrow ("readers also borrowed")
+        signal. Each side is scaled by its best score first, so `weight` is
+        the collaborative share regardless of the two signals' units.
+        """
+        if not collaborative or weight <= 0:
+            return content[:limit]
+
+        best_content = max((r["ml_score"] for r in content), default=0.0) or 1.0
+        best_collaborative = max(collaborative.values()) or 1.0
+
+        blended = {
+            r["book_id"]: (1 - weight) * r["ml_score"] / best_content for r in content
+        }
+        for book_id, score in collaborative.items():
+            blended[book_id] = blended.get(book_id, 0.0) + weight * score / best_collaborative
+
+        ranked = sorted(blended.items(), key=lambda item: item[1], reverse=True)
+        return [{"book_id": book_id, "ml_score": score} for book_id, score in ranked[:limit]]
@@ -0,0 +1,56 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def build_neighbours(
+    borrows: Iterable[Tuple[int, int]], top_m: int
+) -> Tuple[Dict[int, int], List[dict]]:
+    """
+    Item-to-item cosine similarity from (user_id, book_id) pairs.
+
+    Builds the binary user x book matrix X, takes the co-borrow counts
+    C = X^T X, normalizes by sqrt(readers_a * readers_b) and keeps the top
+    `top_m` neighbours per book. Returns (readers per book, neighbour rows).
+    """
+    pairs = np.array(list(borrows), dtype=np.int64).reshape(-1, 2)
+    if not len(pairs):
+        return {}, []
+
+    # 1. Binary user x book matrix (duplicate borrows collapse to one reader)
+    user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    book_ids, book_index = np.unique(pairs[:, 1], return_inverse=True)
+    borrowed = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (user_index, book_index)),
+        shape=(len(user_ids), len(book_ids)),
+    )
+    borrowed.data[:] = 1.0
+
+    # 2. Co-borrow counts between every pair of books (sparse, no self pairs)
+    co = (borrowed.T @ borrowed).tocsr()
+    co.setdiag(0)
+    co.eliminate_zeros()
+
+    # 3. Cosine normalization, applied to the non-zeros only
+    readers = np.asarray(borrowed.sum(axis=0)).ravel()
+    inverse_norm = 1.0 / np.sqrt(readers)
+    row_of = np.repeat(np.arange(co.shape[0]), np.diff(co.indptr))
+    scores = co.data * inverse_norm[row_of] * inverse_norm[co.indices]
+
+    # 4. Top-M per book
+    rows = []
+    for i in range(co.shape[0]):
+        start, end = co.indptr[i], co.indptr[i + 1]
+        for j in start + np.argsort(-scores[start:end], kind="stable")[:top_m]:
+            rows.append(
+                {
+                    "book_id": int(book_ids[i]),
+                    "neighbour_id": int(book_ids[co.indices[j]]),
+                    "co_readers": int(co.data[j]),
+                    "score": float(scores[j]),
+                }
+            )
+
+    reader_counts = {int(b): int(n) for b, n in zip(book_ids, readers)}
+    return reader_counts, rows
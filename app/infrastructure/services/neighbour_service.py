@@ -0,0 +1,187 @@
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.dialects import insert_for
+from app.models.sql_models import Book, BookNeighbour, BookReaderCount, Borrow
+
+
+def record_borrows(
+    db: Session, user_id: int, borrows: Sequence[Tuple[int, int]], max_history: int
+) -> None:
+    """
+    Folds a user's new (borrow_id, book_id) borrows, one request's worth, into
+    the co-borrow tables as a set: +1 reader per book read for the first time
+    and +1 co-reader per unordered pair of the user's books, each pair counted
+    once, by the later of its two first borrows (lower borrow id = earlier).
+    That keeps the counts equal to `build_neighbours` however background tasks
+    interleave. Only scores that involve the new books change, so only their
+    pairs are rescored; lists can grow past the top-M cut until the next full
+    rebuild trims them.
+    """
+    borrow_ids = dict((book_id, borrow_id) for borrow_id, book_id in borrows)
+    if not borrow_ids:
+        return
+
+    # 1. Re-borrowing a book the user already read adds no new signal
+    first_borrow = dict(
+        db.execute(
+            select(Borrow.book_id, func.min(Borrow.id))
+            .where(Borrow.user_id == user_id, Borrow.book_id.in_(list(borrow_ids)))
+            .group_by(Borrow.book_id)
+        ).all()
+    )
+    new = {
+        book_id: borrow_id
+        for book_id, borrow_id in borrow_ids.items()
+        if first_borrow.get(book_id) == borrow_id
+    }
+    if not new:
+        return
+
+    insert = insert_for(db)
+    db.execute(
+        insert(BookReaderCount)
+        .values([{"book_id": book_id, "readers": 1} for book_id in sorted(new)])
+        .on_conflict_do_update(
+            index_elements=[BookReaderCount.book_id],
+            set_={"readers": BookReaderCount.readers + 1},
+        )
+    )
+
+    # 2. Pairs: within the set once each, then with the user's most recent
+    # other books (re-borrows in this set included) first borrowed before
+    # the new book
+    history = db.execute(
+        select(Borrow.book_id, func.min(Borrow.id))
+        .where(
+            Borrow.user_id == user_id,
+            Borrow.book_id.notin_(list(new)),
+            Borrow.id < max(new.values()),
+        )
+        .group_by(Borrow.book_id)
+        .order_by(func.max(Borrow.id).desc())
+        .limit(max_history)
+    ).all()
+    ordered = sorted(new)
+    pairs = [(a, b) for i, a in enumerate(ordered) for b in ordered[i + 1 :]]
+    pairs += [
+        (book_id, other)
+        for book_id, borrow_id in new.items()
+        for other, other_first in history
+        if other_first < borrow_id
+    ]
+    if pairs:
+        db.execute(
+            insert(BookNeighbour)
+            .values(
+                [
+                    {"book_id": a, "neighbour_id": b, "co_readers": 1, "score": 0.0}
+                    for pair in pairs
+                    for a, b in (pair, pair[::-1])
+                ]
+            )
+            .on_conflict_do_update(
+                index_elements=[BookNeighbour.book_id, BookNeighbour.neighbour_id],
+                set_={"co_readers": BookNeighbour.co_readers + 1},
+            )
+        )
+
+    # 3. Rescore every pair involving a new book (its reader count changed):
+    # cosine over reader sets = co_readers / sqrt(readers_a * readers_b)
+    rows = db.execute(
+        select(BookNeighbour.book_id, BookNeighbour.neighbour_id, BookNeighbour.co_readers)
+        .where(
+            or_(
+                BookNeighbour.book_id.in_(ordered),
+                BookNeighbour.neighbour_id.in_(ordered),
+            )
+        )
+    ).all()
+    if rows:
+        involved = {a for a, _, _ in rows} | {b for _, b, _ in rows}
+        readers = dict(
+            db.execute(
+                select(BookReaderCount.book_id, BookReaderCount.readers).where(
+                    BookReaderCount.book_id.in_(involved)
+                )
+            ).all()
+        )
+        db.execute(
+            update(BookNeighbour),
+            [
+                {
+                    "book_id": a,
+                    "neighbour_id": b,
+                    "score": co / math.sqrt(max(1, readers.get(a, 1)) * max(1, readers.get(b, 1))),
+                }
+                for a, b, co in rows
+            ],
+        )
+    db.commit()
+
+
+def similar_books(db: Session, book_id: int, limit: int) -> list:
+    """Top neighbours of one book with their catalog columns. One indexed query."""
+    return (
+        db.query(
+            Book.id,
+            Book.title,
+            Book.author,
+            BookNeighbour.score,
+            BookNeighbour.co_readers,
+        )
+        .join(BookNeighbour, BookNeighbour.neighbour_id == Book.id)
+        .filter(BookNeighbour.book_id == book_id)
+        .order_by(BookNeighbour.score.desc(), Book.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def neighbour_scores(
+    db: Session, book_ids: Sequence[int], exclude_ids: Iterable[int], per_book: int
+) -> Dict[int, float]:
+    """
+    Collaborative score per candidate: the summed similarity to the given
+    books, reading at most `per_book` neighbours of each (O(k) per book).
+    """
+    if not book_ids:
+        return {}
+    ranked = (
+        select(
+            BookNeighbour.neighbour_id,
+            BookNeighbour.score,
+            func.row_number()
+            .over(partition_by=BookNeighbour.book_id, order_by=BookNeighbour.score.desc())
+            .label("rank"),
+        )
+        .where(BookNeighbour.book_id.in_(book_ids))
+        .subquery()
+    )
+    exclude = set(exclude_ids)
+    scores: Dict[int, float] = {}
+    for neighbour_id, score in db.execute(
+        select(ranked.c.neighbour_id, ranked.c.score).where(ranked.c.rank <= per_book)
+    ):
+        if neighbour_id not in exclude:
+            scores[neighbour_id] = scores.get(neighbour_id, 0.0) + score
+    return scores
+
+
+def replace_neighbours(
+    db: Session, readers: Dict[int, int], rows: List[dict], chunk_size: int = 5000
+) -> None:
+    """Swaps in a full rebuild in one transaction (readers see old or new, never half)."""
+    db.execute(delete(BookNeighbour))
+    db.execute(delete(BookReaderCount))
+    reader_rows = [{"book_id": b, "readers": n} for b, n in readers.items()]
+    for start in range(0, len(reader_rows), chunk_size):
+        db.execute(
+            insert_for(db)(BookReaderCount), reader_rows[start : start + chunk_size]
+        )
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert_for(db)(BookNeighbour), rows[start : start + chunk_size])
+    db.commit()
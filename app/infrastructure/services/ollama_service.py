@@ -1,64 +1,217 @@
-import os
+import re
+import time
+from typing import Iterator, List
+
 import httpx
-from dotenv import load_dotenv
-from app.core.interfaces import LLMProvider
+from app.core.config import settings
+from app.core.interfaces import LLMError, LLMProvider
+from app.core.metrics import Counter, Histogram
+from app.core.tokens import estimate_tokens, fit_to_budget
+
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_seconds",
+    "Latency of LLM calls per task.",
+    labelnames=("task",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+LLM_ERRORS = Counter("llm_errors_total", "Failed LLM calls per task.", labelnames=("task",))
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens processed by the model, as reported by Ollama.",
+    labelnames=("task", "direction"),
+)
+LLM_SECONDS_PER_TOKEN = Histogram(
+    "llm_seconds_per_output_token",
+    "Generation time per output token.",
+    labelnames=("task",),
+    buckets=(0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0),
+)
+LLM_TRIMMED = Counter(
+    "llm_inputs_trimmed_total",
+    "Inputs cut down to fit their token budget.",
+    labelnames=("task",),
+)
+
+# Reviews classified per prompt by analyze_sentiment_batch (at most)
+SENTIMENT_BATCH_SIZE = 20
+# Output budget for one sentiment label, or one "<number>: <label>" line
+LABEL_TOKENS = 8
+# Slack for estimate error and the model's own prompt template
+PROMPT_MARGIN_TOKENS = 32
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[:.)-]\s*(.+)$")
+
+SUMMARY_PROMPT = """You are an expert library assistant system.
+Your task is to provide a concise, engaging summary of the provided book text.
+
+STRICT CONSTRAINTS:
+1. You MUST respond in English.
+2. The summary must be exactly 3 sentences long.
+3. Do not include any conversational filler (e.g., "Here is the summary:").
+
+Book Text:
+{text}
+"""
+
+SENTIMENT_PROMPT = """You are an automated sentiment analysis pipeline.
+Classify the sentiment of the following book review.
+
+STRICT CONSTRAINTS:
+- Reply with ONLY ONE WORD from this list: [Positive, Negative, Neutral].
+- Do not add punctuation.
+- Do not explain your reasoning.
+
+Review: {text}
+"""
+
+BATCH_SENTIMENT_PROMPT = """You are an automated sentiment analysis pipeline.
+Classify the sentiment of each numbered book review below.
+
+STRICT CONSTRAINTS:
+- Reply with one line per review, in the form "<number>: <label>".
+- <label> is ONE WORD from this list: [Positive, Negative, Neutral].
+- Do not explain your reasoning.
+
+Reviews:
+{text}
+"""
+
+
+def _normalize_sentiment(answer: str) -> str:
+    if "positive" in answer.lower():
+        return "Positive"
+    if "negative" in answer.lower():
+        return "Negative"
+    return "Neutral"
+
+
+def _input_budget(prompt: str, num_predict: int) -> int:
+    """Tokens left for the input once the prompt and the answer are counted."""
+    return (
+        settings.LLM_NUM_CTX
+        - num_predict
+        - estimate_tokens(prompt.format(text=""))
+        - PROMPT_MARGIN_TOKENS
+    )
+
+
+def _fit(task: str, text: str, max_tokens: int) -> str:
+    fitted = fit_to_budget(text, max_tokens)
+    if len(fitted) < len(" ".join(text.split())):
+        LLM_TRIMMED.labels(task).inc()
+    return fitted
 
-load_dotenv()
 
 class OllamaService(LLMProvider):
     def __init__(self):
-        self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-
-    # --- TOOL 1: SUMMARIZATION (For Books) ---
-    async def generate_summary(self, text: str) -> str:
-        prompt = f"""You are an expert library assistant system. 
-                 Your task is to provide a concise, engaging summary of the provided book text.
+        # Settings already load .env, so no dotenv pass at import time
+        self.base_url = settings.OLLAMA_BASE_URL
 
-                 STRICT CONSTRAINTS:
-                 1. You MUST respond in English.
-                 2. The summary must be exactly 3 sentences long.
-                 3. Do not include any conversational filler (e.g., "Here is the summary:").
+    async def health_check(self) -> bool:
+        # /api/tags lists local models without loading any of them
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(f"{self.base_url}/api/tags")
+            return response.status_code == 200
 
-                 Book Text:
-                 {text[:2000]}
-                 """
+    async def _generate(self, task: str, prompt: str, num_predict: int) -> str:
+        """One non-streaming completion; records latency and token counts."""
         async with httpx.AsyncClient(timeout=None) as client:
+            start = time.perf_counter()
             try:
                 response = await client.post(
                     f"{self.base_url}/api/generate",
-                    json={"model": "llama3", "prompt": prompt, "stream": False},
+                    json={
+                        "model": "llama3",
+                        "prompt": prompt,
+                        "stream": False,
+                        "options": {
+                            "num_ctx": settings.LLM_NUM_CTX,
+                            "num_predict": num_predict,
+                        },
+                    },
                 )
                 response.raise_for_status()
-                return response.json().get("response", "No response key").strip()
+                body = response.json()
             except Exception as e:
-                return f"Error: {repr(e)}"
+                LLM_ERRORS.labels(task).inc()
+                raise LLMError(f"{task} failed: {e!r}") from e
+            finally:
+                LLM_REQUEST_SECONDS.labels(task).observe(time.perf_counter() - start)
+
+        # Ollama omits prompt_eval_count when the prompt was served from its cache
+        output_tokens = body.get("eval_count", 0)
+        LLM_TOKENS.labels(task, "input").inc(body.get("prompt_eval_count", 0))
+        LLM_TOKENS.labels(task, "output").inc(output_tokens)
+        if output_tokens and body.get("eval_duration"):
+            LLM_SECONDS_PER_TOKEN.labels(task).observe(
+                body["eval_duration"] / 1e9 / output_tokens
+            )
+        return body.get("response", "")
+
+    # --- TOOL 1: SUMMARIZATION (For Books) ---
+    async def generate_summary(self, text: str) -> str:
+        num_predict = settings.LLM_SUMMARY_MAX_TOKENS
+        budget = min(
+            settings.LLM_SUMMARY_INPUT_TOKENS,
+            _input_budget(SUMMARY_PROMPT, num_predict),
+        )
+        prompt = SUMMARY_PROMPT.format(text=_fit("summary", text, budget))
+        summary = (await self._generate("summary", prompt, num_predict)).strip()
+        if not summary:
+            LLM_ERRORS.labels("summary").inc()
+            raise LLMError("summary failed: empty response")
+        return summary
 
     # --- TOOL 2: SENTIMENT ANALYSIS (For Reviews) ---
     async def analyze_sentiment(self, review_text: str) -> str:
-        prompt = f"""You are an automated sentiment analysis pipeline.
-                 Classify the sentiment of the following book review.
+        budget = min(
+            settings.LLM_REVIEW_INPUT_TOKENS,
+            _input_budget(SENTIMENT_PROMPT, LABEL_TOKENS),
+        )
+        prompt = SENTIMENT_PROMPT.format(text=_fit("sentiment", review_text, budget))
+        sentiment = await self._generate("sentiment", prompt, LABEL_TOKENS)
+        return _normalize_sentiment(sentiment.strip())
 
-                 STRICT CONSTRAINTS:
-                 - Reply with ONLY ONE WORD from this list: [Positive, Negative, Neutral].
-                 - Do not add punctuation.
-                 - Do not explain your reasoning.
+    # --- TOOL 3: BATCH SENTIMENT (For review batches) ---
+    async def analyze_sentiment_batch(self, review_texts: List[str]) -> List[str]:
+        results: List[str] = []
+        for chunk in self._chunks(review_texts):
+            results.extend(await self._classify_chunk(chunk))
+        return results
 
-                 Review: {review_text}
-                """
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json={"model": "llama3", "prompt": prompt, "stream": False},
-                )
-                response.raise_for_status()
+    def _chunks(self, review_texts: List[str]) -> Iterator[List[str]]:
+        """Consecutive (trimmed) reviews that fit one prompt's context window."""
+        budget = _input_budget(
+            BATCH_SENTIMENT_PROMPT, SENTIMENT_BATCH_SIZE * LABEL_TOKENS
+        )
+        chunk: List[str] = []
+        used = 0
+        for text in review_texts:
+            text = _fit("sentiment_batch", text, settings.LLM_REVIEW_INPUT_TOKENS)
+            cost = estimate_tokens(text) + 3  # "12. " and the line break
+            if chunk and (len(chunk) == SENTIMENT_BATCH_SIZE or used + cost > budget):
+                yield chunk
+                chunk, used = [], 0
+            chunk.append(text)
+            used += cost
+        if chunk:
+            yield chunk
 
-                sentiment = response.json().get("response", "Unknown").strip()
+    async def _classify_chunk(self, review_texts: List[str]) -> List[str]:
+        numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(review_texts, 1))
+        answer = await self._generate(
+            "sentiment_batch",
+            BATCH_SENTIMENT_PROMPT.format(text=numbered),
+            len(review_texts) * LABEL_TOKENS,
+        )
 
-                if "positive" in sentiment.lower():
-                    return "Positive"
-                if "negative" in sentiment.lower():
-                    return "Negative"
-                return "Neutral"
-            except Exception as e:
-                return f"Error: {repr(e)}"
\ No newline at end of file
+        labels = {}
+        for line in answer.splitlines():
+            match = _NUMBERED_LINE.match(line)
+            if match:
+                labels[int(match.group(1))] = _normalize_sentiment(match.group(2))
+
+        # Reviews the model skipped are classified one by one
+        return [
+            labels[i] if i in labels else await self.analyze_sentiment(text)
+            for i, text in enumerate(review_texts, 1)
+        ]
@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import Dict, Mapping, Tuple
+
+from sqlalchemy import select, update
+
+from app.core.interfaces import RateLimitBackend
+from app.core.rate_limit import Limit, RateLimitDecision, consume
+from app.db.dialects import insert_for
+from app.db.session import session_scope
+from app.models.sql_models import RateLimitBucket
+
+
+class InMemoryRateLimiter(RateLimitBackend):
+    """
+    Buckets held in this process. Cheapest option, but each worker enforces
+    the limits on its own, so a global limit effectively scales with workers.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._limits: Dict[str, Limit] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        # A bucket that has refilled completely is the same as a missing one
+        for key, (tokens, updated_at) in list(self._state.items()):
+            limit = self._limits[key]
+            if tokens + (now - updated_at) * limit.rate >= limit.capacity:
+                del self._state[key]
+                del self._limits[key]
+
+    def acquire(
+        self, buckets: Mapping[str, Limit], cost: float = 1.0
+    ) -> RateLimitDecision:
+        now = time.monotonic()
+        with self._lock:
+            decision, levels = consume(buckets, self._state, now, cost)
+            for key, tokens in levels.items():
+                self._state[key] = (tokens, now)
+                self._limits[key] = buckets[key]
+            if len(self._state) > self.max_keys:
+                self._prune(now)
+        return decision
+
+
+class DatabaseRateLimiter(RateLimitBackend):
+    """
+    Buckets stored in `rate_limit_buckets`, shared by every worker and node.
+    Each call is one short transaction that locks the rows it touches (in key
+    order, so concurrent requests cannot deadlock).
+    """
+
+    def acquire(
+        self, buckets: Mapping[str, Limit], cost: float = 1.0
+    ) -> RateLimitDecision:
+        if not buckets:
+            return RateLimitDecision(True)
+        now = time.time()
+        keys = sorted(buckets)
+
+        with session_scope() as db:
+            # 1. Create missing buckets full, leaving existing ones untouched
+            db.execute(
+                insert_for(db)(RateLimitBucket)
+                .values(
+                    [
+                        {"key": key, "tokens": buckets[key].capacity, "updated_at": now}
+                        for key in keys
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+
+            # 2. Lock and read the current levels
+            rows = db.execute(
+                select(
+                    RateLimitBucket.key, RateLimitBucket.tokens, RateLimitBucket.updated_at
+                )
+                .where(RateLimitBucket.key.in_(keys))
+                .order_by(RateLimitBucket.key)
+                .with_for_update()
+            )
+            state = {key: (tokens, updated_at) for key, tokens, updated_at in rows}
+
+            # 3. Apply the token-bucket step and write the new levels back
+            decision, levels = consume(buckets, state, now, cost)
+            db.execute(
+                update(RateLimitBucket),
+                [
+                    {"key": key, "tokens": tokens, "updated_at": now}
+                    for key, tokens in levels.items()
+                ],
+            )
+            db.commit()
+        return decision
@@ -0,0 +1,205 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+class CatalogIndex:
+    """
+    Read-only TF-IDF matrix of the catalog, loaded with `numpy.memmap`.
+    Rows are L2-normalized, so a dot product with a normalized profile
+    vector is the cosine similarity. Every worker mapping the same version
+    shares the pages through the OS page cache.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        manifest = json.loads((path / "manifest.json").read_text())
+        self.version: str = manifest["version"]
+        # Books summarized at or after this were not vectorized into the index.
+        # None (older manifests): the index cannot tell, every book is a candidate.
+        indexed_at = manifest.get("indexed_at")
+        self.indexed_at: Optional[datetime] = (
+            datetime.fromisoformat(indexed_at) if indexed_at else None
+        )
+
+        def load(name: str) -> np.ndarray:
+            return np.load(path / f"{name}.npy", mmap_mode="r")
+
+        self.book_ids = load("book_ids")
+        self.idf = load("idf")
+        self.matrix = sparse.csr_matrix(
+            (load("data"), load("indices"), load("indptr")),
+            shape=(manifest["rows"], manifest["features"]),
+            copy=False,
+        )
+        vocabulary = json.loads((path / "vocabulary.json").read_text())
+        self._counter = CountVectorizer(stop_words="english", vocabulary=vocabulary)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def transform(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """Vectorizes texts in this index's feature space (tf * idf, L2-normalized)."""
+        counts = self._counter.transform(texts).astype(np.float32)
+        return normalize(counts.multiply(self.idf).tocsr())
+
+    def score(
+        self, profile: sparse.csr_matrix, exclude_ids: Iterable[int], limit: int
+    ) -> List[Tuple[int, float]]:
+        """Top `limit` (book_id, cosine score) pairs for a profile vector."""
+        scores = np.asarray((self.matrix @ profile.T).todense()).ravel()
+        exclude = np.fromiter(exclude_ids, dtype=np.int64)
+        if exclude.size:
+            scores[np.isin(self.book_ids, exclude)] = -1.0
+
+        limit = min(limit, scores.size)
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (int(self.book_ids[i]), float(scores[i])) for i in top if scores[i] >= 0.0
+        ]
+
+
+def build_index_arrays(books: Iterable[Tuple[int, str]]) -> dict:
+    """Fits TF-IDF over (book_id, summary) pairs and returns the arrays to persist."""
+    books = list(books)
+    vectorizer = TfidfVectorizer(stop_words="english", dtype=np.float32)
+    matrix = vectorizer.fit_transform([summary for _, summary in books]).tocsr()
+    matrix.sort_indices()
+    # indices and indptr must share scipy's index dtype, otherwise csr_matrix
+    # copies them on load and the pages are no longer shared between workers
+    limit = np.iinfo(np.int32).max
+    index_dtype = np.int32 if max(matrix.nnz, matrix.shape[1]) < limit else np.int64
+    return {
+        "data": matrix.data.astype(np.float32),
+        "indices": matrix.indices.astype(index_dtype),
+        "indptr": matrix.indptr.astype(index_dtype),
+        "book_ids": np.array([book_id for book_id, _ in books], dtype=np.int64),
+        "idf": vectorizer.idf_.astype(np.float32),
+        "vocabulary": {term: int(i) for term, i in vectorizer.vocabulary_.items()},
+        "shape": matrix.shape,
+    }
+
+
+def new_version() -> str:
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Book timestamps are stored as naive UTC; compare like with like."""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def write_index_version(root: Path, version: str, arrays: dict, keep: int = 3) -> str:
+    """
+    Writes `arrays` (see `build_index_arrays`) as index `version` and
+    atomically points CURRENT at it. `arrays["indexed_at"]` is the time the
+    summaries were read, taken before reading them. Older versions beyond `keep` are removed
+    (workers still mapping them keep working until they swap, since unlinked
+    files stay readable).
+    """
+    versions_dir = root / VERSIONS_DIR
+    versions_dir.mkdir(parents=True, exist_ok=True)
+    staging = versions_dir / f".{version}.{uuid.uuid4().hex[:6]}.tmp"
+    staging.mkdir()
+
+    for name in ("data", "indices", "indptr", "book_ids", "idf"):
+        np.save(staging / f"{name}.npy", arrays[name])
+    (staging / "vocabulary.json").write_text(json.dumps(arrays["vocabulary"]))
+    rows, features = arrays["shape"]
+    manifest = {
+        "version": version,
+        "rows": rows,
+        "features": features,
+        "indexed_at": (
+            _naive_utc(arrays["indexed_at"]).isoformat()
+            if arrays.get("indexed_at")
+            else None
+        ),
+        "created_at": time.time(),
+    }
+    (staging / "manifest.json").write_text(json.dumps(manifest))
+    try:
+        staging.rename(versions_dir / version)
+    except OSError:
+        # Another worker restored the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+
+    pointer = root / f".{CURRENT_FILE}.{uuid.uuid4().hex[:6]}.tmp"
+    pointer.write_text(version)
+    os.replace(pointer, root / CURRENT_FILE)
+
+    published = sorted(p for p in versions_dir.iterdir() if not p.name.startswith("."))
+    for old in published[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+    return version
+
+
+def publish_index(root: Path, books: Iterable[Tuple[int, str]], keep: int = 3) -> str:
+    """Vectorizes (book_id, summary) pairs and publishes them as a new version."""
+    indexed_at = datetime.utcnow()  # Before `books` is consumed
+    arrays = build_index_arrays(books)
+    arrays["indexed_at"] = indexed_at
+    return write_index_version(root, new_version(), arrays, keep)
+
+
+class IndexStore:
+    """
+    Per-worker handle on the published index. Re-reads the CURRENT pointer at
+    most every `check_interval` seconds and swaps to a new version in one
+    reference assignment, so in-flight requests keep the index they started with.
+    """
+
+    def __init__(self, root: Path, check_interval: float):
+        self.root = Path(root)
+        self.check_interval = check_interval
+        self._index: Optional[CatalogIndex] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _published_version(self) -> Optional[str]:
+        try:
+            return (self.root / CURRENT_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def reload(self) -> Optional[CatalogIndex]:
+        """Re-reads CURRENT now instead of waiting for the next check."""
+        self._checked_at = 0.0
+        return self.current()
+
+    def current(self) -> Optional[CatalogIndex]:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._index
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._index
+            self._checked_at = now
+            version = self._published_version()
+            if version is None:
+                self._index = None
+            elif self._index is None or self._index.version != version:
+                try:
+                    self._index = CatalogIndex(self.root / VERSIONS_DIR / version)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Could not load recommendation index {version}: {e}")
+            return self._index
@@ -0,0 +1,115 @@
+import re
+import threading
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.interfaces import SearchProvider
+
+_BOOK_COLUMNS = (
+    "b.id, b.title, b.author, b.isbn, b.file_path, b.summary, b.summary_status"
+)
+
+
+class PostgresFullTextSearch(SearchProvider):
+    """
+    Ranked search over the generated `books.search_vector` tsvector column
+    (title > author > summary weights), served by its GIN index, which only
+    covers books whose summary is done.
+    """
+
+    def search(self, db: Session, query: str, limit: int, offset: int) -> List[dict]:
+        rows = db.execute(
+            text(
+                f"""
+                SELECT {_BOOK_COLUMNS},
+                       ts_rank_cd(b.search_vector, q) AS rank
+                FROM books b, websearch_to_tsquery('english', :q) q
+                WHERE b.search_vector @@ q AND b.summary_status = 'done'
+                ORDER BY rank DESC, b.id
+                LIMIT :limit OFFSET :offset
+                """
+            ),
+            {"q": query, "limit": limit, "offset": offset},
+        )
+        return [dict(row) for row in rows.mappings()]
+
+
+class SQLiteFullTextSearch(SearchProvider):
+    """
+    Local fallback using an FTS5 external-content table kept in sync with
+    `books` by triggers, so tests and benchmarks run without Postgres.
+    """
+
+    _schema_ready = False
+    _lock = threading.Lock()
+
+    _SCHEMA = (
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+            title, author, summary, content='books', content_rowid='id'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts(rowid, title, author, summary)
+            VALUES (new.id, new.title, new.author, new.summary);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, title, author, summary)
+            VALUES ('delete', old.id, old.title, old.author, old.summary);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE ON books BEGIN
+            INSERT INTO books_fts(books_fts, rowid, title, author, summary)
+            VALUES ('delete', old.id, old.title, old.author, old.summary);
+            INSERT INTO books_fts(rowid, title, author, summary)
+            VALUES (new.id, new.title, new.author, new.summary);
+        END
+        """,
+        "INSERT INTO books_fts(books_fts) VALUES ('rebuild')",
+    )
+
+    @classmethod
+    def ensure_schema(cls, db: Session) -> None:
+        """Creates the FTS5 table and triggers once per process."""
+        if cls._schema_ready:
+            return
+        with cls._lock:
+            if cls._schema_ready:
+                return
+            with db.get_bind().engine.begin() as conn:
+                for statement in cls._SCHEMA:
+                    conn.exec_driver_sql(statement)
+            cls._schema_ready = True
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        # Quote every term so user input is never parsed as FTS5 syntax
+        terms = re.findall(r"\w+", query)
+        return " ".join(f'"{term}"' for term in terms)
+
+    def search(self, db: Session, query: str, limit: int, offset: int) -> List[dict]:
+        self.ensure_schema(db)
+        match = self._match_expression(query)
+        if not match:
+            return []
+
+        rows = db.execute(
+            text(
+                f"""
+                SELECT {_BOOK_COLUMNS},
+                       -bm25(books_fts, 10.0, 5.0, 1.0) AS rank
+                FROM books_fts JOIN books b ON b.id = books_fts.rowid
+                WHERE books_fts MATCH :q AND b.summary_status = 'done'
+                ORDER BY rank DESC, b.id
+                LIMIT :limit OFFSET :offset
+                """
+            ),
+            {"q": match, "limit": limit, "offset": offset},
+        )
+        return [dict(row) for row in rows.mappings()]
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import Counter
+from app.core.trending import Decay, log_add
+from app.db.dialects import insert_for
+from app.models.sql_models import BookTrending
+
+TRENDING_EVENTS = Counter(
+    "trending_events_total",
+    "Interactions counted towards trending.",
+    labelnames=("kind",),
+)
+
+# Rows whose decayed score falls below this are deleted on flush
+MIN_SCORE = 0.01
+
+
+class TrendingTracker:
+    """
+    Per-worker trending counters. `record` is O(1) in memory; `flush` merges
+    this worker's pending increments into `book_trending` and `refresh`
+    reloads the shared top list, which `top` serves without a query.
+    """
+
+    def __init__(self, half_life: float, shelf_size: int):
+        self.decay = Decay(half_life)
+        self.shelf_size = shelf_size
+        self._pending: Dict[int, float] = {}  # book_id -> log weight since flush
+        self._lock = threading.Lock()
+        self._snapshot: List[Tuple[int, float]] = []  # (book_id, log_score), best first
+
+    def _add_pending(self, book_id: int, event: float) -> None:
+        current = self._pending.get(book_id)
+        self._pending[book_id] = event if current is None else log_add(current, event)
+
+    def record(self, book_id: int, weight: float, kind: str) -> None:
+        TRENDING_EVENTS.labels(kind).inc()
+        event = self.decay.log_weight(weight, time.time())
+        with self._lock:
+            self._add_pending(book_id, event)
+
+    def flush(self, db: Session) -> int:
+        """Merges pending increments into the shared table; returns books written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        book_ids = sorted(pending)
+        now = time.time()
+
+        try:
+            # 1. Create missing rows, then lock them all in key order (no deadlocks)
+            inserted = set(
+                db.scalars(
+                    insert_for(db)(BookTrending)
+                    .values(
+                        [
+                            {
+                                "book_id": book_id,
+                                "log_score": pending[book_id],
+                                "updated_at": now,
+                            }
+                            for book_id in book_ids
+                        ]
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(BookTrending.book_id)
+                )
+            )
+            rows = db.execute(
+                select(BookTrending.book_id, BookTrending.log_score)
+                .where(BookTrending.book_id.in_(book_ids))
+                .order_by(BookTrending.book_id)
+                .with_for_update()
+            )
+
+            # 2. Add this worker's increments (rows just inserted already hold them)
+            merged = [
+                {
+                    "book_id": book_id,
+                    "log_score": (
+                        log_score
+                        if book_id in inserted
+                        else log_add(log_score, pending[book_id])
+                    ),
+                    "updated_at": now,
+                }
+                for book_id, log_score in rows
+            ]
+            db.execute(update(BookTrending), merged)
+
+            # 3. Forget books that stopped trending
+            db.execute(
+                delete(BookTrending).where(
+                    BookTrending.log_score < self.decay.floor(MIN_SCORE, now)
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Keep the increments for the next attempt
+            with self._lock:
+                for book_id, event in pending.items():
+                    self._add_pending(book_id, event)
+            raise
+        return len(merged)
+
+    def refresh(self, db: Session) -> None:
+        """Reloads the shared top list (includes other workers' flushes)."""
+        rows = db.execute(
+            select(BookTrending.book_id, BookTrending.log_score)
+            .order_by(BookTrending.log_score.desc())
+            .limit(self.shelf_size)
+        ).all()
+        self._snapshot = [(book_id, log_score) for book_id, log_score in rows]
+
+    def top(
+        self, limit: int, exclude_ids: Optional[set] = None
+    ) -> List[Tuple[int, float]]:
+        """Best (book_id, decayed score) pairs from the last refresh."""
+        now = time.time()
+        exclude_ids = exclude_ids or set()
+        return [
+            (book_id, self.decay.score(log_score, now))
+            for book_id, log_score in self._snapshot
+            if book_id not in exclude_ids
+        ][:limit]
@@ -0,0 +1,194 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db.dialects import insert_for
+from app.infrastructure.services.recommendation_index import write_index_version
+from app.models.sql_models import BookVector, UserVector, VectorSpace
+
+# Raw array layout in the bytea columns (explicit little-endian, any host)
+INDEX_DTYPE = np.dtype("<i4")
+WEIGHT_DTYPE = np.dtype("<f4")
+
+
+def pack(indices: np.ndarray, weights: np.ndarray) -> Tuple[bytes, bytes]:
+    return (
+        np.ascontiguousarray(indices, dtype=INDEX_DTYPE).tobytes(),
+        np.ascontiguousarray(weights, dtype=WEIGHT_DTYPE).tobytes(),
+    )
+
+
+def unpack(indices: bytes, weights: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Zero-copy, read-only views over the stored bytes."""
+    return (
+        np.frombuffer(indices, dtype=INDEX_DTYPE),
+        np.frombuffer(weights, dtype=WEIGHT_DTYPE),
+    )
+
+
+def profile_fingerprint(
+    version: str, book_ids: Iterable[int], tags: Iterable[str]
+) -> str:
+    """Identifies the inputs a user profile vector was built from."""
+    material = json.dumps([version, sorted(set(book_ids)), sorted(set(tags))])
+    return hashlib.sha1(material.encode()).hexdigest()
+
+
+# --- Catalog vectors ---
+
+
+def save_catalog_vectors(
+    db: Session, version: str, arrays: dict, chunk_size: int = 5000
+) -> None:
+    """
+    Stores a freshly built index (see `build_index_arrays`) as one row per
+    book and replaces the previous space in the same transaction, so
+    readers never see vectors from two vocabularies.
+    """
+    features = arrays["shape"][1]
+    db.execute(delete(BookVector))
+    db.execute(delete(UserVector))
+    db.execute(delete(VectorSpace))
+    db.add(
+        VectorSpace(
+            version=version,
+            features=features,
+            idf=np.ascontiguousarray(arrays["idf"], dtype=WEIGHT_DTYPE).tobytes(),
+            vocabulary=json.dumps(arrays["vocabulary"]),
+            # When the summaries were read, so a restored index knows which
+            # books it is missing
+            created_at=arrays.get("indexed_at"),
+        )
+    )
+    db.flush()
+
+    indptr, indices, data = arrays["indptr"], arrays["indices"], arrays["data"]
+    rows = []
+    for row, book_id in enumerate(arrays["book_ids"]):
+        start, end = indptr[row], indptr[row + 1]
+        packed_indices, packed_weights = pack(indices[start:end], data[start:end])
+        rows.append(
+            {
+                "book_id": int(book_id),
+                "version": version,
+                "indices": packed_indices,
+                "weights": packed_weights,
+            }
+        )
+        if len(rows) == chunk_size:
+            db.execute(insert_for(db)(BookVector), rows)
+            rows = []
+    if rows:
+        db.execute(insert_for(db)(BookVector), rows)
+    db.commit()
+
+
+def load_catalog_arrays(db: Session) -> Optional[dict]:
+    """
+    Bulk loader: the whole stored catalog in one sequential query, assembled
+    into the arrays `write_index_version` expects. None if nothing is stored.
+    """
+    space = db.scalars(select(VectorSpace).limit(1)).first()
+    if space is None:
+        return None
+
+    book_ids, index_parts, weight_parts = [], [], []
+    result = db.execute(
+        select(BookVector.book_id, BookVector.indices, BookVector.weights)
+        .where(BookVector.version == space.version)
+        .order_by(BookVector.book_id)
+        .execution_options(yield_per=5000)
+    )
+    for book_id, packed_indices, packed_weights in result:
+        indices, weights = unpack(packed_indices, packed_weights)
+        book_ids.append(book_id)
+        index_parts.append(indices)
+        weight_parts.append(weights)
+
+    lengths = np.fromiter((part.size for part in index_parts), dtype=np.int64)
+    indptr = np.zeros(len(book_ids) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    nnz = int(indptr[-1])
+    index_dtype = (
+        np.int32 if max(nnz, space.features) < np.iinfo(np.int32).max else np.int64
+    )
+    return {
+        "data": (
+            np.concatenate(weight_parts) if weight_parts else np.zeros(0, WEIGHT_DTYPE)
+        ),
+        "indices": (
+            np.concatenate(index_parts) if index_parts else np.zeros(0, INDEX_DTYPE)
+        ).astype(index_dtype, copy=False),
+        "indptr": indptr.astype(index_dtype),
+        "book_ids": np.array(book_ids, dtype=np.int64),
+        "idf": np.frombuffer(space.idf, dtype=WEIGHT_DTYPE),
+        "vocabulary": json.loads(space.vocabulary),
+        "shape": (len(book_ids), space.features),
+        "version": space.version,
+        "indexed_at": space.created_at,
+    }
+
+
+def restore_index(root: Path, db: Session, keep: int = 3) -> Optional[str]:
+    """Publishes the stored catalog vectors as the local index (no re-vectorizing)."""
+    arrays = load_catalog_arrays(db)
+    if arrays is None:
+        return None
+    return write_index_version(root, arrays["version"], arrays, keep)
+
+
+# --- User profile vectors ---
+
+
+def load_user_vector(
+    db: Session, user_id: int, version: str, fingerprint: str, features: int
+) -> Optional[sparse.csr_matrix]:
+    """The cached 1 x features profile, or None if missing or stale."""
+    row = db.execute(
+        select(UserVector.indices, UserVector.weights).where(
+            UserVector.user_id == user_id,
+            UserVector.version == version,
+            UserVector.fingerprint == fingerprint,
+        )
+    ).first()
+    if row is None:
+        return None
+    indices, weights = unpack(row.indices, row.weights)
+    return sparse.csr_matrix(
+        (weights, indices, np.array([0, indices.size], dtype=INDEX_DTYPE)),
+        shape=(1, features),
+        copy=False,
+    )
+
+
+def save_user_vector(
+    db: Session,
+    user_id: int,
+    version: str,
+    fingerprint: str,
+    vector: sparse.csr_matrix,
+) -> None:
+    """Upserts a user's profile vector (a 1-row sparse matrix)."""
+    vector = vector.tocsr()
+    packed_indices, packed_weights = pack(vector.indices, vector.data)
+    values = {
+        "version": version,
+        "fingerprint": fingerprint,
+        "indices": packed_indices,
+        "weights": packed_weights,
+    }
+    db.execute(
+        insert_for(db)(UserVector)
+        .values(user_id=user_id, **values)
+        .on_conflict_do_update(
+            index_elements=[UserVector.user_id],
+            set_={**values, "updated_at": func.now()},
+        )
+    )
+    db.commit()
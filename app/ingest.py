@@ -0,0 +1,101 @@
+"""
+Bulk catalog import.
+
+    python -m app.ingest sample_books/ --author "Unknown"
+
+Imports every .txt/.pdf file in a directory, then (unless --no-summarize)
+generates AI summaries at a throttled rate.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import aiofiles
+
+from app.api.dependencies import get_llm_service, get_storage_service
+from app.api.http_cache import mark_changed
+from app.api.v1.endpoints.books import process_ai_summary
+from app.core.config import settings
+from app.db.session import session_scope
+from app.infrastructure.services.ingestion_service import (
+    ALLOWED_SUFFIXES,
+    CatalogIngestor,
+    IngestItem,
+    run_rate_limited,
+    title_from_filename,
+)
+
+
+def _reader(path: Path):
+    async def load() -> bytes:
+        async with aiofiles.open(path, "rb") as f:
+            return await f.read()
+
+    return load
+
+
+def _discover(directory: Path, author: str):
+    for path in sorted(directory.rglob("*")):
+        if path.is_file() and path.suffix.lower() in ALLOWED_SUFFIXES:
+            yield IngestItem(
+                filename=path.name,
+                title=title_from_filename(path.name),
+                author=author,
+                load=_reader(path),
+            )
+
+
+async def main(args: argparse.Namespace) -> int:
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"Not a directory: {directory}", file=sys.stderr)
+        return 1
+
+    ingestor = CatalogIngestor(
+        get_storage_service(), batch_size=args.batch_size, concurrency=args.concurrency
+    )
+    with session_scope() as db:
+        report = await ingestor.ingest(db, _discover(directory, args.author))
+        mark_changed(db, "books")
+        db.commit()
+
+    print(
+        f"Imported {report.count} books in {report.seconds:.2f}s "
+        f"({report.books_per_second:.1f} books/s)"
+    )
+
+    if args.summarize and report.count:
+        llm = get_llm_service()
+        start = time.perf_counter()
+        await run_rate_limited(
+            (
+                lambda book_id=book_id, path=path: process_ai_summary(book_id, path, llm)
+                for book_id, path in report.books
+            ),
+            rate_per_second=args.rate,
+            concurrency=settings.INGEST_SUMMARY_CONCURRENCY,
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"Summarized {report.count} books in {elapsed:.2f}s "
+            f"({report.count / elapsed:.2f} books/s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import book files.")
+    parser.add_argument("directory", help="Directory containing .txt/.pdf files")
+    parser.add_argument("--author", default="Unknown")
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.INGEST_CONCURRENCY)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=settings.INGEST_SUMMARY_RATE,
+        help="Summaries started per second",
+    )
+    parser.add_argument("--no-summarize", dest="summarize", action="store_false")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,16 +1,138 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.api.dependencies import (
+    catalog_index,
+    event_broker,
+    get_llm_service,
+    get_storage_service,
+    recommendation_engine,
+    trending,
+)
+from app.api.middleware import (
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+    SQLProfilerMiddleware,
+)
 from app.api.v1.endpoints import auth, books, interactions  # NEW
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.health import HealthMonitor
+from app.core.metrics import REGISTRY
+from app.db.session import get_db, replicas, session_scope
+
+health_monitor = HealthMonitor(
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    ttl=settings.HEALTH_CHECK_TTL_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+)
+
+
+def _ping_database() -> bool:
+    with session_scope() as db:
+        db.execute(text("SELECT 1"))
+    return True
+
+
+async def _check_database() -> bool:
+    return await run_in_threadpool(_ping_database)
+
+
+health_monitor.register("database", _check_database)
+health_monitor.register("storage", lambda: get_storage_service().health_check())
+health_monitor.register(
+    "llm",
+    lambda: get_llm_service().health_check(),
+    critical=settings.HEALTH_LLM_CRITICAL,
+)
+# Only streams degrade when the LISTEN connection drops; publishing still works
+health_monitor.register("events", event_broker.health_check, critical=False)
+if replicas:
+    # Probing also ejects/readmits replicas; reads fall back to the primary
+    health_monitor.register(
+        "replicas", lambda: run_in_threadpool(replicas.probe), critical=False
+    )
+
+
+def _warm_up_ml() -> None:
+    # Imports scikit-learn/scipy and maps the published index off the event loop
+    recommendation_engine.get()
+    store = catalog_index.get()
+    if store.current() is None:
+        # Fresh node: rebuild the local files from the stored vectors in one
+        # sequential read instead of re-vectorizing every summary
+        from app.infrastructure.services.vector_store import restore_index
+
+        with session_scope() as db:
+            restored = restore_index(
+                store.root, db, keep=settings.RECOMMENDATION_INDEX_KEEP_VERSIONS
+            )
+        if restored:
+            store.reload()
+
+
+async def _warm_up() -> None:
+    try:
+        await run_in_threadpool(_warm_up_ml)
+    except Exception as e:
+        # Not fatal: the first recommendation request retries the import
+        print(f"ML warm-up failed: {e}")
+    health_monitor.set_flag("ml", True)
+
+
+def _sync_trending() -> None:
+    with session_scope() as db:
+        trending.flush(db)
+        trending.refresh(db)
+
+
+async def _trending_loop() -> None:
+    # Publishes this worker's counters and picks up everyone else's
+    while True:
+        try:
+            await run_in_threadpool(_sync_trending)
+        except Exception as e:
+            print(f"Trending flush failed: {e}")
+        await asyncio.sleep(settings.TRENDING_FLUSH_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Not ready until the ML stack is loaded, so the first recommendation
+    # request on a fresh worker does not pay for the imports
+    health_monitor.set_flag("ml", False)
+    warm_up = asyncio.create_task(_warm_up())
+    await event_broker.start()
+    trending_sync = asyncio.create_task(_trending_loop())
+    health_monitor.start()
+    yield
+    warm_up.cancel()
+    trending_sync.cancel()
+    await health_monitor.stop()
+    await event_broker.stop()
+    try:
+        # Last flush so counts since the previous one are not lost
+        await run_in_threadpool(_sync_trending)
+    except Exception as e:
+        print(f"Trending flush failed: {e}")
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
+app.add_middleware(MetricsMiddleware)
+if settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(SQLProfilerMiddleware)
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware)
 
 
 @app.get("/", tags=["Health"])
@@ -33,6 +155,30 @@ def health_check(db: Session = Depends(get_db)):
         )
 
 
+@app.get("/healthz", tags=["Health"])
+async def liveness():
+    """Liveness probe: the process is up and the event loop responds. No I/O."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz", tags=["Health"])
+async def readiness():
+    """
+    Readiness probe answered from the background health monitor's cached
+    results (database, storage, LLM), so probes never touch the pool.
+    """
+    snapshot = health_monitor.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (text exposition format)."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # Routers
 app.include_router(
     auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["Authentication"]
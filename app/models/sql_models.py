@@ -1,19 +1,30 @@
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db.base import Base
 
+# AI processing states (Book.summary_status, Review.sentiment_status).
+# Only "done" rows carry real model output.
+AI_PENDING = "pending"
+AI_RUNNING = "running"
+AI_DONE = "done"
+AI_FAILED = "failed"
+
 
 class User(Base):
     __tablename__ = "users"
@@ -23,6 +34,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    # Bumped to revoke every token issued so far (carried as the "ver" claim)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     borrows = relationship("Borrow", back_populates="user")
@@ -45,10 +58,43 @@ class Book(Base):
     # Intelligence Layer (Assignment Requirement: AI Summaries)
     summary = Column(Text, nullable=True)  # AI generated summary
     sentiment_score = Column(Float, default=0.0)
+    summary_status = Column(
+        String, nullable=False, default=AI_PENDING, server_default=AI_PENDING
+    )
+    summary_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    summary_error = Column(Text, nullable=True)  # Last failure, for operators
+    # When `summary` was last stored; books summarized after the published
+    # recommendation index was built are scored on the fly until the next one
+    summarized_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Search Layer: `search_vector` (tsvector over title/author/summary) is a
+    # Postgres generated column managed by migration 7c2e5d1a9f04; it is not
+    # mapped here so the model stays usable on SQLite.
 
     borrows = relationship("Borrow", back_populates="book")
     reviews = relationship("Review", back_populates="book")
 
+    __table_args__ = (
+        # Keyset pagination over (title, id); paging by id uses the primary key
+        Index("ix_books_title_id", "title", "id"),
+        # Recommender/reindex scans only ever read summarized books
+        Index(
+            "ix_books_summary_done",
+            "id",
+            postgresql_where=summary_status == AI_DONE,
+            sqlite_where=summary_status == AI_DONE,
+        ),
+        # Recommendation candidates missing from the published index
+        Index("ix_books_summarized_at", "summarized_at"),
+        # Backfill work queue: everything not summarized yet
+        Index(
+            "ix_books_summary_todo",
+            "id",
+            postgresql_where=summary_status != AI_DONE,
+            sqlite_where=summary_status != AI_DONE,
+        ),
+    )
+
 
 class Borrow(Base):
     __tablename__ = "borrows"
@@ -62,6 +108,19 @@ class Borrow(Base):
     user = relationship("User", back_populates="borrows")
     book = relationship("Book", back_populates="borrows")
 
+    __table_args__ = (
+        Index("ix_borrows_user_book_return", "user_id", "book_id", "return_date"),
+        # A user can hold at most one active (unreturned) borrow per book
+        Index(
+            "uq_borrows_active_user_book",
+            "user_id",
+            "book_id",
+            unique=True,
+            postgresql_where=return_date.is_(None),
+            sqlite_where=return_date.is_(None),
+        ),
+    )
+
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -72,19 +131,36 @@ class Review(Base):
     rating = Column(Integer, nullable=False)  # 1-5 stars
     comment = Column(Text, nullable=True)
     sentiment = Column(String, nullable=True)
+    sentiment_status = Column(
+        String, nullable=False, default=AI_PENDING, server_default=AI_PENDING
+    )
+    sentiment_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    sentiment_error = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="reviews")
     book = relationship("Book", back_populates="reviews")
 
+    __table_args__ = (
+        # One review per user per book; also serves as the (book_id, user_id) index
+        UniqueConstraint("book_id", "user_id", name="uq_reviews_book_user"),
+        # Backfill work queue: reviews without a sentiment yet
+        Index(
+            "ix_reviews_sentiment_todo",
+            "id",
+            postgresql_where=sentiment_status != AI_DONE,
+            sqlite_where=sentiment_status != AI_DONE,
+        ),
+    )
+
 
 class UserPreference(Base):
     """
     Design Decision for ML:
     Storing preferences as JSON allows us to be flexible with our ML algorithm.
-    We can store explicit tags (e.g., {"genres": ["sci-fi"]})
-    or implicit vectors (e.g., {"embedding": [0.12, -0.4, ...]})
-    without migrating the DB.
+    We can store explicit tags (e.g., {"genres": ["sci-fi"]}) without
+    migrating the DB. Vectors do not belong here: JSON float lists are slow
+    to parse and several times larger than the numbers; see `UserVector`.
     """
 
     __tablename__ = "user_preferences"
@@ -96,3 +172,122 @@ class UserPreference(Base):
     data = Column(JSON, default={})
 
     user = relationship("User", back_populates="preferences")
+
+
+class CacheVersion(Base):
+    """
+    Monotonic version counter per cacheable scope (e.g. "books",
+    "reviews:42"). Bumped in the same transaction as the write it describes;
+    HTTP ETags are derived from it.
+    """
+
+    __tablename__ = "cache_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class RateLimitBucket(Base):
+    """
+    Token-bucket state shared by all API workers when RATE_LIMIT_BACKEND is
+    "database". `updated_at` is epoch seconds of the last refill.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)
+
+
+class BookNeighbour(Base):
+    """
+    Item-to-item co-borrow similarity ("readers also borrowed"): cosine of the
+    two books' reader sets. Rebuilt (top-M per book) by
+    `python -m app.rebuild_neighbours` and updated incrementally on borrow.
+    """
+
+    __tablename__ = "book_neighbours"
+
+    book_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    neighbour_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    co_readers = Column(Integer, nullable=False)  # Users who borrowed both
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_book_neighbours_book_score", "book_id", "score"),
+        # Rescoring after a borrow also reads the pairs pointing at the book
+        Index("ix_book_neighbours_neighbour_id", "neighbour_id"),
+    )
+
+
+class BookReaderCount(Base):
+    """Distinct borrowers per book, the normalizer of `BookNeighbour.score`."""
+
+    __tablename__ = "book_reader_counts"
+
+    book_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    readers = Column(Integer, nullable=False)
+
+
+class BookTrending(Base):
+    """
+    Shared, exponentially decayed interaction score per book ("trending now"),
+    merged from every worker's in-memory counters. `log_score` is relative
+    to the Unix epoch (see `app.core.trending.Decay`), so ordering by it
+    ranks by the current score without rewriting rows as time passes.
+    """
+
+    __tablename__ = "book_trending"
+
+    book_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    log_score = Column(Float, nullable=False, index=True)
+    updated_at = Column(Float, nullable=False)  # Epoch seconds of the last flush
+
+
+class VectorSpace(Base):
+    """
+    One published TF-IDF feature space (vocabulary + IDF weights). Vectors
+    are only comparable within the same `version`, which matches the
+    recommendation index version written by `python -m app.reindex`.
+    """
+
+    __tablename__ = "vector_spaces"
+
+    version = Column(String, primary_key=True)
+    features = Column(Integer, nullable=False)
+    idf = Column(LargeBinary, nullable=False)  # float32[features]
+    vocabulary = Column(Text, nullable=False)  # JSON {term: column}
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class BookVector(Base):
+    """
+    Sparse, L2-normalized summary vector of a book as raw little-endian
+    arrays: `indices` int32 columns and `weights` float32 values.
+    """
+
+    __tablename__ = "book_vectors"
+
+    book_id = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    version = Column(String, ForeignKey("vector_spaces.version"), nullable=False)
+    indices = Column(LargeBinary, nullable=False)
+    weights = Column(LargeBinary, nullable=False)
+
+
+class UserVector(Base):
+    """
+    Cached recommendation profile of a user, in the same layout as
+    `BookVector`. `fingerprint` hashes the inputs it was built from
+    (space version, summarized borrowed books, topic tags); a mismatch
+    means it is stale and gets rebuilt.
+    """
+
+    __tablename__ = "user_vectors"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(String, nullable=False)
+    fingerprint = Column(String, nullable=False)
+    indices = Column(LargeBinary, nullable=False)
+    weights = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
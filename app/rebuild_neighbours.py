@@ -0,0 +1,40 @@
+"""
+Rebuild the co-borrow neighbours ("readers also borrowed").
+
+    python -m app.rebuild_neighbours --top-m 50
+
+Recomputes item-to-item similarity from the whole borrows table and
+replaces book_neighbours in one transaction. Borrows keep the table
+up to date between runs; the rebuild restores exact scores and the top-M cut.
+"""
+import argparse
+import sys
+import time
+
+from app.core.config import settings
+from app.db.session import session_scope
+from app.infrastructure.services.neighbour_builder import build_neighbours
+from app.infrastructure.services.neighbour_service import replace_neighbours
+from app.models.sql_models import Borrow
+
+
+def main(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    with session_scope() as db:
+        borrows = db.query(Borrow.user_id, Borrow.book_id).yield_per(10000)
+        readers, rows = build_neighbours(
+            ((user_id, book_id) for user_id, book_id in borrows), top_m=args.top_m
+        )
+        replace_neighbours(db, readers, rows)
+
+    print(
+        f"Stored {len(rows)} neighbour pairs for {len(readers)} books "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild co-borrow neighbours.")
+    parser.add_argument("--top-m", type=int, default=settings.NEIGHBOURS_TOP_M)
+    sys.exit(main(parser.parse_args()))
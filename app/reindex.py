@@ -0,0 +1,93 @@
+"""
+Publish the recommendation index.
+
+    python -m app.reindex            # vectorize the catalog
+    python -m app.reindex --restore  # reuse the vectors stored in the database
+
+Vectorizes every summarized book, stores the vectors in the database
+(book_vectors) and writes a new index version under RECOMMENDATION_INDEX_DIR.
+Running API workers memory-map it and switch to it within
+RECOMMENDATION_INDEX_CHECK_SECONDS; no restart is needed. `--restore` rebuilds
+the local files of another node from one read of the stored vectors.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.session import session_scope
+from app.infrastructure.services.recommendation_index import (
+    build_index_arrays,
+    new_version,
+    write_index_version,
+)
+from app.infrastructure.services.vector_store import (
+    restore_index,
+    save_catalog_vectors,
+)
+from app.models.sql_models import AI_DONE, Book
+
+
+def restore(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    with session_scope() as db:
+        version = restore_index(Path(args.index_dir), db, keep=args.keep)
+    if version is None:
+        print("No stored vectors; run without --restore first.", file=sys.stderr)
+        return 1
+    print(f"Restored index {version} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.restore:
+        return restore(args)
+
+    start = time.perf_counter()
+    # Taken before the read: books summarized from here on are not in the
+    # index and get scored on the fly until the next publish
+    indexed_at = datetime.utcnow()
+    with session_scope() as db:
+        books = [
+            (book_id, summary)
+            for book_id, summary in db.query(Book.id, Book.summary)
+            .filter(Book.summary_status == AI_DONE)
+            .order_by(Book.id)
+            .yield_per(1000)
+            if summary
+        ]
+
+    if not books:
+        print("No summarized books to index.", file=sys.stderr)
+        return 1
+
+    arrays = build_index_arrays(books)
+    arrays["indexed_at"] = indexed_at
+    version = new_version()
+    with session_scope() as db:
+        save_catalog_vectors(db, version, arrays)
+    write_index_version(Path(args.index_dir), version, arrays, keep=args.keep)
+    print(
+        f"Published index {version} with {len(books)} books "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish the recommendation index.")
+    parser.add_argument("--index-dir", default=settings.RECOMMENDATION_INDEX_DIR)
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=settings.RECOMMENDATION_INDEX_KEEP_VERSIONS,
+        help="Published versions to keep on disk",
+    )
+    parser.add_argument(
+        "--restore",
+        action="store_true",
+        help="Write the local index from the stored vectors instead of vectorizing",
+    )
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,61 @@
+"""
+Per-request authentication cost: `get_current_principal` on a cache miss
+(JWT decode plus one user lookup) and on a cache hit, and `get_current_user`
+for endpoints that still need the ORM row.
+
+    python -m benchmarks.catalog --reset
+    python -m benchmarks.bench_auth
+"""
+import argparse
+
+from benchmarks.catalog import bench_user_email
+from benchmarks.common import emit, measure
+
+from app.api.v1.endpoints.auth import get_current_principal, get_current_user
+from app.core.security import create_access_token, principal_cache
+from app.db.session import session_scope
+from app.models.sql_models import User
+
+
+def main(repeat: int, output: str = None) -> dict:
+    with session_scope() as db:
+        user = db.query(User).filter(User.email == bench_user_email()).one()
+        token = create_access_token(
+            data={
+                "sub": str(user.id),
+                "email": user.email,
+                "active": user.is_active,
+                "ver": user.token_version,
+            }
+        )
+
+    def cold():
+        principal_cache.clear()
+        return get_current_principal(token)
+
+    def warm():
+        return get_current_principal(token)
+
+    def orm_user():
+        with session_scope() as db:
+            return get_current_user(db, get_current_principal(token))
+
+    results = {
+        "principal_cache_miss": measure(cold, repeat=repeat),
+        "principal_cache_hit": measure(warm, repeat=repeat),
+        "current_user_orm": measure(orm_user, repeat=repeat),
+    }
+    results["cache_speedup"] = round(
+        results["principal_cache_miss"]["mean_ms"]
+        / results["principal_cache_hit"]["mean_ms"],
+        1,
+    )
+    return emit("auth", results, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    main(args.repeat, args.output)
@@ -0,0 +1,298 @@
+"""
+HTTP load scenarios against a real uvicorn server with a stub LLM and
+throwaway storage, so results reflect the API and database only.
+
+    python -m benchmarks.catalog --books 20000 --users 200 --reset
+    python -m benchmarks.bench_http --scenarios browse recommendations mix --duration 10
+
+Pass --url to load an already running deployment instead (the real LLM
+is used then). Rate limiting is off in the spawned server unless
+RATE_LIMIT_ENABLED is exported.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.catalog import BENCHMARK_PASSWORD, GENRES
+from benchmarks.common import ROOT, emit
+
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+
+from sqlalchemy import func, select
+
+from app.db.session import session_scope
+from app.models.sql_models import Book, Borrow, User
+
+Request = Tuple[str, str, dict]  # (method, path, httpx kwargs)
+API = "/api/v1"
+SEARCH_TERMS = [thing for things, _ in GENRES.values() for thing in things]
+
+
+def stub_app():
+    """App factory for the spawned server: external services replaced by stubs."""
+    from app.api.dependencies import get_llm_service, get_storage_service
+    from app.main import app
+    from benchmarks.stubs import StubLLM, TempDirStorage
+
+    llm = StubLLM(latency=float(os.environ.get("BENCH_LLM_LATENCY", "0")))
+    app.dependency_overrides[get_llm_service] = lambda: llm
+    app.dependency_overrides[get_storage_service] = TempDirStorage
+    return app
+
+
+def _browse(rng: random.Random, book_ids: List[int]) -> Request:
+    return "GET", f"{API}/books/", {"params": {"limit": 20, "skip": rng.randrange(0, 500)}}
+
+
+def _search(rng: random.Random, book_ids: List[int]) -> Request:
+    return "GET", f"{API}/books/search", {"params": {"q": rng.choice(SEARCH_TERMS)}}
+
+
+def _reviews(rng: random.Random, book_ids: List[int]) -> Request:
+    return "GET", f"{API}/interactions/reviews/{rng.choice(book_ids)}", {}
+
+
+def _recommendations(rng: random.Random, book_ids: List[int]) -> Request:
+    return "GET", f"{API}/interactions/recommendations/", {}
+
+
+def _borrow(rng: random.Random, book_ids: List[int]) -> Request:
+    return "POST", f"{API}/interactions/borrow/", {"json": {"book_id": rng.choice(book_ids)}}
+
+
+def _upload(rng: random.Random, book_ids: List[int]) -> Request:
+    text = f"A benchmark upload about the {rng.choice(SEARCH_TERMS)}. " * 20
+    return (
+        "POST",
+        f"{API}/books/",
+        {
+            "data": {"title": "Benchmark Upload", "author": "Bench"},
+            "files": {"file": ("upload.txt", text.encode(), "text/plain")},
+        },
+    )
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, List[int]], Request]] = {
+    "browse": _browse,
+    "search": _search,
+    "reviews": _reviews,
+    "recommendations": _recommendations,
+    "borrow": _borrow,
+    "upload": _upload,
+}
+# Read-heavy traffic with occasional writes
+MIX = {"browse": 40, "search": 20, "reviews": 20, "recommendations": 10, "borrow": 7, "upload": 3}
+
+
+def _pick(name: str) -> Callable[[random.Random, List[int]], Request]:
+    if name != "mix":
+        return SCENARIOS[name]
+    names, weights = list(MIX), list(MIX.values())
+    return lambda rng, ids: SCENARIOS[rng.choices(names, weights)[0]](rng, ids)
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * q))] if samples else 0.0
+
+
+async def run_scenario(
+    base_url: str,
+    name: str,
+    tokens: List[str],
+    book_ids: List[int],
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> dict:
+    make_request = _pick(name)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+
+        async def worker(i: int) -> None:
+            rng = random.Random(seed + i)
+            headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+            while time.perf_counter() < deadline:
+                method, path, kwargs = make_request(rng, book_ids)
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, headers=headers, **kwargs)
+                    statuses[str(response.status_code)] += 1
+                except httpx.HTTPError:
+                    statuses["error"] += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    # 5xx responses plus requests the server dropped without answering
+    server_errors = sum(
+        n for status, n in statuses.items() if status.startswith("5") or status == "error"
+    )
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "status": dict(statuses),
+        "server_errors": server_errors,
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+def _login(base_url: str, emails: List[str]) -> List[str]:
+    tokens = []
+    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+        for email in emails:
+            response = client.post(
+                f"{API}/auth/login",
+                data={"username": email, "password": BENCHMARK_PASSWORD},
+            )
+            response.raise_for_status()
+            tokens.append(response.json()["access_token"])
+    return tokens
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _spawn_server(port: int, workers: int, llm_latency: float) -> subprocess.Popen:
+    env = {**os.environ, "BENCH_LLM_LATENCY": str(llm_latency)}
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.bench_http:stub_app",
+            "--factory", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/readyz").status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            raise RuntimeError("Benchmark server exited during startup")
+        time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError("Benchmark server did not become ready within 60s")
+
+
+def main(
+    scenarios: List[str],
+    concurrency: int,
+    duration: float,
+    users: int,
+    workers: int,
+    llm_latency: float,
+    url: Optional[str] = None,
+    seed: int = 42,
+    output: str = None,
+) -> int:
+    # Users with borrow history, so recommendations exercise the ML path
+    with session_scope() as db:
+        emails = [
+            email
+            for (email,) in db.execute(
+                select(User.email)
+                .join(Borrow, Borrow.user_id == User.id)
+                .where(User.email.like("bench-user-%"))
+                .group_by(User.id, User.email)
+                .order_by(User.id)
+                .limit(users)
+            )
+        ]
+        book_ids = list(db.scalars(select(Book.id).order_by(func.random()).limit(5000)))
+    if not emails or not book_ids:
+        raise SystemExit("No synthetic catalog found; run `python -m benchmarks.catalog`")
+
+    process = None
+    if url is None:
+        port = _free_port()
+        process = _spawn_server(port, workers, llm_latency)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        tokens = _login(url, emails)
+        results = {
+            name: asyncio.run(
+                run_scenario(url, name, tokens, book_ids, concurrency, duration, seed)
+            )
+            for name in scenarios
+        }
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    emit(
+        "http",
+        {
+            "concurrency": concurrency,
+            "duration_seconds": duration,
+            "server_workers": workers,
+            "llm_latency_seconds": llm_latency,
+            "scenarios": results,
+        },
+        output,
+    )
+
+    # Latency numbers are meaningless if some of the requests crashed
+    failed = [name for name, result in results.items() if result["server_errors"]]
+    for name in failed:
+        print(
+            f"FAIL: scenario {name} had {results[name]['server_errors']} server errors",
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=[*SCENARIOS, "mix"],
+        default=["browse", "search", "recommendations", "mix"],
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--users", type=int, default=8, help="Distinct logged-in users")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Stub LLM delay (s)")
+    parser.add_argument("--url", help="Target a running server instead of spawning one")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    sys.exit(
+        main(
+            args.scenarios,
+            args.concurrency,
+            args.duration,
+            args.users,
+            args.workers,
+            args.llm_latency,
+            url=args.url,
+            seed=args.seed,
+            output=args.output,
+        )
+    )
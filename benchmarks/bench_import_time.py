@@ -0,0 +1,130 @@
+"""
+Startup import cost of the API, measured with `python -X importtime`.
+Fails (exit code 1) when importing `app.main` exceeds the budget or pulls in
+a module that must stay lazy (the ML stack is loaded by the lifespan warm-up).
+
+    python -m benchmarks.bench_import_time --budget-ms 2500
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks.common import ROOT, emit
+
+DEFAULT_FORBIDDEN = ("sklearn", "scipy", "numpy")
+
+# "import time: self [us] | cumulative | imported package", nesting shown by indentation
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Returns (module, self_us, cumulative_us, depth) for each -X importtime line."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def _import_once(module: str) -> List[Tuple[str, int, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main(
+    module: str,
+    budget_ms: float,
+    repeat: int,
+    forbidden: List[str],
+    top: int,
+    output: str = None,
+) -> int:
+    totals: List[float] = []
+    direct: Dict[str, List[int]] = {}
+    loaded = set()
+    for _ in range(repeat):
+        entries = _import_once(module)
+        for name, _self_us, cumulative_us, depth in entries:
+            loaded.add(name)
+            if depth == 1:
+                direct.setdefault(name, []).append(cumulative_us)
+        totals.append(next(c for name, _, c, _ in entries if name == module) / 1000)
+
+    # Direct (depth 1) imports of the measured module are the useful breakdown
+    heaviest = sorted(
+        (
+            (name, statistics.median(samples) / 1000)
+            for name, samples in direct.items()
+        ),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+    leaked = sorted(
+        name
+        for name in loaded
+        if any(name == f or name.startswith(f + ".") for f in forbidden)
+    )
+    median_ms = statistics.median(totals)
+
+    emit(
+        "import_time",
+        {
+            "module": module,
+            "runs": repeat,
+            "median_ms": round(median_ms, 1),
+            "min_ms": round(min(totals), 1),
+            "budget_ms": budget_ms,
+            "heaviest_ms": {name: round(ms, 1) for name, ms in heaviest},
+            "forbidden_loaded": sorted({name.split(".")[0] for name in leaked}),
+        },
+        output,
+    )
+
+    failed = False
+    if median_ms > budget_ms:
+        print(
+            f"FAIL: import {module} took {median_ms:.0f}ms (budget {budget_ms:.0f}ms)",
+            file=sys.stderr,
+        )
+        failed = True
+    if leaked:
+        print(
+            f"FAIL: import {module} loaded modules that must stay lazy: "
+            f"{', '.join(sorted({name.split('.')[0] for name in leaked}))}",
+            file=sys.stderr,
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=2500.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=list(DEFAULT_FORBIDDEN),
+        help="Top-level packages that must not be imported at startup",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Heaviest imports to report")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    sys.exit(
+        main(args.module, args.budget_ms, args.repeat, args.forbid, args.top, args.output)
+    )
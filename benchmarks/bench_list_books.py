@@ -0,0 +1,80 @@
+"""
+`GET /books/` paging cost at increasing depth: OFFSET (`skip`) versus keyset
+(`cursor`), full versus compact projection. Runs in-process through the ASGI
+app with the response cache off, so every call reaches the database.
+
+    python -m benchmarks.catalog --books 100000 --reset
+    python -m benchmarks.bench_list_books --depths 0 10000 90000
+"""
+import argparse
+import os
+from typing import List
+
+from benchmarks.common import emit, measure
+
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+from fastapi.testclient import TestClient
+
+from app.core.pagination import encode_cursor
+from app.db.session import session_scope
+from app.main import app
+from app.models.sql_models import Book
+
+
+def _cursor_at(depth: int, sort: str) -> str:
+    """Cursor equivalent to `skip=depth` (the key of the row just before it)."""
+    order_by = (Book.id,) if sort == "id" else (Book.title, Book.id)
+    with session_scope() as db:
+        row = (
+            db.query(Book.id, Book.title)
+            .order_by(*order_by)
+            .offset(depth - 1)
+            .limit(1)
+            .one()
+        )
+    return encode_cursor(sort, (row.id,) if sort == "id" else (row.title, row.id))
+
+
+def main(depths: List[int], limit: int, repeat: int, output: str = None) -> dict:
+    client = TestClient(app)
+    with session_scope() as db:
+        total = db.query(Book.id).count()
+    if not total:
+        raise SystemExit("No books found; run `python -m benchmarks.catalog` first")
+
+    def page(**params):
+        def call():
+            response = client.get("/api/v1/books/", params={"limit": limit, **params})
+            assert response.status_code == 200, response.text
+            return response
+
+        return call
+
+    results = {}
+    for depth in (d for d in depths if d < total):
+        scenario = {}
+        for sort in ("id", "title"):
+            scenario[f"offset_{sort}"] = measure(
+                page(skip=depth, sort=sort), repeat=repeat
+            )
+            if depth:
+                cursor = _cursor_at(depth, sort)
+                scenario[f"cursor_{sort}"] = measure(
+                    page(cursor=cursor, sort=sort), repeat=repeat
+                )
+        scenario["offset_id_compact"] = measure(
+            page(skip=depth, fields="compact"), repeat=repeat
+        )
+        results[str(depth)] = scenario
+    return emit("list_books", {"books": total, "limit": limit, "depths": results}, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    main(args.depths, args.limit, args.repeat, args.output)
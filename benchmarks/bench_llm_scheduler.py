@@ -0,0 +1,117 @@
+"""
+Interactive LLM latency during a bulk import: a flood of summaries is
+queued at once while single reviews arrive at a steady pace. Compares one
+FIFO queue with the priority scheduler (reserved slot, weights, aging).
+
+    python -m benchmarks.bench_llm_scheduler --bulk 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import emit
+from benchmarks.stubs import StubLLM
+
+from app.infrastructure.services.llm_scheduler import (
+    BULK,
+    INTERACTIVE,
+    PriorityScheduler,
+    ScheduledLLM,
+    llm_priority,
+)
+
+
+def _summary(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "calls": len(samples),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 1),
+        "p95_ms": round(
+            samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1
+        ),
+        "max_ms": round(samples[-1] * 1000, 1),
+    }
+
+
+async def _scenario(
+    scheduler: PriorityScheduler, bulk: int, interactive: int, latency: float
+) -> dict:
+    llm = ScheduledLLM(StubLLM(latency), scheduler)
+    interactive_latency, bulk_latency = [], []
+
+    async def call(priority: str, samples: list, coro_factory):
+        with llm_priority(priority):
+            start = time.perf_counter()
+            await coro_factory()
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    bulk_tasks = [
+        asyncio.create_task(
+            call(BULK, bulk_latency, lambda: llm.generate_summary("bulk text"))
+        )
+        for _ in range(bulk)
+    ]
+    interactive_tasks = []
+    for _ in range(interactive):
+        await asyncio.sleep(latency / 2)
+        interactive_tasks.append(
+            asyncio.create_task(
+                call(
+                    INTERACTIVE,
+                    interactive_latency,
+                    lambda: llm.analyze_sentiment("a good book"),
+                )
+            )
+        )
+    await asyncio.gather(*bulk_tasks, *interactive_tasks)
+    return {
+        "interactive": _summary(interactive_latency),
+        "bulk": _summary(bulk_latency),
+        "total_s": round(time.perf_counter() - start, 2),
+    }
+
+
+def main(
+    bulk: int,
+    interactive: int,
+    latency: float,
+    slots: int,
+    aging_seconds: float,
+    output: str = None,
+) -> dict:
+    fifo = PriorityScheduler(slots, {INTERACTIVE: 1.0, BULK: 1.0}, aging_seconds=0.0)
+    priority = PriorityScheduler(
+        slots,
+        {INTERACTIVE: 8.0, BULK: 1.0},
+        aging_seconds=aging_seconds,
+        reserved_slots=1,
+    )
+    results = {
+        "fifo": asyncio.run(_scenario(fifo, bulk, interactive, latency)),
+        "priority": asyncio.run(_scenario(priority, bulk, interactive, latency)),
+    }
+    return emit("llm_scheduler", results, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--bulk", type=int, default=200, help="Summaries queued at once"
+    )
+    parser.add_argument("--interactive", type=int, default=40)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds per LLM call"
+    )
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--aging-seconds", type=float, default=120.0)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    main(
+        args.bulk,
+        args.interactive,
+        args.latency,
+        args.slots,
+        args.aging_seconds,
+        args.output,
+    )
@@ -0,0 +1,165 @@
+"""
+Co-borrow neighbours: the incremental path (`record_borrows`, run after each
+borrow request) against the full rebuild (`build_neighbours`). Replays a
+random stream of single borrows, batches and re-borrows, with the background
+tasks finishing in shuffled order, into a private in-memory SQLite database.
+Fails (exit code 1) unless both paths store the same readers and pairs.
+
+    python -m benchmarks.bench_neighbours --users 100 --books 300 --requests 500
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from benchmarks.common import emit
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.infrastructure.services.neighbour_builder import build_neighbours
+from app.infrastructure.services.neighbour_service import record_borrows
+from app.models.sql_models import BookNeighbour, BookReaderCount, Borrow
+
+Request = Tuple[int, List[Tuple[int, int]]]  # (user_id, [(borrow_id, book_id)])
+
+
+def _requests(users: int, books: int, count: int, rng: random.Random) -> List[Request]:
+    """Borrow requests in commit order: mostly singles, some batches and re-borrows."""
+    history: Dict[int, List[int]] = {}
+    requests, borrow_id = [], 0
+    for _ in range(count):
+        user_id = rng.randrange(1, users + 1)
+        read = history.setdefault(user_id, [])
+        if read and rng.random() < 0.1:
+            book_ids = [rng.choice(read)]
+        else:
+            book_ids = rng.sample(range(1, books + 1), rng.choice((1, 1, 1, 2, 3, 5)))
+        borrows = []
+        for book_id in book_ids:
+            borrow_id += 1
+            borrows.append((borrow_id, book_id))
+            read.append(book_id)
+        requests.append((user_id, borrows))
+    return requests
+
+
+def _stored(session) -> Tuple[Dict[int, int], Dict[Tuple[int, int], Tuple[int, float]]]:
+    readers = dict(
+        session.execute(select(BookReaderCount.book_id, BookReaderCount.readers)).all()
+    )
+    pairs = {
+        (a, b): (co, score)
+        for a, b, co, score in session.execute(
+            select(
+                BookNeighbour.book_id,
+                BookNeighbour.neighbour_id,
+                BookNeighbour.co_readers,
+                BookNeighbour.score,
+            )
+        ).all()
+    }
+    return readers, pairs
+
+
+def main(users: int, books: int, requests: int, seed: int, output: str = None) -> int:
+    rng = random.Random(seed)
+    stream = _requests(users, books, requests, rng)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(
+        engine,
+        tables=[Borrow.__table__, BookReaderCount.__table__, BookNeighbour.__table__],
+    )
+    Session = sessionmaker(bind=engine)
+
+    # Every borrow is committed before its request's task runs; tasks may finish
+    # in any order, so replay them shuffled against the complete table. All are
+    # returned, so re-borrows pass the one-active-borrow index.
+    returned = datetime.utcnow()
+    with Session() as session:
+        session.execute(
+            insert(Borrow),
+            [
+                {
+                    "id": borrow_id,
+                    "user_id": user_id,
+                    "book_id": book_id,
+                    "return_date": returned,
+                }
+                for user_id, borrows in stream
+                for borrow_id, book_id in borrows
+            ],
+        )
+        session.commit()
+
+    tasks = list(stream)
+    rng.shuffle(tasks)
+    start = time.perf_counter()
+    with Session() as session:
+        for user_id, borrows in tasks:
+            record_borrows(session, user_id, borrows, max_history=books)
+        incremental_seconds = time.perf_counter() - start
+        readers, pairs = _stored(session)
+
+    start = time.perf_counter()
+    expected_readers, rows = build_neighbours(
+        ((user_id, book_id) for user_id, borrows in stream for _, book_id in borrows),
+        top_m=books,
+    )
+    rebuild_seconds = time.perf_counter() - start
+    expected = {
+        (row["book_id"], row["neighbour_id"]): (row["co_readers"], row["score"])
+        for row in rows
+    }
+
+    mismatched = sorted(
+        key
+        for key in pairs.keys() | expected.keys()
+        if key not in pairs
+        or key not in expected
+        or pairs[key][0] != expected[key][0]
+        or not math.isclose(pairs[key][1], expected[key][1], rel_tol=1e-5)
+    )
+    failed = readers != expected_readers or bool(mismatched)
+    emit(
+        "neighbours",
+        {
+            "borrows": sum(len(borrows) for _, borrows in stream),
+            "requests": len(stream),
+            "pairs": len(expected),
+            "incremental_seconds": round(incremental_seconds, 3),
+            "rebuild_seconds": round(rebuild_seconds, 3),
+            "readers_match": readers == expected_readers,
+            "mismatched_pairs": len(mismatched),
+            "ok": not failed,
+        },
+        output,
+    )
+    if failed:
+        print(
+            f"FAIL: incremental neighbours differ from the rebuild "
+            f"({len(mismatched)} pairs, e.g. {mismatched[:3]})",
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--books", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    sys.exit(main(args.users, args.books, args.requests, args.seed, args.output))
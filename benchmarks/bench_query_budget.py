@@ -0,0 +1,121 @@
+"""
+Pinned SQL query budgets of the hot endpoints, checked with
+`assert_query_budget` (background tasks included). Fails (exit code 1) when
+an endpoint runs more statements than its budget or repeats one statement,
+so an N+1 regression shows up in CI rather than in production.
+
+    python -m benchmarks.catalog --reset
+    python -m benchmarks.bench_query_budget
+
+After an intentional change, update BUDGETS in the same commit.
+"""
+import argparse
+import os
+import uuid
+
+from benchmarks.catalog import BENCHMARK_PASSWORD
+from benchmarks.common import emit
+
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.api.v1.endpoints.auth import get_current_principal
+from app.db.profiler import assert_query_budget
+from app.db.session import engine, session_scope
+from app.models.sql_models import Book
+
+API = "/api/v1"
+
+# endpoint -> (max statements, max executions of any one statement), counting
+# the background tasks each request queues (neighbours, sentiment, profile).
+# create_review bumps its cache version twice: once for the review, once
+# when the sentiment lands.
+BUDGETS = {
+    "borrow": (5, 1),
+    "return": (3, 1),
+    "create_review": (7, 2),
+    "recommendations": (7, 1),
+}
+
+
+def _client() -> TestClient:
+    from app.api.dependencies import get_llm_service, get_storage_service
+    from app.main import app
+    from benchmarks.stubs import StubLLM, TempDirStorage
+
+    llm = StubLLM()
+    app.dependency_overrides[get_llm_service] = lambda: llm
+    app.dependency_overrides[get_storage_service] = TempDirStorage
+    return TestClient(app)
+
+
+def main(output: str = None) -> int:
+    with session_scope() as db:
+        book_id = db.scalar(select(Book.id).order_by(Book.id).limit(1))
+    if book_id is None:
+        raise SystemExit("No catalog: run `python -m benchmarks.catalog --reset` first")
+
+    with _client() as client:
+        # A fresh user per run, so borrowing and reviewing always succeed
+        email = f"budget-{uuid.uuid4().hex[:12]}@bench.example"
+        client.post(
+            f"{API}/auth/signup", json={"email": email, "password": BENCHMARK_PASSWORD}
+        )
+        token = client.post(
+            f"{API}/auth/login",
+            data={"username": email, "password": BENCHMARK_PASSWORD},
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        get_current_principal(token)  # Warm the auth cache; budgets exclude it
+
+        calls = {
+            "borrow": lambda: client.post(
+                f"{API}/interactions/borrow/",
+                json={"book_id": book_id},
+                headers=headers,
+            ),
+            "return": lambda: client.post(
+                f"{API}/interactions/return/{borrow_id}", headers=headers
+            ),
+            "create_review": lambda: client.post(
+                f"{API}/interactions/reviews/",
+                json={"book_id": book_id, "rating": 5, "comment": "A good read."},
+                headers=headers,
+            ),
+            "recommendations": lambda: client.get(
+                f"{API}/interactions/recommendations/", headers=headers
+            ),
+        }
+
+        results, failed = {}, 0
+        borrow_id = None
+        for name, call in calls.items():
+            max_queries, max_repeats = BUDGETS[name]
+            try:
+                with assert_query_budget(engine, max_queries, max_repeats) as stats:
+                    response = call()
+                error = None
+            except AssertionError as e:
+                error = str(e)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+            if name == "borrow" and response.status_code < 400:
+                borrow_id = response.json()["id"]
+            failed += error is not None
+            results[name] = {
+                "queries": stats.count,
+                "budget": max_queries,
+                "ok": error is None,
+                **({"error": error} if error else {}),
+            }
+
+    emit("query_budget", results, output)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    raise SystemExit(main(parser.parse_args().output))
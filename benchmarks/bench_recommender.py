@@ -0,0 +1,86 @@
+"""
+Recommendation scoring cost versus catalog size: the per-request TF-IDF fit
+(`get_content_based_recommendations`) against the published memory-mapped
+index (`get_indexed_recommendations`). Needs a generated catalog.
+
+    python -m benchmarks.catalog --books 20000 --reset
+    python -m benchmarks.bench_recommender --sizes 1000 5000 20000
+"""
+import argparse
+import random
+import tempfile
+from pathlib import Path
+from typing import List
+
+from benchmarks.common import emit, measure
+
+from app.db.session import session_scope
+from app.infrastructure.services.ml_service import RecommendationEngine
+from app.infrastructure.services.recommendation_index import (
+    CatalogIndex,
+    VERSIONS_DIR,
+    publish_index,
+)
+from app.models.sql_models import Book
+
+
+def _load_books(limit: int) -> List[dict]:
+    with session_scope() as db:
+        rows = (
+            db.query(Book.id, Book.title, Book.summary)
+            .filter(Book.summary.isnot(None))
+            .order_by(Book.id)
+            .limit(limit)
+            .all()
+        )
+    return [{"id": r.id, "title": r.title, "summary": r.summary} for r in rows]
+
+
+def main(sizes: List[int], repeat: int, seed: int, output: str = None) -> dict:
+    catalog = _load_books(max(sizes))
+    if not catalog:
+        raise SystemExit("No books found; run `python -m benchmarks.catalog` first")
+
+    rng = random.Random(seed)
+    engine = RecommendationEngine()
+    results = {}
+    for size in sizes:
+        books = catalog[:size]
+        liked = rng.sample(books, min(5, len(books)))
+        profile = [b["summary"] for b in liked] + ["Science Fiction"]
+        exclude = [b["id"] for b in liked]
+        candidates = [b for b in books if b["id"] not in set(exclude)]
+
+        fit = measure(
+            lambda: engine.get_content_based_recommendations(profile, candidates),
+            repeat=repeat,
+            warmup=1,
+        )
+
+        with tempfile.TemporaryDirectory() as root:
+            version = publish_index(
+                Path(root), ((b["id"], b["summary"]) for b in books), keep=1
+            )
+            index = CatalogIndex(Path(root) / VERSIONS_DIR / version)
+            indexed = measure(
+                lambda: engine.get_indexed_recommendations(index, profile, exclude),
+                repeat=repeat,
+            )
+            del index
+
+        results[str(len(books))] = {
+            "per_request_fit": fit,
+            "memory_mapped_index": indexed,
+            "speedup": round(fit["mean_ms"] / indexed["mean_ms"], 1),
+        }
+    return emit("recommender", results, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    main(args.sizes, args.repeat, args.seed, args.output)
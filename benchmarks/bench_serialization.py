@@ -0,0 +1,75 @@
+"""
+Serialization throughput of list endpoints: the FastAPI/Pydantic
+`from_attributes` path versus projected rows encoded in bulk with orjson.
+
+    python -m benchmarks.bench_serialization --rows 1000
+"""
+import argparse
+import json
+
+from benchmarks.common import emit, measure
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.responses import columns_for, dump_rows
+from app.db.base import Base
+from app.domain import schemas
+from app.models.sql_models import Book
+
+
+def main(rows: int, repeat: int, output: str = None) -> dict:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(
+            Book(
+                title=f"Book {i}",
+                author=f"Author {i % 97}",
+                isbn=f"isbn-{i}",
+                file_path=f"uploads/{i}.txt",
+                summary="A synthetic three sentence summary. " * 8,
+            )
+            for i in range(rows)
+        )
+        db.commit()
+
+    adapter = TypeAdapter(list[schemas.BookResponse])
+
+    def pydantic_path():
+        # What FastAPI does for `return db.query(Book).all()`
+        with Session() as db:
+            books = db.query(Book).limit(rows).all()
+            validated = adapter.validate_python(books, from_attributes=True)
+            return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+    def fast_path():
+        with Session() as db:
+            projected = (
+                db.query(*columns_for(Book, schemas.BookResponse)).limit(rows).all()
+            )
+            return dump_rows(projected)
+
+    # Both paths must produce the same document
+    assert json.loads(pydantic_path()) == json.loads(fast_path())
+
+    results = {}
+    for name, fn in (("pydantic_orm", pydantic_path), ("orjson_projection", fast_path)):
+        stats = measure(fn, repeat=repeat)
+        stats["rows_per_second"] = round(rows / (stats["mean_ms"] / 1000))
+        results[name] = stats
+    results["speedup"] = round(
+        results["pydantic_orm"]["mean_ms"] / results["orjson_projection"]["mean_ms"], 2
+    )
+    return emit("serialization", {"rows": rows, **results}, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    main(args.rows, args.repeat, args.output)
@@ -0,0 +1,250 @@
+"""
+Synthetic catalog generator for the benchmarks.
+
+    python -m benchmarks.catalog --books 100000 --users 2000 --reset
+
+Writes books with realistic multi-sentence summaries, users, borrows and
+reviews into DATABASE_URL (a local SQLite file unless it is exported).
+Generation is seeded, so the same arguments always produce the same data.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+from benchmarks.common import emit
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.db.session import engine as default_engine
+from app.models.sql_models import (
+    AI_DONE,
+    Book,
+    Borrow,
+    Review,
+    User,
+    UserPreference,
+)
+
+BENCHMARK_PASSWORD = "benchmark-password"
+CHUNK = 5000
+
+GENRES = {
+    "Science Fiction": (
+        ["starship", "colony", "android", "wormhole", "orbital station", "alien signal"],
+        ["a disgraced pilot", "a rogue AI", "the last engineer", "a xenobiologist"],
+    ),
+    "Fantasy": (
+        ["dragon", "cursed crown", "ancient forest", "mage academy", "lost kingdom"],
+        ["an apprentice sorcerer", "a reluctant heir", "an exiled knight", "a thief"],
+    ),
+    "Mystery": (
+        ["locked room", "stolen ledger", "harbour town", "poisoned letter", "alibi"],
+        ["a retired detective", "a young journalist", "the village doctor"],
+    ),
+    "Romance": (
+        ["summer wedding", "bookshop", "vineyard", "second chance", "old letters"],
+        ["a stubborn chef", "a travelling musician", "two rival architects"],
+    ),
+    "History": (
+        ["empire", "revolution", "trade route", "siege", "dynasty", "reformation"],
+        ["a court historian", "the merchants of Venice", "a forgotten general"],
+    ),
+    "Machine Learning": (
+        ["neural network", "gradient descent", "transformer", "feature store"],
+        ["a data science team", "a research lab", "practitioners"],
+    ),
+}
+TEMPLATES = (
+    "In this {adjective} story, {hero} discovers a {thing} that changes everything.",
+    "{Hero} must confront the secrets of the {thing} before time runs out.",
+    "Set against the backdrop of a {thing}, the book explores loyalty and {theme}.",
+    "A {adjective} guide in which {hero} explains the {thing} step by step.",
+    "What begins as a search for a {thing} turns into a journey about {theme}.",
+)
+ADJECTIVES = ["gripping", "quiet", "sweeping", "witty", "haunting", "practical", "epic"]
+THEMES = ["identity", "betrayal", "courage", "grief", "ambition", "friendship", "power"]
+
+
+def make_summary(rng: random.Random, genre: str) -> str:
+    things, heroes = GENRES[genre]
+    sentences = []
+    for template in rng.sample(TEMPLATES, 3):
+        hero = rng.choice(heroes)
+        sentences.append(
+            template.format(
+                adjective=rng.choice(ADJECTIVES),
+                hero=hero,
+                Hero=hero[0].upper() + hero[1:],
+                thing=rng.choice(things),
+                theme=rng.choice(THEMES),
+            )
+        )
+    return " ".join(sentences)
+
+
+def _chunks(rows: Iterator[dict], size: int = CHUNK) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _insert(engine: Engine, model, rows: Iterator[dict]) -> int:
+    count = 0
+    with engine.begin() as conn:
+        for chunk in _chunks(rows):
+            conn.execute(insert(model), chunk)
+            count += len(chunk)
+    return count
+
+
+def generate(
+    books: int,
+    users: int,
+    borrows_per_user: int,
+    review_ratio: float,
+    seed: int = 42,
+    reset: bool = False,
+    engine: Engine = default_engine,
+) -> dict:
+    """Creates the schema if needed and appends a synthetic catalog. Returns row counts."""
+    rng = random.Random(seed)
+    if reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    genres = list(GENRES)
+    start = time.perf_counter()
+
+    # 1. Books (ids are assigned by the database; remember the range we created)
+    with engine.connect() as conn:
+        first_book = (conn.scalar(select(func.max(Book.id))) or 0) + 1
+        first_user = (conn.scalar(select(func.max(User.id))) or 0) + 1
+
+    summarized_at = datetime.utcnow()
+
+    def book_rows():
+        for i in range(books):
+            genre = genres[i % len(genres)]
+            yield {
+                "title": f"{genre} Volume {first_book + i}",
+                "author": f"Author {rng.randrange(max(1, books // 20))}",
+                "isbn": f"978{first_book + i:010d}",
+                "file_path": f"uploads/synthetic-{first_book + i}.txt",
+                "file_type": "txt",
+                "summary": make_summary(rng, genre),
+                "summary_status": AI_DONE,
+                "summary_attempts": 1,
+                "summarized_at": summarized_at,
+            }
+
+    counts = {"books": _insert(engine, Book, book_rows())}
+
+    # 2. Users share one bcrypt hash; hashing per user would dominate the run
+    password_hash = get_password_hash(BENCHMARK_PASSWORD)
+    counts["users"] = _insert(
+        engine,
+        User,
+        (
+            {
+                "email": f"bench-user-{first_user + i}@example.com",
+                "hashed_password": password_hash,
+                "is_active": True,
+            }
+            for i in range(users)
+        ),
+    )
+    counts["preferences"] = _insert(
+        engine,
+        UserPreference,
+        (
+            {"user_id": first_user + i, "topic_tag": rng.choice(genres)}
+            for i in range(users)
+            if rng.random() < 0.5
+        ),
+    )
+
+    # 3. Borrows: distinct books per user, most already returned
+    book_ids = range(first_book, first_book + books)
+    per_user = min(borrows_per_user, books)
+    now = datetime.utcnow()
+    borrowed = []
+
+    def borrow_rows():
+        for i in range(users):
+            for book_id in rng.sample(book_ids, per_user):
+                borrowed.append((first_user + i, book_id))
+                borrowed_at = now - timedelta(days=rng.randrange(1, 365))
+                returned = rng.random() < 0.8
+                yield {
+                    "user_id": first_user + i,
+                    "book_id": book_id,
+                    "borrow_date": borrowed_at,
+                    "return_date": borrowed_at + timedelta(days=14) if returned else None,
+                }
+
+    counts["borrows"] = _insert(engine, Borrow, borrow_rows())
+
+    # 4. Reviews only for borrowed books (the API enforces the same rule)
+    counts["reviews"] = _insert(
+        engine,
+        Review,
+        (
+            {
+                "user_id": user_id,
+                "book_id": book_id,
+                "rating": rng.randint(1, 5),
+                "comment": rng.choice(
+                    ["Loved it.", "Not for me.", "Solid read.", "Could not put it down."]
+                ),
+                "sentiment": rng.choice(["Positive", "Negative", "Neutral"]),
+                "sentiment_status": AI_DONE,
+                "sentiment_attempts": 1,
+            }
+            for user_id, book_id in borrowed
+            if rng.random() < review_ratio
+        ),
+    )
+    counts["seconds"] = round(time.perf_counter() - start, 2)
+    return counts
+
+
+def bench_user_email(engine: Engine = default_engine) -> str:
+    """E-mail of a generated user that has borrow history (for authenticated scenarios)."""
+    with engine.connect() as conn:
+        user_id = conn.scalar(select(func.min(Borrow.user_id)))
+    if user_id is None:
+        raise RuntimeError("No synthetic catalog found; run `python -m benchmarks.catalog`")
+    return f"bench-user-{user_id}@example.com"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--borrows-per-user", type=int, default=10)
+    parser.add_argument("--review-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop all tables first")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    emit(
+        "catalog",
+        generate(
+            args.books,
+            args.users,
+            args.borrows_per_user,
+            args.review_ratio,
+            seed=args.seed,
+            reset=args.reset,
+        ),
+        args.output,
+    )
@@ -0,0 +1,69 @@
+"""Shared helpers for the benchmark scripts (run them from the repo root)."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Benchmarks default to a throwaway SQLite database so they run without
+# docker-compose; export DATABASE_URL to point them at Postgres instead.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("POSTGRES_USER", "bench")
+os.environ.setdefault("POSTGRES_PASSWORD", "bench")
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_DB", "bench")
+os.environ.setdefault("OLLAMA_BASE_URL", "http://localhost:11434")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def measure(fn: Callable[[], object], repeat: int = 20, warmup: int = 3) -> Dict[str, float]:
+    """Runs `fn` repeatedly and returns latency statistics in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return (
+            subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT)
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return "unknown"
+
+
+def emit(benchmark: str, results: dict, output: str = None) -> dict:
+    """Prints results as JSON (and optionally writes them) for cross-commit comparison."""
+    document = {
+        "benchmark": benchmark,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "database": os.environ["DATABASE_URL"].split("://")[0],
+        "results": results,
+    }
+    text = json.dumps(document, indent=2)
+    print(text)
+    if output:
+        Path(output).write_text(text + "\n")
+    return document
@@ -0,0 +1,79 @@
+"""
+Runs the whole benchmark suite against a freshly generated catalog and
+writes one JSON file per benchmark, for comparison across commits.
+
+    python -m benchmarks.run_all --books 20000 --output-dir benchmark-results
+
+Use `--quick` for a smoke run (small catalog, short HTTP scenarios).
+"""
+import argparse
+from pathlib import Path
+
+from benchmarks import (
+    bench_auth,
+    bench_http,
+    bench_import_time,
+    bench_list_books,
+    bench_llm_scheduler,
+    bench_neighbours,
+    bench_query_budget,
+    bench_recommender,
+    bench_serialization,
+    catalog,
+)
+from benchmarks.common import emit
+
+
+def main(args: argparse.Namespace) -> int:
+    out = Path(args.output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    books = 2000 if args.quick else args.books
+    duration = 2.0 if args.quick else args.duration
+
+    emit(
+        "catalog",
+        catalog.generate(books, args.users, 10, 0.3, seed=args.seed, reset=True),
+        out / "catalog.json",
+    )
+    failed = bench_import_time.main(
+        "app.main", args.import_budget_ms, 3, list(bench_import_time.DEFAULT_FORBIDDEN),
+        10, out / "import_time.json",
+    )
+    bench_serialization.main(1000, 10 if args.quick else 30, out / "serialization.json")
+    bench_auth.main(50 if args.quick else 200, out / "auth.json")
+    bench_list_books.main(
+        [0, books // 10, books - books // 10], 50, 5 if args.quick else 20,
+        out / "list_books.json",
+    )
+    bench_recommender.main(
+        sorted({min(1000, books), books}), 3 if args.quick else 10, args.seed,
+        out / "recommender.json",
+    )
+    failed |= bench_query_budget.main(out / "query_budget.json")
+    failed |= bench_neighbours.main(
+        100, 300, 200 if args.quick else 500, args.seed, out / "neighbours.json"
+    )
+    bench_llm_scheduler.main(
+        50 if args.quick else 200, 40, 0.05, 4, 120.0, out / "llm_scheduler.json"
+    )
+    failed |= bench_http.main(
+        ["browse", "search", "recommendations", "mix"], args.concurrency, duration,
+        users=8, workers=args.workers, llm_latency=0.0, seed=args.seed,
+        output=out / "http.json",
+    )
+    print(f"Results written to {out}/")
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--import-budget-ms", type=float, default=2500.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", default="benchmark-results")
+    parser.add_argument("--quick", action="store_true")
+    raise SystemExit(main(parser.parse_args()))
@@ -0,0 +1,38 @@
+"""Stand-ins for external services so load tests measure the API, not Ollama."""
+import asyncio
+import tempfile
+
+from app.core.interfaces import LLMProvider
+from app.infrastructure.services.local_storage_service import LocalDiskStorage
+
+
+class StubLLM(LLMProvider):
+    """Answers instantly (or after `latency` seconds) with canned output."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def _wait(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def generate_summary(self, text: str) -> str:
+        await self._wait()
+        words = text.split()[:40]
+        return "A synthetic summary. " + " ".join(words)
+
+    async def analyze_sentiment(self, review_text: str) -> str:
+        await self._wait()
+        return "Positive" if "good" in review_text.lower() else "Neutral"
+
+    async def health_check(self) -> bool:
+        return True
+
+
+class TempDirStorage(LocalDiskStorage):
+    """Local disk storage in a throwaway directory instead of ./uploads."""
+
+    _directory = tempfile.mkdtemp(prefix="lumina-bench-")
+
+    def __init__(self):
+        self.upload_dir = self._directory